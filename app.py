@@ -9,17 +9,24 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 import datetime
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import streamlit as st
 
+from utils.core import events_in_window
+from utils.figure_cache import figure_cached
 from utils.helpers import (
+    current_season,
     load_companion_data,
     load_harvest_log,
-    load_seeds_df,
+    load_site_seeds_df,
+    select_site,
     setup_page,
     sidebar_nav,
 )
+from utils.sites import season_end
+from utils.tasks import START_ACTION, build_task_frame, days_label
 
 setup_page("Home", "🌿")
 sidebar_nav()
@@ -42,12 +49,14 @@ st.markdown(
 st.markdown("---")
 
 # ─── Load data ────────────────────────────────────────────────────────────────
-df = load_seeds_df()
-harvest_df = load_harvest_log()
+year = current_season()
+site = select_site()
+df = load_site_seeds_df(site["id"], year)
+harvest_df = load_harvest_log(year)
 companion_data = load_companion_data()
 
 today = datetime.date.today()
-growing_season_end = datetime.date(today.year, 10, 13)
+growing_season_end = season_end(site, today.year)
 
 # ─── Summary Metrics ──────────────────────────────────────────────────────────
 col1, col2, col3, col4 = st.columns(4)
@@ -64,49 +73,110 @@ col4.metric("🌿 Perennials", perennials)
 
 st.markdown("---")
 
+# ─── Charts ───────────────────────────────────────────────────────────────────
+@figure_cached
+def upcoming_timeline(df_window, today, window_start, window_end):
+    ordered = (
+        df_window.groupby("Display Name")["Start Date"]
+        .min()
+        .sort_values()
+        .index.tolist()
+    )
+    fig = px.timeline(
+        df_window,
+        x_start="Start Date",
+        x_end="End Date",
+        y="Display Name",
+        color="Planting Method",
+        color_discrete_map={
+            "Transplant": "#4CAF50",
+            "Direct Sow": "#FF9800",
+        },
+        category_orders={"Display Name": ordered},
+        labels={"Display Name": "Plant"},
+    )
+    fig.add_vline(x=str(today), line_dash="dot", line_color="red", line_width=2)
+    fig.update_layout(
+        height=max(300, 35 * len(df_window["Display Name"].unique())),
+        margin=dict(l=160, r=10, t=20, b=20),
+        legend_title_text="Method",
+        xaxis_title="",
+        yaxis_title="",
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    fig.update_xaxes(range=[str(window_start.date()), str(window_end.date())])
+    return fig
+
+
+@figure_cached
+def season_donut(season_counts):
+    fig = px.pie(
+        season_counts,
+        names="Season",
+        values="Count",
+        hole=0.5,
+        color="Season",
+        color_discrete_map={
+            "Warm": "#FF9800",
+            "Cool": "#42A5F5",
+            "Perennial": "#66BB6A",
+        },
+    )
+    fig.update_layout(
+        showlegend=True,
+        margin=dict(l=0, r=0, t=10, b=0),
+        height=220,
+        paper_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig
+
+
+@figure_cached
+def method_bar(method_counts):
+    fig = px.bar(
+        method_counts,
+        x="Method",
+        y="Count",
+        color="Method",
+        color_discrete_map={
+            "Transplant": "#4CAF50",
+            "Direct Sow": "#FF9800",
+        },
+        text="Count",
+    )
+    fig.update_layout(
+        showlegend=False,
+        margin=dict(l=0, r=0, t=10, b=0),
+        height=200,
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        xaxis_title="",
+        yaxis_title="",
+    )
+    fig.update_traces(textposition="outside")
+    return fig
+
+
 # ─── Two-column layout ────────────────────────────────────────────────────────
 left, right = st.columns([2, 1])
 
 with left:
     st.subheader("📅 What to Do This Week")
 
-    # Events within next 14 days
-    upcoming = []
-    for _, row in df.iterrows():
-        start = row["Start Date"]
-        end = row["End Date"]
-        name = row["Display Name"]
-        method = row.get("Planting Method", "")
-
-        if pd.notna(start):
-            days_to_start = (start.date() - today).days
-            if 0 <= days_to_start <= 14:
-                upcoming.append(
-                    {"Days": days_to_start, "Action": "Start Indoors / Sow", "Plant": name, "Method": method}
-                )
-            elif -3 <= days_to_start < 0:
-                upcoming.append(
-                    {"Days": days_to_start, "Action": "⚠️ Overdue — Start Indoors", "Plant": name, "Method": method}
-                )
-
-        if pd.notna(end):
-            days_to_end = (end.date() - today).days
-            if 0 <= days_to_end <= 14:
-                upcoming.append(
-                    {"Days": days_to_end, "Action": "Transplant / Direct Sow", "Plant": name, "Method": method}
-                )
-            elif -3 <= days_to_end < 0:
-                upcoming.append(
-                    {"Days": days_to_end, "Action": "⚠️ Overdue — Transplant", "Plant": name, "Method": method}
-                )
-
-    if upcoming:
-        upcoming_df = (
-            pd.DataFrame(upcoming).sort_values("Days").reset_index(drop=True)
-        )
-        upcoming_df["Days Label"] = upcoming_df["Days"].apply(
-            lambda d: "Today" if d == 0 else (f"In {d} days" if d > 0 else f"{abs(d)} days ago")
+    # Events within next 14 days (or up to 3 days overdue), regardless of progress
+    tasks = build_task_frame(df, {}, today)
+    upcoming_df = tasks[tasks["Days"].between(-3, 14)].reset_index(drop=True)
+
+    if not upcoming_df.empty:
+        is_start = upcoming_df["Action"] == START_ACTION
+        overdue = upcoming_df["Days"] < 0
+        upcoming_df["Action"] = np.select(
+            [is_start & overdue, overdue, is_start],
+            ["⚠️ Overdue — Start Indoors", "⚠️ Overdue — Transplant", "Start Indoors / Sow"],
+            default="Transplant / Direct Sow",
         )
+        upcoming_df["Days Label"] = days_label(upcoming_df["Days"], unit=" days")
         st.dataframe(
             upcoming_df[["Days Label", "Action", "Plant", "Method"]],
             use_container_width=True,
@@ -121,43 +191,12 @@ with left:
     st.subheader("🗓️ Upcoming Schedule (Next 6 Weeks)")
     window_start = pd.Timestamp(today)
     window_end = pd.Timestamp(today + datetime.timedelta(weeks=6))
-    mask = (
-        (df["Start Date"] <= window_end) & (df["End Date"] >= window_start)
-        | (df["Start Date"] >= window_start) & (df["Start Date"] <= window_end)
-    )
-    df_window = df[mask].copy()
+    df_window = events_in_window(df, window_start, window_end)
     if not df_window.empty:
-        ordered = (
-            df_window.groupby("Display Name")["Start Date"]
-            .min()
-            .sort_values()
-            .index.tolist()
-        )
-        fig = px.timeline(
-            df_window,
-            x_start="Start Date",
-            x_end="End Date",
-            y="Display Name",
-            color="Planting Method",
-            color_discrete_map={
-                "Transplant": "#4CAF50",
-                "Direct Sow": "#FF9800",
-            },
-            category_orders={"Display Name": ordered},
-            labels={"Display Name": "Plant"},
-        )
-        fig.add_vline(x=str(today), line_dash="dot", line_color="red", line_width=2)
-        fig.update_layout(
-            height=max(300, 35 * len(df_window["Display Name"].unique())),
-            margin=dict(l=160, r=10, t=20, b=20),
-            legend_title_text="Method",
-            xaxis_title="",
-            yaxis_title="",
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
+        st.plotly_chart(
+            upcoming_timeline(df_window, today, window_start, window_end),
+            use_container_width=True,
         )
-        fig.update_xaxes(range=[str(window_start.date()), str(window_end.date())])
-        st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("No planting events in the next 6 weeks.")
 
@@ -168,25 +207,7 @@ with right:
     if "Season" in df.columns:
         season_counts = df["Season"].value_counts().reset_index()
         season_counts.columns = ["Season", "Count"]
-        fig_donut = px.pie(
-            season_counts,
-            names="Season",
-            values="Count",
-            hole=0.5,
-            color="Season",
-            color_discrete_map={
-                "Warm": "#FF9800",
-                "Cool": "#42A5F5",
-                "Perennial": "#66BB6A",
-            },
-        )
-        fig_donut.update_layout(
-            showlegend=True,
-            margin=dict(l=0, r=0, t=10, b=0),
-            height=220,
-            paper_bgcolor="rgba(0,0,0,0)",
-        )
-        st.plotly_chart(fig_donut, use_container_width=True)
+        st.plotly_chart(season_donut(season_counts), use_container_width=True)
 
     st.markdown("---")
     st.subheader("🌿 Planting Method Split")
@@ -194,28 +215,7 @@ with right:
     if "Planting Method" in df.columns:
         method_counts = df["Planting Method"].value_counts().reset_index()
         method_counts.columns = ["Method", "Count"]
-        fig_bar = px.bar(
-            method_counts,
-            x="Method",
-            y="Count",
-            color="Method",
-            color_discrete_map={
-                "Transplant": "#4CAF50",
-                "Direct Sow": "#FF9800",
-            },
-            text="Count",
-        )
-        fig_bar.update_layout(
-            showlegend=False,
-            margin=dict(l=0, r=0, t=10, b=0),
-            height=200,
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            xaxis_title="",
-            yaxis_title="",
-        )
-        fig_bar.update_traces(textposition="outside")
-        st.plotly_chart(fig_bar, use_container_width=True)
+        st.plotly_chart(method_bar(method_counts), use_container_width=True)
 
     st.markdown("---")
     st.subheader("📦 Brands in Collection")
@@ -0,0 +1,5 @@
+"""
+Headless performance benchmarks for Verti (no Streamlit required).
+
+Run ``python -m benchmarks --help`` from the project root.
+"""
@@ -0,0 +1,97 @@
+"""
+Run the benchmark suite.
+
+    python -m benchmarks                       # every case at 100 / 10k / 100k rows
+    python -m benchmarks --sizes 100 10000 -k calendar
+    python -m benchmarks --save results.json
+    python -m benchmarks --compare results.json --tolerance 0.25
+
+Timings are the best of ``--repeat`` runs (each run loops enough calls to
+take at least ~0.2s). With ``--compare`` the exit status is 1 when any case
+got slower than the saved baseline by more than the tolerance.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+from benchmarks.cases import CASES, Context
+
+DEFAULT_SIZES = [100, 10_000, 100_000]
+
+
+def _time(func, repeat: int) -> float:
+    """Best seconds per call."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def _fmt(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.0f} ns"
+
+
+def run(sizes, pattern: str, repeat: int) -> dict:
+    results = {}
+    names = [n for n in CASES if pattern.lower() in n.lower()]
+    width = max((len(n) for n in names), default=0)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            started = time.perf_counter()
+            ctx = Context(size, Path(tmp))
+            print(f"\n── {size:,} rows (setup {time.perf_counter() - started:.1f}s) ──")
+            for name in names:
+                func, max_size = CASES[name]
+                if max_size is not None and size > max_size:
+                    print(f"  {name:<{width}}  skipped (> {max_size:,} rows)")
+                    continue
+                seconds = _time(func(ctx), repeat)
+                results[f"{name} @ {size}"] = seconds
+                print(f"  {name:<{width}}  {_fmt(seconds)}")
+    return results
+
+
+def compare(results: dict, baseline_file: Path, tolerance: float) -> bool:
+    """Print ratios against a saved run; False if anything regressed."""
+    baseline = json.loads(baseline_file.read_text(encoding="utf-8"))
+    ok = True
+    print(f"\n── vs {baseline_file} (tolerance {tolerance:.0%}) ──")
+    for key, seconds in results.items():
+        if key not in baseline:
+            continue
+        ratio = seconds / baseline[key]
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag, ok = "  REGRESSION", False
+        print(f"  {key:<60} {ratio:6.2f}x{flag}")
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("-k", dest="pattern", default="", help="only cases containing this text")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", type=Path, help="write results (seconds per call) as JSON")
+    parser.add_argument("--compare", type=Path, help="baseline JSON from an earlier --save")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.pattern, args.repeat)
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if args.compare and not compare(results, args.compare, args.tolerance):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
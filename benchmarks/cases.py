@@ -0,0 +1,431 @@
+"""
+Benchmark cases for the data layer and the page-building hot paths.
+
+Each case is a function ``(ctx) -> callable``: it does its setup against the
+synthetic :class:`Context` for one size and returns the zero-argument call
+that gets timed. Register new cases with ``@case(...)``.
+"""
+
+import datetime
+
+import plotly.express as px
+
+from benchmarks import synthetic
+from utils import core, seasons
+from utils.bed_cells import BedCells
+from utils.beds import BedIndex
+from utils.calendar_matrix import activity_matrix
+from utils.companions import CompanionIndex
+from utils.figure_cache import FigureCache, figure_from_json, fingerprint
+from utils.file_cache import file_signature
+from utils.harvest_journal import HarvestJournal
+from utils.layout import BedLayout
+from utils.occupancy import BedOccupancy
+from utils.progress_store import ProgressStore
+from utils.schedule_engine import ScheduleEngine
+from utils.seed_order import brand_totals, seed_order
+from utils.seed_store import load_seeds_cached, prepare_seeds, read_seeds_csv
+from utils.sites import SiteScheduler
+from utils.tasks import build_task_frame, overall_status, progress_frame
+
+YEAR = 2025
+
+CASES: dict[str, tuple] = {}
+
+
+def case(name: str, max_size: int | None = None):
+    """Register a benchmark; sizes above ``max_size`` are skipped."""
+
+    def decorator(func):
+        CASES[name] = (func, max_size)
+        return func
+
+    return decorator
+
+
+class Context:
+    """Synthetic inputs for one size, written under ``workdir`` on demand."""
+
+    def __init__(self, size: int, workdir):
+        self.size = size
+        self.workdir = workdir
+        self.seeds_raw = synthetic.make_seeds_raw(size, YEAR)
+        self.seeds = prepare_seeds(self.seeds_raw)
+        self.names = synthetic.display_names(self.seeds_raw)
+        self.progress = synthetic.make_progress(self.names)
+        self.beds = synthetic.make_beds(size)
+        self.harvests = synthetic.make_harvests(size, YEAR)
+        self.companion_data = synthetic.make_companion_data(size)
+        self.today = synthetic.today(YEAR)
+
+    def seeds_csv(self):
+        path = self.workdir / f"{YEAR}-seeds.csv"
+        if not path.exists():
+            self.seeds_raw.to_csv(path, index=False)
+        return path
+
+    def harvest_csv(self):
+        path = self.workdir / "harvest_log.csv"
+        if not path.exists():
+            HarvestJournal(path).rewrite(self.harvests)
+        return path
+
+
+# ─── Loading ──────────────────────────────────────────────────────────────────
+@case("seeds: parse CSV (cold load)")
+def seeds_parse(ctx):
+    path = ctx.seeds_csv()
+    return lambda: read_seeds_csv(path)
+
+
+@case("seeds: columnar cache (warm load)")
+def seeds_cached(ctx):
+    path = ctx.seeds_csv()
+    cache_dir = ctx.workdir / ".cache"
+    load_seeds_cached(path, cache_dir)
+    return lambda: load_seeds_cached(path, cache_dir)
+
+
+@case("harvests: journal read after one append")
+def harvest_read(ctx):
+    journal = HarvestJournal(ctx.harvest_csv())
+    journal.read()
+    row = ctx.harvests.iloc[0].to_dict()
+
+    def run():
+        journal.append(row)
+        journal.read()
+
+    return run
+
+
+@case("progress: load snapshot + journal")
+def progress_load(ctx):
+    store = ProgressStore(ctx.workdir / "progress")
+    store.save(ctx.progress, YEAR)
+    store.bulk_set({ctx.names[0]: {"start_status": "done"}}, YEAR)
+    return lambda: store.load(YEAR)
+
+
+# ─── Page building ────────────────────────────────────────────────────────────
+@case("beds: build bed index")
+def bed_index(ctx):
+    return lambda: BedIndex(ctx.beds, ctx.seeds, ctx.progress)
+
+
+@case("beds: dashboard frame")
+def bed_dashboard(ctx):
+    plant_bed = BedIndex(ctx.beds, ctx.seeds, ctx.progress).plant_bed
+    return lambda: core.bed_plant_frame(ctx.seeds, ctx.progress, plant_bed)
+
+
+@case("schedule: bed occupancy (successions + conflicts)")
+def bed_occupancy(ctx):
+    bed_index = BedIndex(ctx.beds, ctx.seeds, ctx.progress)
+    end = datetime.date(YEAR, 10, 13)
+
+    def run():
+        occupancy = BedOccupancy(ctx.seeds, ctx.beds, bed_index, end)
+        occupancy.plantings()
+        occupancy.conflicts()
+        occupancy.summary()
+
+    return run
+
+
+@case("schedule: timeline frame by seed family")
+def schedule_frame(ctx):
+    df = ctx.seeds.assign(Bed="Unassigned")
+    return lambda: core.phase_segments(core.schedule_plot_frame(df, ctx.progress, "Seed Family"))
+
+
+@case("schedule: WebGL timeline segments")
+def schedule_segments(ctx):
+    df_plot = core.schedule_plot_frame(ctx.seeds.assign(Bed="Unassigned"), ctx.progress,
+                                       "Individual Plant")
+    order = df_plot["Display Name"].unique().tolist()
+    return lambda: core.gantt_segments(df_plot, "Planting Method", order)
+
+
+@case("schedule: weekly density by seed family")
+def schedule_density(ctx):
+    df_plot = core.schedule_plot_frame(ctx.seeds.assign(Bed="Unassigned"), ctx.progress,
+                                       "Individual Plant")
+    return lambda: core.timeline_density(df_plot, "Seed")
+
+
+@case("schedule: rule engine, 50 sites × 3 years")
+def rule_engine_full(ctx):
+    rules = synthetic.make_rules(ctx.names)
+    frost = synthetic.make_frost_table(50, [YEAR - 1, YEAR, YEAR + 1])
+    return lambda: ScheduleEngine().update(rules, frost)
+
+
+@case("schedule: rule engine, one rule edited")
+def rule_engine_edit(ctx):
+    rules = synthetic.make_rules(ctx.names)
+    frost = synthetic.make_frost_table(50, [YEAR - 1, YEAR, YEAR + 1])
+    engine = ScheduleEngine().update(rules, frost)
+    rule = rules["planting_rules"][ctx.names[0]]
+    flip = iter(range(10**9))
+
+    def run():
+        rule["start_indoors_delta"] = -30 - next(flip) % 7
+        engine.update(rules, frost)
+
+    return run
+
+
+@case("schedule: 50 site calendars (cold)")
+def site_calendars_cold(ctx):
+    rules = synthetic.make_rules(ctx.names)
+    sites = synthetic.make_sites(50)
+    return lambda: SiteScheduler().calendars(ctx.seeds, rules, sites, YEAR)
+
+
+@case("schedule: 50 site calendars, one site edited")
+def site_calendars_edit(ctx):
+    rules = synthetic.make_rules(ctx.names)
+    sites = synthetic.make_sites(50)
+    scheduler = SiteScheduler()
+    scheduler.calendars(ctx.seeds, rules, sites, YEAR)
+    flip = iter(range(10**9))
+
+    def run():
+        sites[0]["last_frost"] = f"05-{10 + next(flip) % 7:02d}"
+        scheduler.calendars(ctx.seeds, rules, sites, YEAR)
+
+    return run
+
+
+@case("schedule: 50 site calendars, rerun keyed by file signature")
+def site_calendars_rerun(ctx):
+    rules = synthetic.make_rules(ctx.names)
+    sites = synthetic.make_sites(50)
+    scheduler = SiteScheduler()
+    key = file_signature([ctx.seeds_csv()])
+    scheduler.calendars(ctx.seeds, rules, sites, YEAR, catalogue_key=key)
+    return lambda: scheduler.calendars(ctx.seeds, rules, sites, YEAR, catalogue_key=key)
+
+
+@case("schedule: task list")
+def task_list(ctx):
+    return lambda: build_task_frame(ctx.seeds, ctx.progress, ctx.today)
+
+
+@case("schedule: plant status")
+def plant_status(ctx):
+    names = ctx.seeds["Display Name"]
+
+    def run():
+        prog = progress_frame(ctx.progress, names)
+        return overall_status(prog["start_status"], prog["transplant_status"])
+
+    return run
+
+
+@case("schedule: progress editor grid + one-row edit")
+def progress_editor(ctx):
+    bed_map = dict(zip(ctx.names[::7], ["Bed 1"] * len(ctx.names[::7])))
+
+    def run():
+        frame = core.progress_editor_frame(ctx.seeds, ctx.progress, bed_map)
+        return core.progress_edits(frame, {0: {"Start Status": "✅ Done"}})
+
+    return run
+
+
+@case("calendar: month matrix")
+def calendar_month(ctx):
+    return lambda: activity_matrix(ctx.seeds, YEAR, "month")
+
+
+@case("calendar: day matrix")
+def calendar_day(ctx):
+    return lambda: activity_matrix(ctx.seeds, YEAR, "day")
+
+
+@case("companions: stats table")
+def companion_stats(ctx):
+    plants = sorted(ctx.seeds["Seed"].unique())
+    return lambda: core.companion_stats(plants, ctx.companion_data)
+
+
+@case("garden: spacing reference")
+def spacing_reference(ctx):
+    return lambda: core.spacing_reference(ctx.seeds, ctx.companion_data)
+
+
+@case("garden: capacity grid (all plants × all beds)")
+def capacity_grid(ctx):
+    return lambda: core.capacity_grid(ctx.seeds, ctx.companion_data, ctx.beds)
+
+
+@case("companions: build index")
+def companion_build(ctx):
+    return lambda: CompanionIndex(ctx.companion_data)
+
+
+@case("companions: heatmap submatrix")
+def companion_submatrix(ctx):
+    index = CompanionIndex(ctx.companion_data)
+    plants = sorted(ctx.seeds["Seed"].unique())
+    return lambda: index.submatrix(plants)
+
+
+@case("companions: bed pair list")
+def companion_pairs(ctx):
+    index = CompanionIndex(ctx.companion_data)
+    beds = ctx.beds[:1000]
+    return lambda: [index.pairs(bed["plants"]) for bed in beds]
+
+
+@case("companions: bed square-foot adjacency + capacity")
+def bed_cells(ctx):
+    index = CompanionIndex(ctx.companion_data)
+    spacing = ctx.companion_data["spacing_guide"]
+    beds = ctx.beds[:1000]
+
+    def run():
+        for bed in beds:
+            cells = BedCells(bed)
+            cells.adjacency(index)
+            cells.capacity(spacing)
+
+    return run
+
+
+@case("garden: seed order (all beds, successions, by brand)")
+def seed_order_plan(ctx):
+    end = datetime.date(YEAR, 10, 13)
+    return lambda: brand_totals(seed_order(ctx.seeds, ctx.beds, ctx.companion_data, season_end=end))
+
+
+@case("layout: companion optimizer (anneal all beds)", max_size=10_000)
+def layout_optimize(ctx):
+    # One bed per ten rows, so 6,000 rows is the 600-plot community garden
+    layout = BedLayout(
+        ctx.beds, CompanionIndex(ctx.companion_data), ctx.companion_data["spacing_guide"]
+    )
+    return lambda: layout.optimize()
+
+
+@case("analytics: harvest rollups")
+def analytics_harvest(ctx):
+    return lambda: (core.harvest_totals(ctx.harvests), core.harvest_daily(ctx.harvests))
+
+
+@case("analytics: harvest append + range query (rollups)")
+def analytics_harvest_rollups(ctx):
+    # What the Harvest Tracker does after logging an entry: the journal folds
+    # the new row into its rollups, then a one-month window is filtered
+    journal = HarvestJournal(ctx.workdir / "harvest-rollups.csv")
+    journal.rewrite(ctx.harvests)
+    journal.rollups()
+    row = ctx.harvests.iloc[0].to_dict()
+    start, end = f"{YEAR}-07-01", f"{YEAR}-07-31"
+
+    def run():
+        journal.append(row)
+        rollups = journal.rollups()
+        return rollups.rows(start, end), rollups.totals(start, end), rollups.daily(start, end)
+
+    return run
+
+
+@case("analytics: planting activity + brands")
+def analytics_insights(ctx):
+    return lambda: (core.monthly_activity(ctx.seeds), core.brand_breakdown(ctx.seeds))
+
+
+@case("analytics: cost / ROI")
+def analytics_roi(ctx):
+    prices = core.market_price_table(synthetic.family_names(ctx.size))
+    return lambda: core.cost_analysis(ctx.harvests, prices)["Value ($)"].sum()
+
+
+@case("analytics: 5-season comparison")
+def analytics_seasons(ctx):
+    # Per-season frames are cached by the loaders; time the stacking + rollups
+    years = range(YEAR - 4, YEAR + 1)
+    plants = {y: seasons.season_plants(ctx.seeds, ctx.progress) for y in years}
+    harvests = {y: ctx.harvests for y in years}
+
+    def run():
+        stacked = seasons.stack_seasons(plants)
+        seasons.completion_rates(stacked)
+        seasons.timing_drift(stacked)
+        seasons.yield_by_year(seasons.stack_seasons(harvests))
+
+    return run
+
+
+# ─── Figures ──────────────────────────────────────────────────────────────────
+def _timeline(df_plot):
+    return px.timeline(df_plot, x_start="Start Date", x_end="End Date", y="Display Name",
+                       color="Planting Method")
+
+
+@case("figures: timeline build + serialize", max_size=10_000)
+def figure_build(ctx):
+    df_plot = core.schedule_plot_frame(ctx.seeds.assign(Bed="Unassigned"), ctx.progress,
+                                       "Individual Plant")
+    return lambda: FigureCache().get_or_build(("timeline",), lambda: _timeline(df_plot))
+
+
+@case("figures: timeline cache hit", max_size=10_000)
+def figure_hit(ctx):
+    df_plot = core.schedule_plot_frame(ctx.seeds.assign(Bed="Unassigned"), ctx.progress,
+                                       "Individual Plant")
+    cache = FigureCache()
+
+    def run():
+        key = ("timeline", fingerprint(df_plot))
+        return figure_from_json(cache.get_or_build(key, lambda: _timeline(df_plot)))
+
+    run()
+    return run
+
+
+# ─── Saving ───────────────────────────────────────────────────────────────────
+@case("save: progress status edit")
+def save_status(ctx):
+    store = ProgressStore(ctx.workdir / "progress-edit")
+    store.save(ctx.progress, YEAR)
+    name = ctx.names[0]
+    return lambda: store.bulk_set({name: {"start_status": "done"}}, YEAR)
+
+
+@case("save: progress full snapshot")
+def save_progress(ctx):
+    store = ProgressStore(ctx.workdir / "progress-full")
+    return lambda: store.save(ctx.progress, YEAR)
+
+
+@case("save: harvest append")
+def save_harvest_append(ctx):
+    journal = HarvestJournal(ctx.workdir / "harvest-append.csv")
+    journal.rewrite(ctx.harvests)
+    row = ctx.harvests.iloc[0].to_dict()
+    return lambda: journal.append(row)
+
+
+@case("save: harvest rewrite")
+def save_harvest_rewrite(ctx):
+    journal = HarvestJournal(ctx.workdir / "harvest-rewrite.csv")
+    return lambda: journal.rewrite(ctx.harvests)
+
+
+@case("save: harvest edit one entry")
+def save_harvest_edit(ctx):
+    # One correction by ID: a journal line plus applying it to the read frame
+    journal = HarvestJournal(ctx.workdir / "harvest-edit.csv")
+    journal.rewrite(ctx.harvests)
+    entry_id = journal.read()["ID"].iloc[len(ctx.harvests) // 2]
+    return lambda: journal.update(entry_id, {"Quantity_kg": 1.5})
+
+
+@case("save: seeds CSV")
+def save_seeds(ctx):
+    path = ctx.workdir / "seeds-save.csv"
+    return lambda: ctx.seeds_raw.to_csv(path, index=False)
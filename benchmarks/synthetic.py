@@ -0,0 +1,184 @@
+"""
+Synthetic garden data at arbitrary scale.
+
+Every generator is seeded, so a given size always produces the same data and
+timings stay comparable between runs. Shapes and column names match the real
+files under ``data/`` (raw seeds CSV columns, progress JSON, garden_beds.json,
+harvest log, companion_plants.json).
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+BRANDS = ["West Coast Seeds", "McKenzie Seeds", "Baker Creek", "OSC Seeds", "Renee's Garden"]
+SEASONS = ["Cool", "Warm"]
+SUN = ["Full Sun", "Part to Full", "Part Shade"]
+FROST = ["Tolerant", "Not tolerant", "Semi-tolerant"]
+METHODS = ["Transplant", "Direct Sow"]
+STATUSES = ["not_started", "in_progress", "done", "skipped"]
+
+
+def _rng(seed: int) -> np.random.Generator:
+    return np.random.default_rng(seed)
+
+
+def family_count(n: int) -> int:
+    """Distinct plant families for ``n`` seed rows (grows sub-linearly)."""
+    return max(10, int(np.sqrt(n)) * 3)
+
+
+def family_names(n: int) -> list[str]:
+    return [f"Plant{i:04d}" for i in range(family_count(n))]
+
+
+def _fmt_dates(dates: pd.Series) -> pd.Series:
+    return dates.apply(lambda d: f"{d.month}/{d.day}/{d.year}" if pd.notna(d) else "")
+
+
+def make_seeds_raw(n: int, year: int = 2025, seed: int = 0) -> pd.DataFrame:
+    """Seeds table with the CSV's column names and m/d/yyyy date strings."""
+    rng = _rng(seed)
+    families = np.array(family_names(n))
+    method = rng.choice(METHODS, n)
+    end = pd.Timestamp(year, 4, 1) + pd.to_timedelta(rng.integers(0, 75, n), unit="D")
+    start = end - pd.to_timedelta(rng.integers(14, 110, n), unit="D")
+    start = pd.Series(start).where(method == "Transplant")
+    return pd.DataFrame({
+        "Seed": families[rng.integers(0, len(families), n)],
+        "Variant": [f"Variety {i}" for i in range(n)],
+        "Brand": rng.choice(BRANDS, n),
+        "Year": rng.choice([year - 1, year], n),
+        "Days": rng.integers(30, 120, n),
+        "Days (after transplant)": "",
+        "Season": rng.choice(SEASONS, n),
+        "Per Square": rng.choice([1, 2, 4, 9, 16], n),
+        "Sun": rng.choice(SUN, n),
+        "Frost": rng.choice(FROST, n),
+        "Planting Method": method,
+        "Plant in 2025": "TRUE",
+        "Transplant Delta": "",
+        "Last Frost Delta": rng.integers(-28, 28, n),
+        "Start Indoors": _fmt_dates(start),
+        "Transplant / Sow": _fmt_dates(pd.Series(end)),
+    })
+
+
+def display_names(seeds_raw: pd.DataFrame) -> list[str]:
+    return (seeds_raw["Seed"] + " " + seeds_raw["Variant"]).str.strip().tolist()
+
+
+def make_progress(names: list[str], seed: int = 0) -> dict:
+    """Progress entries for roughly two thirds of ``names``."""
+    rng = _rng(seed)
+    progress = {}
+    for name in np.array(names)[rng.random(len(names)) < 0.66]:
+        progress[str(name)] = {
+            "start_status": STATUSES[rng.integers(0, 4)],
+            "transplant_status": STATUSES[rng.integers(0, 4)],
+            "start_actual": "",
+            "transplant_actual": "",
+            "notes": "",
+            "bed": "",
+        }
+    return progress
+
+
+def make_beds(n: int, seed: int = 0) -> list[dict]:
+    """One bed per ten seed rows, each holding a handful of families."""
+    rng = _rng(seed)
+    families = family_names(n)
+    beds = []
+    for i in range(max(1, n // 10)):
+        plants = rng.choice(families, min(len(families), 5), replace=False)
+        beds.append({
+            "name": f"Bed {i + 1}",
+            "width": float(rng.choice([2, 3, 4])),
+            "length": float(rng.choice([4, 6, 8])),
+            "type": "Raised Bed",
+            "sun": "Full Sun (6+ hrs)",
+            "plants": [str(p) for p in plants],
+        })
+    return beds
+
+
+def make_harvests(n: int, year: int = 2025, seed: int = 0) -> pd.DataFrame:
+    """Harvest log rows spread over June–October."""
+    rng = _rng(seed)
+    families = np.array(family_names(n))
+    dates = pd.Timestamp(year, 6, 1) + pd.to_timedelta(rng.integers(0, 150, n), unit="D")
+    return pd.DataFrame({
+        "Date": dates,
+        "Plant": families[rng.integers(0, len(families), n)],
+        "Variant": "",
+        "Quantity_kg": rng.gamma(2.0, 0.4, n).round(2),
+        "Notes": "",
+    })
+
+
+def make_companion_data(n: int, seed: int = 0) -> dict:
+    """companion_plants.json-shaped dict over the families for size ``n``."""
+    rng = _rng(seed)
+    families = family_names(n)
+    companions = {}
+    for name in families:
+        picks = rng.choice(families, min(len(families), 8), replace=False)
+        companions[name] = {
+            "good": [str(p) for p in picks[:5] if p != name],
+            "bad": [str(p) for p in picks[5:] if p != name],
+        }
+    return {
+        "companions": companions,
+        "plant_colors": {name: "#4caf50" for name in families},
+        "spacing_guide": {
+            name: {"spacing_in": int(rng.choice([4, 6, 12, 18])), "row_spacing_in": 18,
+                   "depth_in": 0.5}
+            for name in families
+        },
+    }
+
+
+def make_rules(names: list[str], seed: int = 0) -> dict:
+    """planting_rules.json-shaped dict with a rule per name."""
+    rng = _rng(seed)
+    deltas = rng.integers(-110, 60, (len(names), 3))
+    unset = rng.random((len(names), 3)) < 0.3
+    fields = ["start_indoors_delta", "transplant_delta", "last_frost_delta"]
+    return {"planting_rules": {
+        name: {
+            field: (None if unset[i, k] else int(deltas[i, k]))
+            for k, field in enumerate(fields)
+        }
+        for i, name in enumerate(names)
+    }}
+
+
+def make_frost_table(sites: int, years, seed: int = 0) -> pd.DataFrame:
+    """Last frost per (site, year), spread over late April to early June."""
+    rng = _rng(seed)
+    slots = [(f"site-{i:02d}", year) for i in range(sites) for year in years]
+    offsets = rng.integers(0, 40, len(slots))
+    return pd.DataFrame({
+        "Site": [site for site, _ in slots],
+        "Year": [year for _, year in slots],
+        "Last Frost": [pd.Timestamp(year, 4, 25) + pd.Timedelta(days=int(d))
+                       for (_, year), d in zip(slots, offsets)],
+    })
+
+
+def make_sites(n: int, seed: int = 0) -> list[dict]:
+    """sites.json-shaped records, last frost late April to early June."""
+    rng = _rng(seed)
+    last = pd.Timestamp(2001, 4, 25) + pd.to_timedelta(rng.integers(0, 40, n), unit="D")
+    first = pd.Timestamp(2001, 9, 20) + pd.to_timedelta(rng.integers(0, 40, n), unit="D")
+    return [
+        {"id": f"site-{i:02d}", "name": f"Site {i}", "last_frost": lf.strftime("%m-%d"),
+         "first_frost": ff.strftime("%m-%d"), "season_end": ff.strftime("%m-%d")}
+        for i, (lf, ff) in enumerate(zip(last, first))
+    ]
+
+
+def today(year: int = 2025) -> datetime.date:
+    """Fixed "today" inside the synthetic season."""
+    return datetime.date(year, 4, 15)
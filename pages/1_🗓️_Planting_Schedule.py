@@ -9,24 +9,51 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import datetime
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
+from utils.calendar_matrix import activity_matrix
+from utils.core import (
+    TIMELINE_WEBGL_ROWS,
+    bed_plant_frame,
+    gantt_segments,
+    phase_segments,
+    progress_editor_frame,
+    progress_edits,
+    schedule_plot_frame,
+    timeline_density,
+)
+from utils.figure_cache import figure_cached
 from utils.helpers import (
     STATUS_COLORS,
     STATUS_LABELS,
     STATUS_OPTIONS,
-    bed_for_plant,
-    get_plant_status,
+    bulk_set,
+    current_season,
+    load_bed_index,
     load_garden_beds,
     load_progress,
-    load_seeds_df,
-    save_progress,
+    load_site_seeds_df,
+    section_tabs,
+    select_site,
     setup_page,
     sidebar_nav,
 )
+from utils.occupancy import BedOccupancy
+from utils.seed_order import DEFAULT_MAX_SOWINGS
+from utils.sites import site_date
+from utils.tasks import (
+    START_ACTION,
+    TASK_STATUS_OVERDUE,
+    TRANSPLANT_ACTION,
+    build_task_frame,
+    days_label,
+    days_until,
+    progress_frame,
+)
 
 setup_page("Planting Schedule", "🗓️")
 sidebar_nav()
@@ -35,27 +62,19 @@ st.title("🗓️ Planting Schedule")
 st.caption("Bed-aware growing season timeline with progress tracking.")
 
 # ─── Load data ────────────────────────────────────────────────────────────────
-year = 2026  # Default year
-df_full = load_seeds_df(year)
+year = current_season()
+site = select_site()
+df_full = load_site_seeds_df(site["id"], year)
 beds = load_garden_beds()
 progress = load_progress(year)
+bed_index = load_bed_index(year)
 today = datetime.date.today()
 
-# Build a plant→bed lookup from garden_beds.json
-bed_lookup: dict[str, str] = {}
-for bed in beds:
-    for p in bed.get("plants", []):
-        # p is a seed-family name (e.g. "Tomato")
-        # Map every matching display_name row
-        for dn in df_full[df_full["Seed"] == p]["Display Name"].unique():
-            bed_lookup[dn] = bed["name"]
-# Override with any per-plant override stored in progress
-for dn, pdata in progress.items():
-    if pdata.get("bed"):
-        bed_lookup[dn] = pdata["bed"]
+# Plant→bed lookup from garden_beds.json, overridden by per-plant progress beds
+bed_map = bed_index.plant_bed
 
 # Attach bed column to the full dataframe
-df_full["Bed"] = df_full["Display Name"].map(bed_lookup).fillna("Unassigned")
+df_full["Bed"] = bed_index.assign(df_full["Display Name"])
 
 # ─── Sidebar ──────────────────────────────────────────────────────────────────
 st.sidebar.header("🔍 Filters")
@@ -64,7 +83,7 @@ year = st.sidebar.number_input(
     "Growing Year", min_value=2020, max_value=2030, value=year, step=1
 )
 season_start = f"{year}-01-01"
-season_end   = f"{year}-10-13"
+season_end   = site_date(site, "season_end", year).isoformat()
 
 # ── Bed filter ──
 bed_names = sorted({b["name"] for b in beds}) if beds else []
@@ -104,8 +123,8 @@ group_by    = st.sidebar.radio("Group rows by", ["Individual Plant", "Seed Famil
 
 st.sidebar.markdown("---")
 total_shown   = df["Display Name"].nunique()
-done_count    = sum(1 for dn in df["Display Name"].unique()
-                    if get_plant_status(dn, progress)["transplant_status"] == "done")
+shown_names   = df["Display Name"].unique()
+done_count    = int(progress_frame(progress, shown_names)["transplant_status"].eq("done").sum())
 st.sidebar.metric("Varieties shown", total_shown)
 if total_shown:
     st.sidebar.progress(done_count / total_shown, text=f"{done_count}/{total_shown} fully done")
@@ -115,40 +134,8 @@ if df.empty:
     st.warning("No plants match your filters. Adjust sidebar selections.")
     st.stop()
 
-# ─── Build plotting dataframe ─────────────────────────────────────────────────
-if group_by == "Seed Family":
-    df_plot = (
-        df.groupby(["Seed", "Planting Method"])
-        .agg({"Start Date": "min", "End Date": "max", "Bed": "first"})
-        .reset_index()
-        .rename(columns={"Seed": "Display Name"})
-    )
-elif group_by == "Bed":
-    df_plot = (
-        df.groupby(["Bed", "Planting Method"])
-        .agg({"Start Date": "min", "End Date": "max"})
-        .reset_index()
-        .rename(columns={"Bed": "Display Name"})
-    )
-else:
-    df_plot = df.copy()
-
-# Attach progress status to df_plot
-df_plot["start_status"]      = df_plot["Display Name"].apply(lambda n: get_plant_status(n, progress)["start_status"])
-df_plot["transplant_status"] = df_plot["Display Name"].apply(lambda n: get_plant_status(n, progress)["transplant_status"])
-df_plot["Overall Status"]    = df_plot.apply(
-    lambda r: "done" if r["transplant_status"] == "done"
-    else ("in_progress" if r["start_status"] in ("in_progress", "done") else "not_started"),
-    axis=1,
-)
-df_plot["Status Label"] = df_plot["Overall Status"].map(STATUS_LABELS)
-
-ordered = (
-    df_plot.groupby("Display Name")["Start Date"]
-    .min()
-    .sort_values()
-    .index.tolist()
-)
+# ─── Build plotting dataframe (with progress status attached) ─────────────────
+df_plot = schedule_plot_frame(df, progress, group_by)
 
 # ─── Colour mapping ───────────────────────────────────────────────────────────
 if color_by == "Bed":
@@ -161,57 +148,63 @@ else:
     color_col = "Planting Method"
     color_map = {"Transplant": "#4CAF50", "Direct Sow": "#FF9800"}
 
-# ─── TABS ──────────────────────────────────────────────────────────────────────
-tab_timeline, tab_progress, tab_beds, tab_calendar, tab_list = st.tabs([
-    "📊 Timeline",
-    "✏️ Update Progress",
-    "🛏️ Bed Progress",
-    "📆 Monthly Calendar",
-    "📋 Task List",
-])
+# ─── Timeline figures ─────────────────────────────────────────────────────────
+def today_marker(today) -> tuple[dict, dict]:
+    """Dotted red line at ``today`` and its label."""
+    line = dict(type="line", x0=str(today), x1=str(today), y0=0, y1=1, xref="x", yref="paper",
+                line=dict(color="red", dash="dot", width=2))
+    label = dict(x=str(today), y=1, xref="x", yref="paper",
+                 text=f"Today ({today.strftime('%b %d')})",
+                 showarrow=False, font=dict(color="red", size=11), yanchor="bottom")
+    return line, label
+
+
+def week_shading(season_start, season_end) -> list[dict]:
+    """Alternate-week background bands."""
+    weeks = pd.date_range(season_start, season_end, freq="7D", inclusive="left")
+    return [
+        dict(type="rect", xref="x", yref="y domain", x0=cur, x1=cur + pd.Timedelta(days=7),
+             y0=0, y1=1, fillcolor="LightGrey", opacity=0.13, layer="below", line_width=0)
+        for cur in weeks[::2]
+    ]
+
+
+def status_icons(df_plot, color_by) -> list[dict]:
+    """
+    In Progress mode, each plant's transplant status icon at its transplant
+    point; otherwise ✅ after fully-done plants.
+    """
+    rows = df_plot[df_plot["End Date"].notna()]
+    if color_by == "Progress":
+        icons = rows["transplant_status"].map({"done": "✅", "in_progress": "🔄", "skipped": "⏭️"})
+        size, anchor = 11, "center"
+    else:
+        icons = rows["Overall Status"].map({"done": "✅"})
+        size, anchor = 12, "left"
+    rows, icons = rows[icons.notna()], icons.dropna()
+    return [
+        dict(x=end, y=name, xref="x", yref="y", text=icon, showarrow=False,
+             font=dict(size=size), xanchor=anchor)
+        for end, name, icon in zip(rows["End Date"], rows["Display Name"], icons)
+    ]
+
+
+@figure_cached
+def schedule_timeline(df_plot, color_by, color_col, color_map, season_start, season_end,
+                      today, show_today, show_weeks):
+    ordered = (
+        df_plot.groupby("Display Name")["Start Date"]
+        .min()
+        .sort_values()
+        .index.tolist()
+    )
 
-# ══════════════════════════════════════════════════════════════════════════════
-# TAB 1 — TIMELINE
-# ══════════════════════════════════════════════════════════════════════════════
-with tab_timeline:
     # ── For "Progress" mode, split each plant into TWO adjacent segments:
     #    Segment 1 (Start/Sow phase):      Start Date → End Date,  coloured by start_status
     #    Segment 2 (Transplant/Grow phase): End Date  → End Date+14d, coloured by transplant_status
     # For other colour modes, use the original single bar.
     if color_by == "Progress":
-        seg_rows = []
-        for _, row in df_plot.iterrows():
-            dn     = row["Display Name"]
-            start  = row["Start Date"]
-            end    = row["End Date"]
-            ss     = row["start_status"]
-            ts     = row["transplant_status"]
-            method = row.get("Planting Method", "")
-            bed_nm = row.get("Bed", "Unassigned")
-
-            if pd.notna(start) and pd.notna(end):
-                seg_rows.append({
-                    "Display Name": dn,
-                    "Phase": "🌱 Sow / Indoors",
-                    "Start Date": start,
-                    "End Date": end,
-                    "Status": STATUS_LABELS[ss],
-                    "Planting Method": method,
-                    "Bed": bed_nm,
-                })
-            if pd.notna(end):
-                grow_end = end + pd.Timedelta(days=14)
-                seg_rows.append({
-                    "Display Name": dn,
-                    "Phase": "🌿 Transplant / Outdoor",
-                    "Start Date": end,
-                    "End Date": grow_end,
-                    "Status": STATUS_LABELS[ts],
-                    "Planting Method": method,
-                    "Bed": bed_nm,
-                })
-
-        df_tl    = pd.DataFrame(seg_rows)
+        df_tl    = phase_segments(df_plot)
         tl_color = "Status"
         tl_cmap  = {v: STATUS_COLORS[k] for k, v in STATUS_LABELS.items()}
         tl_hover = ["Phase", "Planting Method", "Bed"]
@@ -250,56 +243,224 @@ with tab_timeline:
     fig.update_xaxes(range=[season_start, season_end], rangeslider_visible=True)
 
     if show_today:
-        fig.add_shape(
-            type="line",
-            x0=str(today), x1=str(today),
-            y0=0, y1=1, xref="x", yref="paper",
-            line=dict(color="red", dash="dot", width=2),
-        )
-        fig.add_annotation(
-            x=str(today), y=1, xref="x", yref="paper",
-            text=f"Today ({today.strftime('%b %d')})",
-            showarrow=False, font=dict(color="red", size=11), yanchor="bottom",
-        )
+        line, label = today_marker(today)
+        fig.add_shape(line)
+        fig.add_annotation(label)
 
     if show_weeks:
-        cur = pd.Timestamp(season_start)
-        end_ts = pd.Timestamp(season_end)
-        shade = True
-        while cur < end_ts:
-            nxt = cur + pd.Timedelta(days=7)
-            if shade:
-                fig.add_vrect(x0=cur, x1=nxt, fillcolor="LightGrey",
-                              opacity=0.13, layer="below", line_width=0)
-            shade = not shade
-            cur = nxt
-
-    # In Progress mode: annotate each plant's transplant point with its status icon
+        fig.update_layout(shapes=list(fig.layout.shapes) + week_shading(season_start, season_end))
+
+    # Status icons at each plant's transplant point, added as one list —
+    # add_annotation re-validates every existing annotation on each call
+    fig.update_layout(annotations=list(fig.layout.annotations) + status_icons(df_plot, color_by))
+
+    return fig
+
+
+@figure_cached
+def schedule_timeline_gl(df_plot, color_by, color_col, color_map, season_start, season_end,
+                         today, show_today, show_weeks):
+    """
+    Large-schedule timeline: one WebGL line trace per colour instead of a bar
+    per row, a capped height, and done markers in place of per-row icons.
+    """
+    ordered = (
+        df_plot.groupby("Display Name")["Start Date"]
+        .min()
+        .sort_values()
+        .index.tolist()
+    )
     if color_by == "Progress":
-        for _, row in df_plot.iterrows():
-            if pd.notna(row["End Date"]):
-                icon = {"done": "✅", "in_progress": "🔄", "skipped": "⏭️"}.get(
-                    row["transplant_status"], ""
-                )
-                if icon:
-                    fig.add_annotation(
-                        x=row["End Date"], y=row["Display Name"],
-                        xref="x", yref="y",
-                        text=icon, showarrow=False,
-                        font=dict(size=11), xanchor="center",
-                    )
+        df_tl = phase_segments(df_plot)
+        tl_color = "Status"
+        tl_cmap = {v: STATUS_COLORS[k] for k, v in STATUS_LABELS.items()}
+        legend_title = "Progress Status"
+    else:
+        df_tl = df_plot
+        tl_color = color_col
+        tl_cmap = color_map
+        legend_title = color_col
+
+    num = len(ordered)
+    height = min(2000, max(550, 6 * num + 150))
+    bar_width = max(1.0, min(12.0, 0.7 * (height - 150) / max(num, 1)))
+    palette = px.colors.qualitative.Plotly
+
+    fig = go.Figure()
+    for i, seg in enumerate(gantt_segments(df_tl, tl_color, ordered)):
+        fig.add_trace(go.Scattergl(
+            x=seg["x"], y=seg["y"], text=seg["text"], name=seg["name"],
+            mode="lines",
+            line=dict(width=bar_width, color=tl_cmap.get(seg["name"], palette[i % len(palette)])),
+            hovertemplate="%{text}<br>%{x|%b %d}<extra>%{fullData.name}</extra>",
+            connectgaps=False,
+        ))
+
+    done = df_plot[df_plot["Overall Status"].eq("done") & df_plot["End Date"].notna()]
+    if not done.empty:
+        fig.add_trace(go.Scattergl(
+            x=done["End Date"], y=pd.Categorical(done["Display Name"], categories=ordered).codes,
+            text=done["Display Name"], name="✅ Done", mode="markers",
+            marker=dict(symbol="star", size=7, color="#1B5E20"),
+            hovertemplate="✅ %{text}<extra></extra>",
+        ))
+
+    labelled = num <= 150
+    fig.update_layout(
+        title="Growing Season Planting Schedule",
+        height=height,
+        margin=dict(l=200 if labelled else 40, r=20, t=45, b=20),
+        yaxis=dict(
+            autorange="reversed", zeroline=False, showgrid=False,
+            tickmode="array" if labelled else "auto",
+            tickvals=list(range(num)) if labelled else None,
+            ticktext=ordered if labelled else None,
+            showticklabels=labelled,
+        ),
+        xaxis=dict(type="date", range=[season_start, season_end], rangeslider_visible=True),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        xaxis_title="",
+        yaxis_title="",
+        legend_title_text=legend_title,
+    )
+    line, label = today_marker(today)
+    fig.update_layout(
+        shapes=([line] if show_today else [])
+        + (week_shading(season_start, season_end) if show_weeks else []),
+        annotations=[label] if show_today else [],
+    )
+    return fig
+
+
+@figure_cached
+def density_heatmap(density):
+    """Plants growing per band per week."""
+    fig = go.Figure(go.Heatmap(
+        z=density.to_numpy(),
+        x=density.columns,
+        y=density.index.astype(str),
+        colorscale="Greens",
+        colorbar=dict(title="Plants"),
+        hovertemplate="%{y}<br>Week of %{x|%b %d}: %{z} plants<extra></extra>",
+        xgap=1,
+        ygap=1,
+    ))
+    fig.update_layout(
+        title="Plants Growing per Week",
+        height=min(1200, max(300, 22 * len(density) + 120)),
+        margin=dict(l=160, r=20, t=45, b=20),
+        yaxis=dict(autorange="reversed"),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig
+
+
+@figure_cached
+def occupancy_timeline(plantings, slots, season_start, season_end, today, show_today):
+    """
+    One row per bed slot lane, each planting a bar; lanes past a bed's slots
+    (over-allocated) get their own colour.
+    """
+    df_tl = plantings.assign(
+        Row=plantings["Bed"] + " · slot " + (plantings["Lane"] + 1).astype(str),
+        Kind=np.where(
+            plantings["Lane"] >= plantings["Bed"].map(slots),
+            "Over capacity",
+            np.where(plantings["Sowing"] > 1, "Succession", "Main"),
+        ),
+    )
+    rows = df_tl.drop_duplicates("Row").sort_values(["Bed", "Lane"])["Row"].tolist()
+    fig = px.timeline(
+        df_tl,
+        x_start="Start",
+        x_end="End",
+        y="Row",
+        color="Kind",
+        color_discrete_map={"Main": "#4CAF50", "Succession": "#8BC34A", "Over capacity": "#E53935"},
+        text="Plant",
+        title="Bed Occupancy",
+        category_orders={"Row": rows, "Kind": ["Main", "Succession", "Over capacity"]},
+        hover_data=["Plant", "Seed", "Sowing"],
+    )
+    fig.update_traces(textposition="inside", insidetextanchor="start")
+    fig.update_layout(
+        height=max(400, 30 * len(rows)),
+        margin=dict(l=160, r=20, t=45, b=20),
+        yaxis=dict(automargin=True),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        xaxis_title="",
+        yaxis_title="",
+        legend_title_text="",
+    )
+    fig.update_xaxes(range=[season_start, season_end])
+    if show_today:
+        line, label = today_marker(today)
+        fig.add_shape(line)
+        fig.add_annotation(label)
+    return fig
+
+
+# ─── TABS ──────────────────────────────────────────────────────────────────────
+tab = section_tabs(
+    [
+        "📊 Timeline",
+        "✏️ Update Progress",
+        "🛏️ Bed Progress",
+        "📆 Monthly Calendar",
+        "📋 Task List",
+        "🔁 Bed Occupancy",
+    ],
+    key="schedule_tab",
+)
+
+# ══════════════════════════════════════════════════════════════════════════════
+# TAB 1 — TIMELINE
+# ══════════════════════════════════════════════════════════════════════════════
+@st.fragment
+def timeline_tab():
+    mc1, mc2 = st.columns([3, 1])
+    with mc1:
+        tl_mode = st.radio(
+            "Timeline view", ["Auto", "Bars", "Fast (WebGL)", "Weekly density"],
+            horizontal=True, key="tl_mode",
+            help="Auto draws bars up to the row limit and switches to WebGL above it.",
+        )
+    with mc2:
+        gl_rows = st.number_input("WebGL above (rows)", min_value=50, step=50,
+                                  value=TIMELINE_WEBGL_ROWS, key="tl_gl_rows")
+    if tl_mode == "Auto":
+        tl_mode = "Fast (WebGL)" if len(df_plot) > gl_rows else "Bars"
+
+    if tl_mode == "Weekly density":
+        bands = {"Seed Family": "Seed", "Bed": "Bed", "Plant": "Display Name"}
+        bands = {label: col for label, col in bands.items() if col in df_plot.columns}
+        dc1, dc2 = st.columns(2)
+        with dc1:
+            band_label = st.radio("Band by", list(bands), horizontal=True, key="tl_band")
+        band_col = bands[band_label]
+        density = timeline_density(df_plot, band_col)
+        st.plotly_chart(density_heatmap(density), use_container_width=True)
+        with dc2:
+            drill = st.selectbox(f"Drill into {band_label.lower()}", ["—"] + density.index.tolist(),
+                                 key="tl_drill")
+        if drill != "—":
+            rows = df_plot[df_plot[band_col].astype(object).fillna("Unassigned") == drill]
+            build = schedule_timeline_gl if len(rows) > gl_rows else schedule_timeline
+            st.plotly_chart(
+                build(rows, color_by, color_col, color_map, season_start, season_end,
+                      today, show_today, show_weeks),
+                use_container_width=True,
+            )
     else:
-        # For non-progress modes, mark fully-done plants with ✅
-        for _, row in df_plot.iterrows():
-            if row["Overall Status"] == "done" and pd.notna(row["End Date"]):
-                fig.add_annotation(
-                    x=row["End Date"], y=row["Display Name"],
-                    xref="x", yref="y",
-                    text="✅", showarrow=False,
-                    font=dict(size=12), xanchor="left",
-                )
-
-    st.plotly_chart(fig, use_container_width=True)
+        build = schedule_timeline_gl if tl_mode == "Fast (WebGL)" else schedule_timeline
+        st.plotly_chart(
+            build(df_plot, color_by, color_col, color_map, season_start, season_end,
+                  today, show_today, show_weeks),
+            use_container_width=True,
+        )
 
     if color_by == "Progress":
         st.caption(
@@ -315,15 +476,20 @@ with tab_timeline:
         st.download_button("⬇️ Download Schedule CSV", csv_data,
                            file_name=f"planting_schedule_{year}.csv", mime="text/csv")
 
+
+if tab == "📊 Timeline":
+    timeline_tab()
+
 # ══════════════════════════════════════════════════════════════════════════════
 # TAB 2 — UPDATE PROGRESS
 # ══════════════════════════════════════════════════════════════════════════════
-with tab_progress:
+@st.fragment
+def progress_tab():
     st.subheader("✏️ Update Planting Progress")
     st.caption("Track what you've started, transplanted, or completed for each plant.")
 
-    # Group by bed for easier management
-    display_names = sorted(df["Display Name"].unique())
+    # One row per plant, grouped by bed; only the current page is sent to the browser
+    editor_df = progress_editor_frame(df, progress, bed_map)
 
     # Filter controls
     prog_filter = st.selectbox(
@@ -331,155 +497,93 @@ with tab_progress:
         ["All", "⬜ Not Started", "🔄 In Progress", "✅ Done", "⏭️ Skipped", "🛏️ In a Bed"],
         key="prog_filter",
     )
+    if prog_filter == "🛏️ In a Bed":
+        editor_df = editor_df[editor_df["Bed"] != "Unassigned"]
+    elif prog_filter != "All":
+        editor_df = editor_df[editor_df["Status"] == prog_filter]
+    editor_df = editor_df.reset_index(drop=True)
 
-    # Build list filtered by selected status
-    filtered_names = []
-    for dn in display_names:
-        ps = get_plant_status(dn, progress)
-        overall = "done" if ps["transplant_status"] == "done" else (
-            "in_progress" if ps["start_status"] in ("in_progress", "done") else ps["start_status"]
-        )
-        label = STATUS_LABELS.get(overall, "⬜ Not Started")
-        if prog_filter == "All":
-            filtered_names.append(dn)
-        elif prog_filter == "🛏️ In a Bed" and bed_lookup.get(dn, "Unassigned") != "Unassigned":
-            filtered_names.append(dn)
-        elif prog_filter.split(" ", 1)[-1] in label:
-            filtered_names.append(dn)
-
-    if not filtered_names:
+    if editor_df.empty:
         st.info("No plants match this filter.")
     else:
-        # Group by bed for display
-        by_bed: dict[str, list[str]] = {}
-        for dn in filtered_names:
-            b = bed_lookup.get(dn, "Unassigned")
-            by_bed.setdefault(b, []).append(dn)
-
-        for bed_label, plant_names in sorted(by_bed.items()):
-            with st.expander(f"🛏️ {bed_label} ({len(plant_names)} plants)", expanded=True):
-                for dn in plant_names:
-                    ps = get_plant_status(dn, progress)
-                    row = df[df["Display Name"] == dn].iloc[0] if not df[df["Display Name"] == dn].empty else None
-
-                    start_date_str = row["Start Date"].strftime("%b %d") if row is not None and pd.notna(row["Start Date"]) else "N/A"
-                    end_date_str   = row["End Date"].strftime("%b %d") if row is not None and pd.notna(row["End Date"]) else "N/A"
-                    method         = row["Planting Method"] if row is not None else ""
-                    bg             = STATUS_COLORS.get(ps["start_status"], "#f5f5f5")
-
-                    st.markdown(
-                        f'<div style="background:{bg}; border-radius:6px; padding:6px 10px; '
-                        f'margin-bottom:2px; font-size:0.85rem;">'
-                        f'<b>{dn}</b> &nbsp;|&nbsp; {method} &nbsp;|&nbsp; '
-                        f'Sow: {start_date_str} → Transplant: {end_date_str}'
-                        f'</div>',
-                        unsafe_allow_html=True,
-                    )
+        pc1, pc2, _ = st.columns([1, 1, 3])
+        page_size = pc1.selectbox(
+            "Rows per page", [25, 50, 100, 250], index=1, key="prog_page_size"
+        )
+        n_pages = -(-len(editor_df) // page_size)
+        page = pc2.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1,
+                                key="prog_page") if n_pages > 1 else 1
+        page_df = editor_df.iloc[(page - 1) * page_size : page * page_size].reset_index(drop=True)
+        st.caption(f"Plants {(page - 1) * page_size + 1}–{(page - 1) * page_size + len(page_df)} "
+                   f"of {len(editor_df)}. Edits are saved together when you click **Save**.")
+
+        bed_opts = ["Unassigned"] + bed_names
+        bed_opts += sorted(set(page_df["Bed"]) - set(bed_opts))
+        status_opts = [STATUS_LABELS[s] for s in STATUS_OPTIONS]
+        # Bumped after each save so the grid starts clean from the saved data
+        rev = st.session_state.get("prog_editor_rev", 0)
+        editor_key = f"prog_editor_{prog_filter}_{page_size}_{page}_{rev}"
+
+        with st.form("progress_editor", border=False):
+            st.data_editor(
+                page_df,
+                key=editor_key,
+                use_container_width=True,
+                hide_index=True,
+                num_rows="fixed",
+                disabled=["Plant", "Method", "Sow", "Transplant", "Status"],
+                column_config={
+                    "Sow": st.column_config.DateColumn("Sow", format="MMM D"),
+                    "Transplant": st.column_config.DateColumn("Transplant", format="MMM D"),
+                    "Start Status": st.column_config.SelectboxColumn(
+                        "Start/Sow Status", options=status_opts, required=True),
+                    "Transplant Status": st.column_config.SelectboxColumn(
+                        "Transplant Status", options=status_opts, required=True),
+                    "Bed": st.column_config.SelectboxColumn("Bed", options=bed_opts, required=True),
+                    "Notes": st.column_config.TextColumn("Notes"),
+                },
+            )
+            submitted = st.form_submit_button("💾 Save changes", type="primary")
+
+        if submitted:
+            edited_rows = st.session_state.get(editor_key, {}).get("edited_rows", {})
+            updates = progress_edits(page_df, edited_rows)
+            if updates:
+                # One batched row-level write for every edited plant
+                bulk_set(updates, year)
+                st.session_state["prog_editor_rev"] = rev + 1
+                st.rerun()
+            else:
+                st.info("No changes to save.")
 
-                    c1, c2, c3, c4 = st.columns([2, 2, 2, 3])
-                    with c1:
-                        start_idx = STATUS_OPTIONS.index(ps["start_status"])
-                        new_start_status = st.selectbox(
-                            "Start/Sow Status",
-                            options=STATUS_OPTIONS,
-                            format_func=lambda x: STATUS_LABELS[x],
-                            index=start_idx,
-                            key=f"ss_{dn}",
-                            label_visibility="collapsed",
-                        )
-                    with c2:
-                        trans_idx = STATUS_OPTIONS.index(ps["transplant_status"])
-                        new_trans_status = st.selectbox(
-                            "Transplant Status",
-                            options=STATUS_OPTIONS,
-                            format_func=lambda x: STATUS_LABELS[x],
-                            index=trans_idx,
-                            key=f"ts_{dn}",
-                            label_visibility="collapsed",
-                        )
-                    with c3:
-                        # Bed assignment override
-                        all_bed_opts = ["Unassigned"] + bed_names
-                        current_bed  = ps["bed"] or bed_lookup.get(dn, "Unassigned")
-                        bed_idx      = all_bed_opts.index(current_bed) if current_bed in all_bed_opts else 0
-                        new_bed = st.selectbox(
-                            "Bed",
-                            options=all_bed_opts,
-                            index=bed_idx,
-                            key=f"bed_{dn}",
-                            label_visibility="collapsed",
-                        )
-                    with c4:
-                        new_notes = st.text_input(
-                            "Notes",
-                            value=ps["notes"],
-                            key=f"notes_{dn}",
-                            placeholder="Notes…",
-                            label_visibility="collapsed",
-                        )
-
-                    # Auto-save whenever any value changes
-                    existing = progress.get(dn, {})
-                    if (
-                        new_start_status != ps["start_status"]
-                        or new_trans_status != ps["transplant_status"]
-                        or new_notes != ps["notes"]
-                        or new_bed != (ps["bed"] or bed_lookup.get(dn, "Unassigned"))
-                    ):
-                        updated = {
-                            **existing,
-                            "start_status": new_start_status,
-                            "transplant_status": new_trans_status,
-                            "notes": new_notes,
-                            "bed": new_bed if new_bed != "Unassigned" else "",
-                        }
-                        progress[dn] = updated
-                        save_progress(progress, year)
-                        st.rerun()
-
-                    st.markdown("---" if dn != plant_names[-1] else "")
+
+if tab == "✏️ Update Progress":
+    progress_tab()
 
 # ══════════════════════════════════════════════════════════════════════════════
 # TAB 3 — BED PROGRESS DASHBOARD
 # ══════════════════════════════════════════════════════════════════════════════
-with tab_beds:
+@st.fragment
+def beds_tab():
     st.subheader("🛏️ Bed-by-Bed Progress")
 
     if not beds:
         st.info("No garden beds defined yet. Go to **Garden Planner** to create beds.")
     else:
+        # Every assigned plant in one pass, then split per bed
+        assigned = bed_plant_frame(df_full, progress, bed_map)
+        bed_plants = dict(tuple(assigned.groupby("Bed", sort=False)))
         for bed in beds:
-            bed_plant_seeds = bed.get("plants", [])
-            # Get all display names that belong to this bed (by seed family)
-            bed_display_names = []
-            for seed_fam in bed_plant_seeds:
-                bed_display_names += list(df_full[df_full["Seed"] == seed_fam]["Display Name"].unique())
-            # Also include any plants manually assigned via progress override
-            for dn, pdata in progress.items():
-                if pdata.get("bed") == bed["name"] and dn not in bed_display_names:
-                    bed_display_names.append(dn)
-
-            if not bed_display_names:
+            bp = bed_plants.get(bed["name"])
+            if bp is None:
                 with st.expander(f"🛏️ {bed['name']} — no plants assigned"):
                     st.info("Assign plants via the Garden Planner or Update Progress tab.")
                 continue
+            bed_display_names = bp["Plant"].tolist()
 
             # Compute status counts
-            statuses = {
-                "done": 0, "in_progress": 0, "not_started": 0, "skipped": 0
-            }
-            for dn in bed_display_names:
-                ps = get_plant_status(dn, progress)
-                t = ps["transplant_status"]
-                s = ps["start_status"]
-                if t == "done":
-                    statuses["done"] += 1
-                elif t == "skipped" or s == "skipped":
-                    statuses["skipped"] += 1
-                elif s in ("in_progress", "done"):
-                    statuses["in_progress"] += 1
-                else:
-                    statuses["not_started"] += 1
+            statuses = {"done": 0, "in_progress": 0, "not_started": 0, "skipped": 0}
+            statuses.update(bp["bucket"].value_counts().to_dict())
 
             total_bed = len(bed_display_names)
             done_pct = int(statuses["done"] / total_bed * 100) if total_bed else 0
@@ -512,137 +616,84 @@ with tab_beds:
                 st.markdown("")
 
                 # Plants table
-                plant_rows = []
-                for dn in sorted(bed_display_names):
-                    ps  = get_plant_status(dn, progress)
-                    row = df_full[df_full["Display Name"] == dn]
-                    start_str = row["Start Date"].iloc[0].strftime("%b %d") if not row.empty and pd.notna(row["Start Date"].iloc[0]) else "—"
-                    end_str   = row["End Date"].iloc[0].strftime("%b %d")   if not row.empty and pd.notna(row["End Date"].iloc[0])   else "—"
-                    method    = row["Planting Method"].iloc[0] if not row.empty else "—"
-                    plant_rows.append({
-                        "Plant":        dn,
-                        "Method":       method,
-                        "Sow Date":     start_str,
-                        "Transplant":   end_str,
-                        "Start Status": STATUS_LABELS.get(ps["start_status"], "—"),
-                        "Final Status": STATUS_LABELS.get(ps["transplant_status"], "—"),
-                        "Notes":        ps["notes"],
-                    })
-
-                bed_df = pd.DataFrame(plant_rows)
+                def fmt_date(dates: pd.Series) -> pd.Series:
+                    return dates.dt.strftime("%b %d").fillna("—")
+
+                bed_df = pd.DataFrame({
+                    "Plant":        bp["Plant"],
+                    "Method":       bp["Method"].fillna("—"),
+                    "Sow Date":     fmt_date(bp["Start Date"]),
+                    "Transplant":   fmt_date(bp["End Date"]),
+                    "Start Status": bp["start_status"].map(STATUS_LABELS).fillna("—"),
+                    "Final Status": bp["transplant_status"].map(STATUS_LABELS).fillna("—"),
+                    "Notes":        bp["notes"],
+                })
                 st.dataframe(bed_df, use_container_width=True, hide_index=True)
 
-                # Upcoming tasks for this bed
+                # Upcoming tasks for this bed (within 1 week overdue … 3 weeks ahead)
                 upcoming_bed = []
-                for dn in bed_display_names:
-                    ps  = get_plant_status(dn, progress)
-                    row = df_full[df_full["Display Name"] == dn]
-                    if row.empty:
-                        continue
-                    start = row["Start Date"].iloc[0]
-                    end   = row["End Date"].iloc[0]
-                    if ps["start_status"] == "not_started" and pd.notna(start):
-                        d = (start.date() - today).days
-                        if -7 <= d <= 21:
-                            upcoming_bed.append(f"{'⚠️' if d < 0 else '🔜'} **{dn}**: Sow by {start.strftime('%b %d')} ({abs(d)}d {'ago' if d < 0 else 'away'})")
-                    if ps["transplant_status"] not in ("done", "skipped") and pd.notna(end):
-                        d = (end.date() - today).days
-                        if -7 <= d <= 21:
-                            upcoming_bed.append(f"{'⚠️' if d < 0 else '🔜'} **{dn}**: Transplant by {end.strftime('%b %d')} ({abs(d)}d {'ago' if d < 0 else 'away'})")
+                sow_days = days_until(bp["Start Date"], today)
+                tr_days  = days_until(bp["End Date"], today)
+                sow_due  = (bp["in_seeds"] & bp["start_status"].eq("not_started")
+                            & sow_days.between(-7, 21))
+                tr_due   = (bp["in_seeds"] & ~bp["transplant_status"].isin(["done", "skipped"])
+                            & tr_days.between(-7, 21))
+                for i in np.flatnonzero(sow_due.to_numpy() | tr_due.to_numpy()):
+                    dn = bp["Plant"].iat[i]
+                    for due, verb, date, d in (
+                        (sow_due, "Sow", bp["Start Date"].iat[i], sow_days.iat[i]),
+                        (tr_due, "Transplant", bp["End Date"].iat[i], tr_days.iat[i]),
+                    ):
+                        if due.iat[i]:
+                            upcoming_bed.append(
+                                f"{'⚠️' if d < 0 else '🔜'} **{dn}**: {verb} by "
+                                f"{date.strftime('%b %d')} "
+                                f"({abs(int(d))}d {'ago' if d < 0 else 'away'})"
+                            )
 
                 if upcoming_bed:
                     st.markdown("**📅 Upcoming tasks (±3 weeks):**")
                     for task in upcoming_bed:
                         st.markdown(f"&nbsp;&nbsp;{task}")
 
+
+if tab == "🛏️ Bed Progress":
+    beds_tab()
+
 # ══════════════════════════════════════════════════════════════════════════════
 # TAB 4 — MONTHLY CALENDAR
 # ══════════════════════════════════════════════════════════════════════════════
-with tab_calendar:
+@st.fragment
+def calendar_tab():
     st.subheader("Monthly Planting Calendar")
-    months      = list(range(1, 11))
-    month_names = ["Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct"]
-
-    all_plants  = sorted(df["Display Name"].unique())
-    matrix_data = []
-    for plant in all_plants:
-        ps  = get_plant_status(plant, progress)
-        overall_done = ps["transplant_status"] == "done"
-        row_data = {"Plant": plant, "Bed": bed_lookup.get(plant, "—")}
-        prows = df[df["Display Name"] == plant]
-        for m, mname in zip(months, month_names):
-            active = False
-            for _, pr in prows.iterrows():
-                start = pr["Start Date"]
-                end   = pr["End Date"]
-                if pd.notna(start) and pd.notna(end):
-                    ms = pd.Timestamp(year=year, month=m, day=1)
-                    me = ms + pd.offsets.MonthEnd(0)
-                    if start <= me and end >= ms:
-                        active = True
-            if active:
-                row_data[mname] = "✅" if overall_done else "🟩"
-            else:
-                row_data[mname] = ""
-        matrix_data.append(row_data)
+    granularity = st.radio(
+        "Calendar granularity", ["Month", "Week", "Day"], horizontal=True, key="cal_granularity"
+    )
+
+    active = activity_matrix(df, year, granularity.lower())
+    cal_ps = progress_frame(progress, active.index)
+    overall_done = cal_ps["transplant_status"].eq("done").to_numpy()
+    cells = np.where(active.to_numpy(), np.where(overall_done[:, None], "✅", "🟩"), "")
 
-    matrix_df = pd.DataFrame(matrix_data)
+    matrix_df = pd.DataFrame(cells, columns=active.columns)
+    matrix_df.insert(0, "Bed", active.index.map(lambda dn: bed_map.get(dn, "—")))
+    matrix_df.insert(0, "Plant", active.index)
     st.dataframe(matrix_df, use_container_width=True, hide_index=True)
     st.caption("🟩 = Scheduled  ✅ = Done (transplant complete)")
 
+
+if tab == "📆 Monthly Calendar":
+    calendar_tab()
+
 # ══════════════════════════════════════════════════════════════════════════════
 # TAB 5 — TASK LIST
 # ══════════════════════════════════════════════════════════════════════════════
-with tab_list:
+@st.fragment
+def list_tab():
     st.subheader("📋 All Planting Tasks")
 
-    all_tasks = []
-    for _, row in df.iterrows():
-        dn     = row["Display Name"]
-        method = row.get("Planting Method", "")
-        start  = row["Start Date"]
-        end    = row["End Date"]
-        bed_nm = bed_lookup.get(dn, "Unassigned")
-        ps     = get_plant_status(dn, progress)
-
-        if pd.notna(start):
-            days_diff = (start.date() - today).days
-            task_status = (
-                "✅ Done" if ps["start_status"] == "done"
-                else ("⏭️ Skipped" if ps["start_status"] == "skipped"
-                      else ("🔄 In Progress" if ps["start_status"] == "in_progress"
-                            else ("⚠️ Overdue" if days_diff < 0 else ("🔜 Soon" if days_diff <= 14 else "⏳ Upcoming"))))
-            )
-            all_tasks.append({
-                "Plant": dn, "Bed": bed_nm,
-                "Action": "Start Indoors / Sow",
-                "Date": start.strftime("%b %d, %Y"),
-                "Days": days_diff, "Method": method,
-                "Status": task_status,
-                "Notes": ps["notes"],
-            })
-
-        if pd.notna(end):
-            days_diff = (end.date() - today).days
-            task_status = (
-                "✅ Done" if ps["transplant_status"] == "done"
-                else ("⏭️ Skipped" if ps["transplant_status"] == "skipped"
-                      else ("🔄 In Progress" if ps["start_status"] in ("in_progress", "done")
-                            else ("⚠️ Overdue" if days_diff < 0 else ("🔜 Soon" if days_diff <= 14 else "⏳ Upcoming"))))
-            )
-            all_tasks.append({
-                "Plant": dn, "Bed": bed_nm,
-                "Action": "Transplant / Direct Sow",
-                "Date": end.strftime("%b %d, %Y"),
-                "Days": days_diff, "Method": method,
-                "Status": task_status,
-                "Notes": ps["notes"],
-            })
-
-    task_df = pd.DataFrame(all_tasks).sort_values("Days").reset_index(drop=True)
-    task_df["Days Label"] = task_df["Days"].apply(
-        lambda d: "Today" if d == 0 else (f"In {d}d" if d > 0 else f"{abs(d)}d ago")
-    )
+    task_df = build_task_frame(df, progress, today)
+    task_df["Days Label"] = days_label(task_df["Days"])
 
     # ── Filters ──
     lc1, lc2, lc3 = st.columns(3)
@@ -678,39 +729,104 @@ with tab_list:
         ftdf[["Status", "Days Label", "Plant", "Bed", "Action", "Date", "Method", "Notes"]],
         use_container_width=True,
         hide_index=True,
+        column_config={"Date": st.column_config.DateColumn("Date", format="MMM D, YYYY")},
     )
 
     # Quick bulk actions
     st.markdown("---")
     st.subheader("⚡ Bulk Actions")
     bc1, bc2 = st.columns(2)
-    with bc1:
-        if st.button("✅ Mark all overdue starts as Done"):
-            changed = 0
-            for _, r in task_df[
-                (task_df["Action"] == "Start Indoors / Sow") & (task_df["Status"] == "⚠️ Overdue")
-            ].iterrows():
-                dn = r["Plant"]
-                ps = get_plant_status(dn, progress)
-                if ps["start_status"] != "done":
-                    progress[dn] = {**progress.get(dn, {}), "start_status": "done"}
-                    changed += 1
-            if changed:
-                save_progress(progress, year)
-                st.success(f"Marked {changed} plants as started.")
-                st.rerun()
-    with bc2:
-        if st.button("✅ Mark all overdue transplants as Done"):
-            changed = 0
-            for _, r in task_df[
-                (task_df["Action"] == "Transplant / Direct Sow") & (task_df["Status"] == "⚠️ Overdue")
-            ].iterrows():
-                dn = r["Plant"]
-                ps = get_plant_status(dn, progress)
-                if ps["transplant_status"] != "done":
-                    progress[dn] = {**progress.get(dn, {}), "transplant_status": "done"}
-                    changed += 1
-            if changed:
-                save_progress(progress, year)
-                st.success(f"Marked {changed} plants as transplanted.")
-                st.rerun()
\ No newline at end of file
+    bulk_actions = [
+        (bc1, "✅ Mark all overdue starts as Done", START_ACTION, "start_status", "started"),
+        (bc2, "✅ Mark all overdue transplants as Done", TRANSPLANT_ACTION, "transplant_status",
+         "transplanted"),
+    ]
+    for col, label, action, field, verb in bulk_actions:
+        with col:
+            if st.button(label):
+                # "Overdue" is only assigned to phases not already done/skipped
+                to_mark = task_df.loc[
+                    (task_df["Action"] == action) & (task_df["Status"] == TASK_STATUS_OVERDUE),
+                    "Plant",
+                ].unique()
+                if len(to_mark):
+                    bulk_set({dn: {field: "done"} for dn in to_mark}, year)
+                    st.success(f"Marked {len(to_mark)} plants as {verb}.")
+                    st.rerun()
+
+
+if tab == "📋 Task List":
+    list_tab()
+
+# ══════════════════════════════════════════════════════════════════════════════
+# TAB 6 — BED OCCUPANCY
+# ══════════════════════════════════════════════════════════════════════════════
+@st.fragment
+def occupancy_tab():
+    st.subheader("🔁 Bed Occupancy & Successions")
+    st.caption(
+        "Each assigned variety holds a slot of its bed from transplant (or direct sow) "
+        "until harvest; a bed has one slot per seed family listed in it. Freed slots are "
+        "re-sown as successions while they still mature by the season end."
+    )
+
+    if not beds:
+        st.info("No garden beds defined yet. Go to **Garden Planner** to create beds.")
+        return
+
+    max_sowings = st.number_input("Max sowings per variety", min_value=1, max_value=12,
+                                  value=DEFAULT_MAX_SOWINGS, step=1, key="occ_max_sowings")
+    occupancy = BedOccupancy(df_full, beds, bed_index, datetime.date.fromisoformat(season_end),
+                             max_sowings=int(max_sowings))
+    plantings = occupancy.plantings()
+    summary = occupancy.summary()
+    conflicts = occupancy.conflicts()
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Plantings", len(plantings))
+    m2.metric("Successions", int((plantings["Sowing"] > 1).sum()))
+    m3.metric("Beds over capacity", conflicts["Bed"].nunique())
+    m4.metric("Avg utilization", f"{summary['Utilization %'].mean():.0f}%" if len(summary) else "—")
+
+    if plantings.empty:
+        st.info("No dated plantings are assigned to beds yet.")
+        return
+
+    shown = st.multiselect("Beds", occupancy.bed_names, default=occupancy.bed_names, key="occ_beds")
+    slots = dict(zip(summary["Bed"], summary["Slots"]))
+    st.plotly_chart(
+        occupancy_timeline(plantings[plantings["Bed"].isin(shown)], slots,
+                           season_start, season_end, today, show_today),
+        use_container_width=True,
+    )
+
+    st.markdown("**Conflicts**")
+    if conflicts.empty:
+        st.success("No bed holds more plantings than it has slots.")
+    else:
+        st.warning(f"{len(conflicts)} span(s) where a bed is over-allocated.")
+        st.dataframe(
+            conflicts, use_container_width=True, hide_index=True,
+            column_config={
+                "From": st.column_config.DateColumn("From", format="MMM D"),
+                "To": st.column_config.DateColumn("To", format="MMM D"),
+            },
+        )
+
+    st.markdown("**Per bed**")
+    st.dataframe(summary, use_container_width=True, hide_index=True,
+                 column_config={"Utilization %": st.column_config.ProgressColumn(
+                     "Utilization %", min_value=0, max_value=100, format="%.0f%%")})
+
+    oc1, oc2 = st.columns(2)
+    with oc1:
+        st.download_button("⬇️ Download Plantings CSV", plantings.to_csv(index=False),
+                           file_name=f"bed_occupancy_{year}.csv", mime="text/csv")
+    with oc2:
+        st.download_button("⬇️ Download Conflicts CSV", conflicts.to_csv(index=False),
+                           file_name=f"bed_conflicts_{year}.csv", mime="text/csv",
+                           disabled=conflicts.empty)
+
+
+if tab == "🔁 Bed Occupancy":
+    occupancy_tab()
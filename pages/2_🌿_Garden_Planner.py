@@ -11,23 +11,38 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import json
 import math
 
-import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
+from utils.bed_cells import BedCells
+from utils.core import capacity_grid, spacing_reference
+from utils.figure_cache import figure_cached
 from utils.helpers import (
-    companion_relationship,
+    current_season,
     get_plant_color,
     get_spacing,
     load_companion_data,
+    load_companion_index,
     load_garden_beds,
-    load_seeds_df,
     load_planting_rules,
+    load_seeds_df,
+    load_site_seeds_df,
     plants_in_bed,
     save_garden_beds,
+    section_tabs,
+    select_site,
     setup_page,
     sidebar_nav,
 )
+from utils.layout import BedLayout
+from utils.seed_order import (
+    DEFAULT_GERMINATION,
+    DEFAULT_MARGIN,
+    DEFAULT_MAX_SOWINGS,
+    brand_totals,
+    seed_order,
+)
+from utils.sites import season_end
 
 setup_page("Garden Planner", "🌿")
 sidebar_nav()
@@ -35,24 +50,174 @@ sidebar_nav()
 st.title("🌿 Garden Space Planner")
 st.caption("Design your beds, calculate spacing, and check companion planting compatibility.")
 
-year = 2026  # Default year
+year = current_season()
+site = select_site()
 df = load_seeds_df(year)
 companion_data = load_companion_data()
+companion_index = load_companion_index()
 beds = load_garden_beds()
 rules = load_planting_rules()
 
 # Unique plant list (seed family names)
 plant_list = sorted(df["Seed"].unique())
 
+# ─── Charts ───────────────────────────────────────────────────────────────────
+@figure_cached
+def bed_diagram(bed, runs, labels, plant_styles):
+    """
+    Top-down bed sketch on its square-foot grid. ``runs`` and ``labels`` come
+    from ``BedCells``; ``plant_styles`` is ``[(plant, color, count)]`` per
+    listed plant.
+    """
+    sq_ft = bed["width"] * bed["length"]
+    fig = go.Figure()
+
+    # Draw bed outline
+    fig.add_shape(
+        type="rect",
+        x0=0, y0=0,
+        x1=bed["width"], y1=bed["length"],
+        line=dict(color="#5D4037", width=3),
+        fillcolor="#8D6E63",
+        opacity=0.15,
+    )
+
+    # Fill each plant's squares, one rectangle per run along a row
+    for run in runs.itertuples(index=False):
+        color = plant_styles[run.Plant][1]
+        fig.add_shape(
+            type="rect",
+            x0=run.x0, y0=run.y0, x1=run.x1, y1=run.y1,
+            fillcolor=color,
+            line=dict(width=0),
+            opacity=0.55,
+        )
+
+    # Square-foot grid lines
+    for x in range(1, math.ceil(bed["width"])):
+        fig.add_shape(type="line", x0=x, x1=x, y0=0, y1=bed["length"],
+                      line=dict(color="white", width=1), opacity=0.6)
+    for y in range(1, math.ceil(bed["length"])):
+        fig.add_shape(type="line", x0=0, x1=bed["width"], y0=y, y1=y,
+                      line=dict(color="white", width=1), opacity=0.6)
+
+    for k, (cx, cy) in labels.items():
+        plant, _, count = plant_styles[k]
+        fig.add_annotation(
+            x=cx, y=cy,
+            text=f"<b>{plant[:12]}</b><br>~{count} plants",
+            showarrow=False,
+            font=dict(size=10, color="white"),
+            align="center",
+        )
+
+    sun_color = {
+        "Full Sun (6+ hrs)": "#FFF176",
+        "Part Sun (3-6 hrs)": "#FFE082",
+        "Shade (<3 hrs)": "#B0BEC5",
+    }.get(bed["sun"], "#E8F5E9")
+
+    fig.update_layout(
+        title=dict(
+            text=(
+                f"🛏️ {bed['name']}  |  {bed['width']}×{bed['length']} ft  |  "
+                f"{sq_ft:.0f} sq ft  |  {bed['sun']}"
+            ),
+            font=dict(size=13),
+        ),
+        xaxis=dict(
+            range=[-0.3, bed["width"] + 0.3], showgrid=False, zeroline=False, showticklabels=False,
+        ),
+        yaxis=dict(
+            range=[-0.3, bed["length"] + 0.3], showgrid=False, zeroline=False, showticklabels=False,
+            scaleanchor="x",
+        ),
+        height=max(250, int(bed["length"] * 60 + 60)),
+        margin=dict(l=10, r=10, t=45, b=10),
+        paper_bgcolor=sun_color,
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig
+
+
+@figure_cached
+def sun_chart(sun_counts):
+    sun_color_map = {
+        "Full Sun": "#FFD54F",
+        "Part Sun": "#FFB74D",
+        "Part to Full": "#FFF176",
+        "Shade": "#90A4AE",
+    }
+    fig = go.Figure(
+        go.Bar(
+            x=sun_counts["Sun Level"],
+            y=sun_counts["Count"],
+            marker_color=[sun_color_map.get(s, "#81C784") for s in sun_counts["Sun Level"]],
+            text=sun_counts["Count"],
+            textposition="outside",
+        )
+    )
+    fig.update_layout(
+        xaxis_title="",
+        yaxis_title="Number of Varieties",
+        height=300,
+        margin=dict(l=0, r=0, t=20, b=0),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig
+
+
 # ─── Tabs ──────────────────────────────────────────────────────────────────────
-tab_beds, tab_spacing, tab_sunlight = st.tabs(
-    ["🛏️ Bed Designer", "📏 Spacing Calculator", "☀️ Sunlight Planner"]
+tab = section_tabs(
+    ["🛏️ Bed Designer", "📏 Spacing Calculator", "☀️ Sunlight Planner", "🛒 Seed Order"],
+    key="planner_tab",
 )
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # TAB 1 — BED DESIGNER
 # ═══════════════════════════════════════════════════════════════════════════════
-with tab_beds:
+def layout_optimizer():
+    """Rearrange the saved beds so good companions neighbour each other."""
+    with st.expander("🧩 Optimize companion layout"):
+        st.caption(
+            "Rearranges plants so good companions sit next to each other and poor "
+            "companions are kept apart, respecting each plant's spacing."
+        )
+        move = st.checkbox("Allow moving plants between beds", value=True, key="layout_move")
+        if st.button("🧩 Optimize Layout", key="layout_run"):
+            layout = BedLayout(beds, companion_index, companion_data.get("spacing_guide", {}))
+            best = layout.optimize(move_between_beds=move)
+            st.session_state["layout_result"] = {
+                "beds": beds,
+                "optimized": layout.beds(best),
+                "before": layout.summary(layout.initial),
+                "after": layout.summary(best),
+            }
+
+        result = st.session_state.get("layout_result")
+        if result is None or result["beds"] != beds:
+            return
+        before, after = result["before"], result["after"]
+        m1, m2, m3 = st.columns(3)
+        m1.metric("✅ Good neighbours", after["good"], after["good"] - before["good"])
+        m2.metric("⚠️ Poor neighbours", after["bad"], after["bad"] - before["bad"],
+                  delta_color="inverse")
+        m3.metric("📏 Too cramped", after["misfits"], after["misfits"] - before["misfits"],
+                  delta_color="inverse")
+        st.dataframe(
+            [{"Bed": bed["name"], "Plants (in layout order)": ", ".join(bed["plants"])}
+             for bed in result["optimized"]],
+            use_container_width=True, hide_index=True,
+        )
+        if st.button("💾 Apply Layout", type="primary", key="layout_apply"):
+            save_garden_beds(result["optimized"])
+            del st.session_state["layout_result"]
+            st.rerun()
+
+
+@st.fragment
+def beds_tab():
     col_left, col_right = st.columns([1, 2])
 
     with col_left:
@@ -155,83 +320,39 @@ with tab_beds:
         if not beds:
             st.info("Add at least one bed to see the garden overview.")
         else:
+            layout_optimizer()
+
             # Visual representation of all beds as a grid of cards
             for bed in beds:
-                plants_in_bed_list = bed.get("plants", [])
-                sq_ft = bed["width"] * bed["length"]
+                cells = BedCells(bed)
 
-                # Build companion analysis
+                # Companion analysis: only plants whose squares touch
                 companion_warnings = []
                 companion_good = []
-                for i, p1 in enumerate(plants_in_bed_list):
-                    for p2 in plants_in_bed_list[i + 1:]:
-                        rel = companion_relationship(p1, p2, companion_data)
-                        if rel == "bad":
-                            companion_warnings.append(f"⚠️ {p1} & {p2} are poor companions")
-                        elif rel == "good":
-                            companion_good.append(f"✅ {p1} & {p2} are great companions")
-
-                # Plotly figure for this bed
-                fig = go.Figure()
-
-                # Draw bed outline
-                fig.add_shape(
-                    type="rect",
-                    x0=0, y0=0,
-                    x1=bed["width"], y1=bed["length"],
-                    line=dict(color="#5D4037", width=3),
-                    fillcolor="#8D6E63",
-                    opacity=0.15,
-                )
-
-                # Place plant circles
-                if plants_in_bed_list:
-                    n = len(plants_in_bed_list)
-                    cols_grid = max(1, math.ceil(math.sqrt(n * bed["width"] / bed["length"])))
-                    rows_grid = math.ceil(n / cols_grid)
-                    cell_w = bed["width"] / cols_grid
-                    cell_h = bed["length"] / rows_grid
-
-                    for idx, plant in enumerate(plants_in_bed_list):
-                        row = idx // cols_grid
-                        col = idx % cols_grid
-                        cx = cell_w * col + cell_w / 2
-                        cy = cell_h * row + cell_h / 2
-                        color = get_plant_color(plant, companion_data)
-                        spacing = get_spacing(plant, companion_data)
-                        count = plants_in_bed(cell_w, cell_h, spacing["spacing_in"])
-
-                        fig.add_shape(
-                            type="circle",
-                            x0=cx - cell_w * 0.35, y0=cy - cell_h * 0.35,
-                            x1=cx + cell_w * 0.35, y1=cy + cell_h * 0.35,
-                            fillcolor=color,
-                            line_color=color,
-                            opacity=0.6,
+                adjacency = cells.adjacency(companion_index)
+                for p1, p2, rel, edges, corners in adjacency.itertuples(index=False, name=None):
+                    touching = f"edges: {edges}, corners: {corners}"
+                    if rel == "bad":
+                        companion_warnings.append(
+                            f"⚠️ {p1} & {p2} are poor companions and touch ({touching})"
                         )
-                        fig.add_annotation(
-                            x=cx, y=cy,
-                            text=f"<b>{plant[:12]}</b><br>~{count} plants",
-                            showarrow=False,
-                            font=dict(size=10, color="white"),
-                            align="center",
+                    else:
+                        companion_good.append(
+                            f"✅ {p1} & {p2} are great companions and touch ({touching})"
                         )
 
-                sun_color = {"Full Sun (6+ hrs)": "#FFF176", "Part Sun (3-6 hrs)": "#FFE082", "Shade (<3 hrs)": "#B0BEC5"}.get(bed["sun"], "#E8F5E9")
-
-                fig.update_layout(
-                    title=dict(
-                        text=f"🛏️ {bed['name']}  |  {bed['width']}×{bed['length']} ft  |  {sq_ft:.0f} sq ft  |  {bed['sun']}",
-                        font=dict(size=13),
-                    ),
-                    xaxis=dict(range=[-0.3, bed["width"] + 0.3], showgrid=False, zeroline=False, showticklabels=False),
-                    yaxis=dict(range=[-0.3, bed["length"] + 0.3], showgrid=False, zeroline=False, showticklabels=False, scaleanchor="x"),
-                    height=max(250, int(bed["length"] * 60 + 60)),
-                    margin=dict(l=10, r=10, t=45, b=10),
-                    paper_bgcolor=sun_color,
-                    plot_bgcolor="rgba(0,0,0,0)",
+                capacity = cells.capacity(companion_data.get("spacing_guide", {}))
+                plant_styles = [
+                    (plant, get_plant_color(plant, companion_data), count)
+                    for plant, count in zip(capacity["Plant"], capacity["Plants"])
+                ]
+                st.plotly_chart(
+                    bed_diagram(bed, cells.runs(), cells.label_points(), plant_styles),
+                    use_container_width=True,
                 )
-                st.plotly_chart(fig, use_container_width=True)
+                crowded = capacity.loc[capacity["Squares"] == 0, "Plant"].tolist()
+                if crowded:
+                    st.caption(f"No square foot left for: {', '.join(crowded)}")
 
                 if companion_good:
                     for msg in companion_good:
@@ -242,10 +363,15 @@ with tab_beds:
                 st.markdown("---")
 
 
+if tab == "🛏️ Bed Designer":
+    beds_tab()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # TAB 2 — SPACING CALCULATOR
 # ═══════════════════════════════════════════════════════════════════════════════
-with tab_spacing:
+@st.fragment
+def spacing_tab():
     st.subheader("📏 Spacing & Yield Calculator")
     st.caption("Calculate how many plants fit in your space and estimate yields.")
 
@@ -286,37 +412,62 @@ with tab_spacing:
 
     st.markdown("---")
 
+    # ── Every plant × every bed ──
+    st.subheader("🧮 Capacity Planner")
+    st.caption("How many of every plant fit in each saved bed — for working out seed quantities.")
+    # Fixed label: one naming the dimensions would reset the widget when they change
+    include_area = st.checkbox("Include the area above", value=not beds, key="capacity_area")
+    areas = list(beds)
+    if include_area:
+        area_name = f"Area {calc_width:g}×{calc_length:g} ft"
+        areas.append({"name": area_name, "width": calc_width, "length": calc_length})
+    if not areas:
+        st.info("Add a bed in the Bed Designer, or include the area above.")
+    else:
+        method = st.radio(
+            "Count by", ["SFG", "Row-based", "Per Square (CSV)"],
+            horizontal=True, key="capacity_method",
+            help="SFG: square-foot spacing. Row-based: plant spacing along rows, "
+                 "row spacing between them. Per Square (CSV): the catalogue's Per Square × area.",
+        )
+        capacity = capacity_grid(df, companion_data, areas, plant_list)
+        table = (
+            capacity.drop_duplicates(["Plant", "Bed"])
+            .pivot(index="Plant", columns="Bed", values=method)
+            .reindex(columns=list(dict.fromkeys(bed["name"] for bed in areas)))
+        )
+        st.dataframe(table, use_container_width=True)
+        st.download_button(
+            "⬇️ Export Capacity Table (CSV)",
+            data=capacity.to_csv(index=False),
+            file_name=f"capacity_{year}.csv",
+            mime="text/csv",
+        )
+
+    st.markdown("---")
+
     # ── Full spacing reference table ──
     st.subheader("📋 Full Spacing Reference")
-    spacing_guide = companion_data.get("spacing_guide", {})
-    spacing_rows = []
-    for plant, info in spacing_guide.items():
-        plant_rows = df[df["Seed"] == plant]
-        per_sq = ""
-        if not plant_rows.empty and "Per Square" in plant_rows.columns:
-            ps = plant_rows["Per Square"].dropna()
-            if not ps.empty:
-                per_sq = ps.iloc[0]
-        spacing_rows.append({
-            "Plant": plant,
-            "Spacing (in)": info["spacing_in"],
-            "Row Spacing (in)": info["row_spacing_in"],
-            "Depth (in)": info["depth_in"],
-            "Per Sq Ft (SFG)": round((12 / info["spacing_in"]) ** 2, 1),
-            "Per Sq (CSV)": per_sq,
-        })
-    spacing_df = pd.DataFrame(spacing_rows).sort_values("Plant")
+    spacing_df = spacing_reference(df, companion_data)
     st.dataframe(spacing_df, use_container_width=True, hide_index=True)
 
 
+if tab == "📏 Spacing Calculator":
+    spacing_tab()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # TAB 3 — SUNLIGHT PLANNER
 # ═══════════════════════════════════════════════════════════════════════════════
-with tab_sunlight:
+@st.fragment
+def sunlight_tab():
     st.subheader("☀️ Sunlight Planner")
     st.caption("View your plants grouped by sunlight requirements.")
 
-    sun_groups = df.groupby("Sun")["Display Name"].apply(list).to_dict() if "Sun" in df.columns else {}
+    sun_groups = (
+        df.groupby("Sun", observed=True)["Display Name"].apply(list).to_dict()
+        if "Sun" in df.columns else {}
+    )
 
     sun_icons = companion_data.get("sun_icons", {})
 
@@ -351,27 +502,71 @@ with tab_sunlight:
     if "Sun" in df.columns:
         sun_counts = df["Sun"].value_counts().reset_index()
         sun_counts.columns = ["Sun Level", "Count"]
-        sun_color_map = {
-            "Full Sun": "#FFD54F",
-            "Part Sun": "#FFB74D",
-            "Part to Full": "#FFF176",
-            "Shade": "#90A4AE",
-        }
-        fig_sun = go.Figure(
-            go.Bar(
-                x=sun_counts["Sun Level"],
-                y=sun_counts["Count"],
-                marker_color=[sun_color_map.get(s, "#81C784") for s in sun_counts["Sun Level"]],
-                text=sun_counts["Count"],
-                textposition="outside",
-            )
+        st.plotly_chart(sun_chart(sun_counts), use_container_width=True)
+
+
+if tab == "☀️ Sunlight Planner":
+    sunlight_tab()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TAB 4 — SEED ORDER
+# ═══════════════════════════════════════════════════════════════════════════════
+@st.fragment
+def seed_order_tab():
+    st.subheader("🛒 Seed Order Planner")
+    st.caption(
+        "Seeds to buy for every variety in your beds: each bed's area shared between its "
+        "plants, filled at the catalogue's Per Square (or spacing) density, re-sown while "
+        "the season allows."
+    )
+    if not beds:
+        st.info("Add at least one bed in the Bed Designer to plan a seed order.")
+        return
+
+    col_a, col_b, col_c = st.columns(3)
+    with col_a:
+        germination = st.slider(
+            "Germination rate (%)", 30, 100, int(DEFAULT_GERMINATION * 100), step=5,
+            key="order_germination",
         )
-        fig_sun.update_layout(
-            xaxis_title="",
-            yaxis_title="Number of Varieties",
-            height=300,
-            margin=dict(l=0, r=0, t=20, b=0),
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
+    with col_b:
+        margin = st.slider(
+            "Safety margin (%)", 0, 100, int(DEFAULT_MARGIN * 100), step=5, key="order_margin"
         )
-        st.plotly_chart(fig_sun, use_container_width=True)
\ No newline at end of file
+    with col_c:
+        max_sowings = st.number_input(
+            "Max sowings per variety", min_value=1, max_value=12, value=DEFAULT_MAX_SOWINGS,
+            step=1, key="order_sowings",
+            help="Successions: re-sow every 'Days' until the season end. 1 turns them off.",
+        )
+
+    # Sow dates and season end follow the selected site
+    order = seed_order(
+        load_site_seeds_df(site["id"], year), beds, companion_data,
+        season_end=season_end(site, year), germination=germination / 100,
+        margin=margin / 100, max_sowings=int(max_sowings),
+    )
+    if order.empty:
+        st.info("None of the plants in your beds has a variety in the seed catalogue.")
+        return
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Varieties", len(order))
+    m2.metric("Plants", f"{int(order['Plants'].sum()):,}")
+    m3.metric("Seeds", f"{int(order['Seeds'].sum()):,}")
+
+    st.markdown("**By brand**")
+    st.dataframe(brand_totals(order), use_container_width=True, hide_index=True)
+    st.markdown("**By variety**")
+    st.dataframe(order, use_container_width=True, hide_index=True)
+    st.download_button(
+        "⬇️ Export Seed Order (CSV)",
+        data=order.to_csv(index=False),
+        file_name=f"seed_order_{year}.csv",
+        mime="text/csv",
+    )
+
+
+if tab == "🛒 Seed Order":
+    seed_order_tab()
@@ -15,18 +15,22 @@ import pandas as pd
 import streamlit as st
 
 from utils.helpers import (
+    current_season,
     load_seeds_df,
     reload_seeds,
     load_harvest_log,
-    save_harvest_log,
+    append_harvest,
     load_garden_beds,
     save_garden_beds,
     load_planting_rules,
     save_planting_rules,
     load_companion_data,
+    rule_schedule,
+    select_site,
     setup_page,
     sidebar_nav,
 )
+from utils.sites import frost_table, site_date
 
 setup_page("Database Manager", "📊")
 sidebar_nav()
@@ -35,7 +39,8 @@ st.title("📊 Database Manager")
 st.caption("View, edit, add, and delete your seed and planting data.")
 
 # ─── Load data ────────────────────────────────────────────────────────────────
-year = 2026  # Default year
+year = current_season()
+site = select_site()
 df = load_seeds_df(year)
 
 # ─── Tabs ──────────────────────────────────────────────────────────────────────
@@ -111,9 +116,9 @@ with tab_harvest:
     st.caption("Track what you've harvested, when, and how much.")
 
     # Load harvest log
-    harvest_df = load_harvest_log()
+    harvest_df = load_harvest_log(year)
 
-    st.dataframe(harvest_df, use_container_width=True, hide_index=True)
+    st.dataframe(harvest_df, use_container_width=True, hide_index=True, column_config={"ID": None})
 
     # Add new harvest entry
     with st.form("add_harvest"):
@@ -128,15 +133,13 @@ with tab_harvest:
         harvest_notes = st.text_input("Notes", placeholder="e.g. First harvest, good yield")
 
         if st.form_submit_button("➕ Add Harvest", type="primary"):
-            new_harvest = pd.DataFrame([{
+            append_harvest({
                 "Date": harvest_date,
                 "Plant": harvest_plant,
                 "Variant": df[df["Display Name"] == harvest_plant]["Variant"].iloc[0],
                 "Quantity_kg": harvest_qty,
                 "Notes": harvest_notes,
-            }])
-            harvest_df = pd.concat([harvest_df, new_harvest], ignore_index=True)
-            save_harvest_log(harvest_df)
+            })
             st.success(f"✅ Added harvest for {harvest_plant}")
             st.rerun()
 
@@ -221,6 +224,22 @@ with tab_beds:
         if rules:
             st.dataframe(pd.DataFrame(rules["planting_rules"]).T, use_container_width=True, hide_index=True)
 
+            last_frost = site_date(site, "last_frost", year)
+            st.markdown(
+                f"**📅 Dates from rules ({year}, {site['name']}, "
+                f"last frost {last_frost:%b} {last_frost.day})**"
+            )
+            rule_dates = rule_schedule([year], frost_table([site], [year]))
+            st.dataframe(
+                rule_dates[["Plant", "Start Date", "End Date"]],
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "Start Date": st.column_config.DateColumn("Start", format="MMM D"),
+                    "End Date": st.column_config.DateColumn("Transplant / Sow", format="MMM D"),
+                },
+            )
+
             # Add/edit rule
             with st.form("add_rule"):
                 rule_plant = st.selectbox("Plant", df["Display Name"].unique())
@@ -8,16 +8,19 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
+from utils.core import companion_stats
+from utils.figure_cache import figure_cached
 from utils.helpers import (
-    companion_relationship,
+    current_season,
     get_plant_color,
     load_companion_data,
-    load_seeds_df,
+    load_companion_index,
     load_planting_rules,
+    load_seeds_df,
+    section_tabs,
     setup_page,
     sidebar_nav,
 )
@@ -28,10 +31,11 @@ sidebar_nav()
 st.title("🤝 Companion Planting Guide")
 st.caption("Discover which plants grow best together — and which to keep apart.")
 
-year = 2026  # Default year
+year = current_season()
 df = load_seeds_df(year)
 companion_data = load_companion_data()
 companions = companion_data.get("companions", {})
+companion_index = load_companion_index()
 rules = load_planting_rules()
 
 # All plants in the companion database + CSV
@@ -39,15 +43,64 @@ all_plants_companion = sorted(companions.keys())
 all_plants_csv = sorted(df["Seed"].unique())
 all_plants = sorted(set(all_plants_companion + all_plants_csv))
 
+# ─── Charts ───────────────────────────────────────────────────────────────────
+@figure_cached
+def companion_heatmap(matrix_plants, z_values):
+    n = len(matrix_plants)
+    hover_templates = {
+        1: "✅ {} + {}: Good companions",
+        -1: "⛔ {} + {}: Poor companions",
+        0: "⬜ {} + {}: Neutral",
+    }
+    hover_text = [
+        [
+            f"{p1} (same plant)" if i == j else hover_templates[z].format(p1, p2)
+            for j, (p2, z) in enumerate(zip(matrix_plants, z_row.tolist()))
+        ]
+        for i, (p1, z_row) in enumerate(zip(matrix_plants, z_values))
+    ]
+
+    fig = go.Figure(
+        go.Heatmap(
+            z=z_values,
+            x=matrix_plants,
+            y=matrix_plants,
+            text=hover_text,
+            hoverinfo="text",
+            colorscale=[
+                [0.0, "#ffcdd2"],
+                [0.5, "#f5f5f5"],
+                [1.0, "#c8e6c9"],
+            ],
+            zmin=-1,
+            zmax=1,
+            showscale=False,
+            xgap=2,
+            ygap=2,
+        )
+    )
+    fig.update_layout(
+        height=max(400, 30 * n + 100),
+        margin=dict(l=120, r=20, t=20, b=120),
+        xaxis=dict(tickangle=-45, tickfont=dict(size=11)),
+        yaxis=dict(tickfont=dict(size=11)),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig
+
+
 # ─── Tabs ──────────────────────────────────────────────────────────────────────
-tab_lookup, tab_matrix, tab_tips = st.tabs(
-    ["🔍 Plant Lookup", "🗂️ Compatibility Matrix", "💡 Planting Tips"]
+tab = section_tabs(
+    ["🔍 Plant Lookup", "🗂️ Compatibility Matrix", "💡 Planting Tips"],
+    key="companions_tab",
 )
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # TAB 1 — PLANT LOOKUP
 # ═══════════════════════════════════════════════════════════════════════════════
-with tab_lookup:
+@st.fragment
+def lookup_tab():
     st.subheader("🔍 Find Companions for a Plant")
 
     selected_plant = st.selectbox("Choose a plant:", all_plants)
@@ -112,7 +165,7 @@ with tab_lookup:
             key="pair_b",
         )
 
-    rel = companion_relationship(plant_a, plant_b, companion_data)
+    rel = companion_index.relationship(plant_a, plant_b)
     if rel == "good":
         st.success(f"✅ **{plant_a}** and **{plant_b}** are great companions! Plant them together.")
         # Get the specific note
@@ -128,10 +181,15 @@ with tab_lookup:
         st.info(f"ℹ️ **{plant_a}** and **{plant_b}** have no known interaction — they should be fine together.")
 
 
+if tab == "🔍 Plant Lookup":
+    lookup_tab()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # TAB 2 — COMPATIBILITY MATRIX
 # ═══════════════════════════════════════════════════════════════════════════════
-with tab_matrix:
+@st.fragment
+def matrix_tab():
     st.subheader("🗂️ Companion Planting Matrix")
     st.caption("Green = good companions | Red = poor companions | White = neutral")
 
@@ -145,60 +203,8 @@ with tab_matrix:
     if len(matrix_plants) < 2:
         st.warning("Select at least 2 plants to build the matrix.")
     else:
-        n = len(matrix_plants)
-        z_values = []
-        hover_text = []
-
-        for p1 in matrix_plants:
-            row_z = []
-            row_hover = []
-            for p2 in matrix_plants:
-                if p1 == p2:
-                    row_z.append(0)
-                    row_hover.append(f"{p1} (same plant)")
-                else:
-                    rel = companion_relationship(p1, p2, companion_data)
-                    if rel == "good":
-                        row_z.append(1)
-                        row_hover.append(f"✅ {p1} + {p2}: Good companions")
-                    elif rel == "bad":
-                        row_z.append(-1)
-                        row_hover.append(f"⛔ {p1} + {p2}: Poor companions")
-                    else:
-                        row_z.append(0)
-                        row_hover.append(f"⬜ {p1} + {p2}: Neutral")
-                    
-            z_values.append(row_z)
-            hover_text.append(row_hover)
-
-        fig = go.Figure(
-            go.Heatmap(
-                z=z_values,
-                x=matrix_plants,
-                y=matrix_plants,
-                text=hover_text,
-                hoverinfo="text",
-                colorscale=[
-                    [0.0, "#ffcdd2"],
-                    [0.5, "#f5f5f5"],
-                    [1.0, "#c8e6c9"],
-                ],
-                zmin=-1,
-                zmax=1,
-                showscale=False,
-                xgap=2,
-                ygap=2,
-            )
-        )
-        fig.update_layout(
-            height=max(400, 30 * n + 100),
-            margin=dict(l=120, r=20, t=20, b=120),
-            xaxis=dict(tickangle=-45, tickfont=dict(size=11)),
-            yaxis=dict(tickfont=dict(size=11)),
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        z_values = companion_index.submatrix(matrix_plants)
+        st.plotly_chart(companion_heatmap(matrix_plants, z_values), use_container_width=True)
 
         # Legend
         lc1, lc2, lc3 = st.columns(3)
@@ -207,15 +213,20 @@ with tab_matrix:
         lc3.markdown('<span class="badge-neutral">⬜ Neutral</span>', unsafe_allow_html=True)
 
         # ── Summary count ──
-        good_count = sum(cell for row in z_values for cell in row if cell == 1) // 2
-        bad_count = sum(1 for row in z_values for cell in row if cell == -1) // 2
+        good_count = int((z_values == 1).sum()) // 2
+        bad_count = int((z_values == -1).sum()) // 2
         st.markdown(f"**{good_count} good pairings** · **{bad_count} incompatible pairings** among selected plants")
 
 
+if tab == "🗂️ Compatibility Matrix":
+    matrix_tab()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # TAB 3 — PLANTING TIPS
 # ═══════════════════════════════════════════════════════════════════════════════
-with tab_tips:
+@st.fragment
+def tips_tab():
     st.subheader("💡 General Companion Planting Tips")
 
     tips = [
@@ -285,18 +296,9 @@ with tab_tips:
     st.subheader("📋 Quick Reference: Your Garden's Companion Stats")
 
     # Count good/bad pairings for each plant in the user's CSV
-    stats = []
-    for plant in all_plants_csv:
-        info = companions.get(plant, {})
-        good = len(info.get("good", []))
-        bad = len(info.get("bad", []))
-        in_db = "✅" if plant in companions else "—"
-        stats.append({
-            "Plant": plant,
-            "In Companion DB": in_db,
-            "Good Companions": good,
-            "Poor Companions": bad,
-            "Notes": info.get("notes", ""),
-        })
-    stats_df = pd.DataFrame(stats).sort_values("Good Companions", ascending=False)
-    st.dataframe(stats_df, use_container_width=True, hide_index=True)
\ No newline at end of file
+    stats_df = companion_stats(all_plants_csv, companion_data)
+    st.dataframe(stats_df, use_container_width=True, hide_index=True)
+
+
+if tab == "💡 Planting Tips":
+    tips_tab()
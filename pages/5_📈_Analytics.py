@@ -16,15 +16,35 @@ import plotly.graph_objects as go
 import streamlit as st
 
 from utils.helpers import (
+    append_harvest,
+    delete_harvest,
+    current_season,
     get_plant_color,
+    harvest_years,
+    load_bed_index,
     load_companion_data,
-    load_harvest_log,
+    load_harvest_rollups,
     load_seeds_df,
     load_planting_rules,
-    save_harvest_log,
+    load_season_harvests,
+    load_season_plants,
+    season_years,
+    section_tabs,
     setup_page,
     sidebar_nav,
+    update_harvest,
 )
+from utils.core import (
+    brand_breakdown,
+    cost_analysis,
+    example_projection,
+    market_price_table,
+    monthly_activity,
+    return_on_investment,
+)
+from utils.beds import UNASSIGNED
+from utils.figure_cache import figure_cached
+from utils.seasons import completion_rates, timing_drift, yield_by_year
 
 setup_page("Analytics", "📈")
 sidebar_nav()
@@ -32,24 +52,199 @@ sidebar_nav()
 st.title("📈 Analytics & Harvest Tracker")
 st.caption("Track your harvests, analyze yields, and get insights about your garden.")
 
-year = 2026  # Default year
+# Seasons with seeds data or harvests; harvests are filed by the year of their date
+years = sorted(set(season_years()) | set(harvest_years()) | {current_season()})
+year = st.sidebar.selectbox(
+    "📆 Season", years, index=years.index(current_season()), key="analytics_year"
+)
 df = load_seeds_df(year)
-harvest_df = load_harvest_log()
+harvest_rollups = load_harvest_rollups(year)
+harvest_df = harvest_rollups.frame.copy(deep=False)
 companion_data = load_companion_data()
 rules = load_planting_rules()
 
 plant_list = sorted(df["Seed"].unique())
 variant_list = sorted(df["Display Name"].unique())
 
+# ─── Charts ───────────────────────────────────────────────────────────────────
+@figure_cached
+def harvest_bar(plant_totals, colors):
+    fig = go.Figure(
+        go.Bar(
+            x=plant_totals["Plant"],
+            y=plant_totals["Total (kg)"],
+            marker_color=colors,
+            text=plant_totals["Total (kg)"].apply(lambda x: f"{x:.2f} kg"),
+            textposition="outside",
+        )
+    )
+    fig.update_layout(
+        xaxis_title="",
+        yaxis_title="Harvest (kg)",
+        height=350,
+        margin=dict(l=0, r=0, t=20, b=0),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig
+
+
+@figure_cached
+def harvest_line(daily, colors):
+    fig = px.line(
+        daily,
+        x="Date",
+        y="Quantity_kg",
+        color="Plant",
+        markers=True,
+        labels={"Quantity_kg": "Harvest (kg)", "Date": ""},
+        color_discrete_map=colors,
+    )
+    fig.update_layout(
+        height=300,
+        margin=dict(l=0, r=0, t=20, b=0),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        legend_title_text="Plant",
+    )
+    return fig
+
+
+@figure_cached
+def activity_chart(merged):
+    fig = go.Figure()
+    fig.add_trace(
+        go.Bar(name="Start Indoors / Direct Sow", x=merged["Month Label"], y=merged["Starts"],
+               marker_color="#4CAF50")
+    )
+    fig.add_trace(
+        go.Bar(name="Transplant / Final Sow", x=merged["Month Label"], y=merged["Transplants"],
+               marker_color="#FF9800")
+    )
+    fig.update_layout(
+        barmode="group",
+        height=300,
+        margin=dict(l=0, r=0, t=20, b=0),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        xaxis_title="",
+        yaxis_title="Number of Plants",
+        legend_title_text="Activity",
+    )
+    return fig
+
+
+@figure_cached
+def days_histogram(days_numeric):
+    fig = px.histogram(
+        days_numeric,
+        nbins=15,
+        labels={"value": "Days to Harvest", "count": "# Plants"},
+        color_discrete_sequence=["#4CAF50"],
+    )
+    fig.update_layout(
+        height=280,
+        margin=dict(l=0, r=0, t=20, b=0),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        showlegend=False,
+    )
+    fig.update_traces(marker_line_width=1, marker_line_color="white")
+    return fig
+
+
+@figure_cached
+def brand_treemap(brand_df):
+    fig = px.treemap(
+        brand_df,
+        path=["Brand"],
+        values="Varieties",
+        color="Varieties",
+        color_continuous_scale="Greens",
+        hover_data=["Plants"],
+    )
+    fig.update_layout(
+        height=350,
+        margin=dict(l=0, r=0, t=20, b=0),
+        coloraxis_showscale=False,
+    )
+    return fig
+
+
+@figure_cached
+def frost_pie(frost_df):
+    frost_color_map = {
+        "Tolerant": "#42A5F5",
+        "Semi-tolerant": "#FFA726",
+        "Not tolerant": "#EF5350",
+    }
+    fig = px.pie(
+        frost_df,
+        names="Tolerance",
+        values="Count",
+        color="Tolerance",
+        color_discrete_map=frost_color_map,
+        hole=0.4,
+    )
+    fig.update_layout(
+        height=280,
+        margin=dict(l=0, r=0, t=10, b=0),
+        paper_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig
+
+
+@figure_cached
+def value_chart(cost_df, colors):
+    fig = go.Figure(
+        go.Bar(
+            x=cost_df["Plant"],
+            y=cost_df["Value ($)"],
+            marker_color=colors,
+            text=cost_df["Value ($)"].apply(lambda x: f"${x:.2f}"),
+            textposition="outside",
+        )
+    )
+    fig.update_layout(
+        xaxis_title="",
+        yaxis_title="Estimated Value ($)",
+        height=320,
+        margin=dict(l=0, r=0, t=20, b=0),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig
+
+
+@figure_cached
+def season_yield_chart(yields):
+    long = (
+        yields.drop(columns="Total").rename_axis(columns="Year").stack().rename("kg").reset_index()
+    )
+    long["Year"] = long["Year"].astype(str)
+    fig = px.bar(long, x="Plant", y="kg", color="Year", barmode="group",
+                 labels={"kg": "Harvest (kg)", "Plant": ""})
+    fig.update_layout(
+        height=350,
+        margin=dict(l=0, r=0, t=20, b=0),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig
+
+
 # ─── Tabs ──────────────────────────────────────────────────────────────────────
-tab_harvest, tab_insights, tab_companion, tab_cost = st.tabs(
-    ["🌾 Harvest Tracker", "📊 Garden Insights", "🤝 Companion Effectiveness", "💰 Cost Analysis"]
+tab = section_tabs(
+    ["🌾 Harvest Tracker", "📊 Garden Insights", "🤝 Companion Effectiveness", "💰 Cost Analysis",
+     "📆 Seasons"],
+    key="analytics_tab",
 )
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # TAB 1 — HARVEST TRACKER
 # ═══════════════════════════════════════════════════════════════════════════════
-with tab_harvest:
+@st.fragment
+def harvest_tab():
     st.subheader("🌾 Log a Harvest")
 
     with st.form("harvest_form"):
@@ -70,16 +265,13 @@ with tab_harvest:
         log_submitted = st.form_submit_button("➕ Log Harvest", type="primary")
 
         if log_submitted:
-            new_entry = pd.DataFrame([{
+            append_harvest({
                 "Date": pd.Timestamp(h_date),
                 "Plant": h_plant,
                 "Variant": h_variant,
                 "Quantity_kg": h_qty,
                 "Notes": h_notes,
-            }])
-            updated = pd.concat([harvest_df, new_entry], ignore_index=True)
-            save_harvest_log(updated, year)
-            harvest_df = updated
+            })
             st.success(f"✅ Logged {h_qty} kg of **{h_variant}** on {h_date.strftime('%b %d, %Y')}")
             st.rerun()
 
@@ -91,9 +283,9 @@ with tab_harvest:
         )
     else:
         # ── Harvest Summary ──
-        total_kg = harvest_df["Quantity_kg"].sum()
-        total_entries = len(harvest_df)
-        unique_plants = harvest_df["Plant"].nunique()
+        total_kg = harvest_rollups.total_kg
+        total_entries = harvest_rollups.n
+        unique_plants = len(harvest_rollups.plants)
 
         mc1, mc2, mc3 = st.columns(3)
         mc1.metric("🌾 Total Harvest", f"{total_kg:.2f} kg")
@@ -109,13 +301,11 @@ with tab_harvest:
         fc1, fc2 = st.columns(2)
         with fc1:
             filter_plant = st.multiselect(
-                "Filter by plant", sorted(harvest_df["Plant"].unique()),
-                default=sorted(harvest_df["Plant"].unique()),
+                "Filter by plant", harvest_rollups.plants, default=harvest_rollups.plants,
             )
         with fc2:
-            if not harvest_df["Date"].isna().all():
-                date_min = harvest_df["Date"].min().date()
-                date_max = harvest_df["Date"].max().date()
+            if harvest_rollups.bounds is not None:
+                date_min, date_max = harvest_rollups.bounds
                 date_range = st.date_input(
                     "Date range",
                     value=(date_min, date_max),
@@ -125,14 +315,13 @@ with tab_harvest:
             else:
                 date_range = None
 
-        h_display = harvest_df[harvest_df["Plant"].isin(filter_plant)].copy()
-        if date_range and len(date_range) == 2:
-            h_display = h_display[
-                (h_display["Date"].dt.date >= date_range[0])
-                & (h_display["Date"].dt.date <= date_range[1])
-            ]
+        # Range and plant filters are answered from the rollups' date index
+        # and daily totals instead of scanning the whole log
+        start, end = date_range if date_range and len(date_range) == 2 else (None, None)
+        plants = None if len(filter_plant) == len(harvest_rollups.plants) else filter_plant
+        h_display = harvest_rollups.rows(start, end, plants)
 
-        h_display_sorted = h_display.sort_values("Date", ascending=False)
+        h_display_sorted = h_display.iloc[::-1].copy()
         st.dataframe(
             h_display_sorted,
             width='stretch',
@@ -140,85 +329,86 @@ with tab_harvest:
             column_config={
                 "Date": st.column_config.DateColumn("Date", format="MMM D, YYYY"),
                 "Quantity_kg": st.column_config.NumberColumn("Qty (kg)", format="%.2f"),
+                "ID": None,
             },
         )
 
-        # ── Delete entry ──
-        with st.expander("🗑️ Delete a harvest entry"):
-            h_display_sorted["_idx_label"] = (
-                h_display_sorted["Date"].dt.strftime("%b %d, %Y")
+        # ── Edit / delete entry ──
+        with st.expander("✏️ Edit or delete a harvest entry"):
+            # Entries are picked by ID. The selectbox tells options apart by
+            # label, so identical-looking entries get a running number
+            entries = h_display_sorted.set_index("ID")
+            labels = (
+                entries["Date"].dt.strftime("%b %d, %Y")
                 + " — "
-                + h_display_sorted["Variant"].astype(str)
+                + entries["Variant"].astype(str)
                 + " ("
-                + h_display_sorted["Quantity_kg"].astype(str)
+                + entries["Quantity_kg"].astype(str)
                 + " kg)"
             )
-            del_options = h_display_sorted["_idx_label"].tolist()
-            if del_options:
-                del_choice = st.selectbox("Select entry to delete", del_options)
+            repeat = labels.groupby(labels).cumcount()
+            labels = labels.where(repeat == 0, labels + " #" + (repeat + 1).astype(str)).to_dict()
+            if labels:
+                entry_id = st.selectbox("Select entry", list(labels), format_func=labels.get)
+                entry = entries.loc[entry_id]
+                with st.form("edit_harvest"):
+                    ec1, ec2 = st.columns(2)
+                    with ec1:
+                        e_date = st.date_input(
+                            "Harvest Date",
+                            value=(
+                                entry["Date"].date() if pd.notna(entry["Date"])
+                                else datetime.date.today()
+                            ),
+                        )
+                        e_qty = st.number_input(
+                            "Quantity (kg)", min_value=0.0, max_value=500.0,
+                            value=float(entry["Quantity_kg"]), step=0.1,
+                        )
+                    with ec2:
+                        e_notes = st.text_area(
+                            "Notes",
+                            value="" if pd.isna(entry["Notes"]) else str(entry["Notes"]),
+                            height=90,
+                        )
+                    if st.form_submit_button("💾 Save Changes", type="primary"):
+                        update_harvest(
+                            entry_id,
+                            {"Date": pd.Timestamp(e_date), "Quantity_kg": e_qty, "Notes": e_notes},
+                            year,
+                        )
+                        st.success("Entry updated.")
+                        st.rerun()
                 if st.button("🗑️ Delete Entry", type="secondary"):
-                    del_idx = h_display_sorted[h_display_sorted["_idx_label"] == del_choice].index[0]
-                    updated = harvest_df.drop(index=del_idx).reset_index(drop=True)
-                    save_harvest_log(updated, year)
+                    delete_harvest(entry_id, year)
                     st.success("Entry deleted.")
                     st.rerun()
 
         # ── Harvest chart ──
         st.markdown("---")
         st.subheader("📊 Harvest by Plant")
-        plant_totals = (
-            h_display.groupby("Plant")["Quantity_kg"]
-            .sum()
-            .sort_values(ascending=False)
-            .reset_index()
-        )
-        plant_totals.columns = ["Plant", "Total (kg)"]
+        plant_totals = harvest_rollups.totals(start, end, plants)
         colors = [get_plant_color(p, companion_data) for p in plant_totals["Plant"]]
 
-        fig_bar = go.Figure(
-            go.Bar(
-                x=plant_totals["Plant"],
-                y=plant_totals["Total (kg)"],
-                marker_color=colors,
-                text=plant_totals["Total (kg)"].apply(lambda x: f"{x:.2f} kg"),
-                textposition="outside",
-            )
-        )
-        fig_bar.update_layout(
-            xaxis_title="",
-            yaxis_title="Harvest (kg)",
-            height=350,
-            margin=dict(l=0, r=0, t=20, b=0),
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-        )
-        st.plotly_chart(fig_bar, use_container_width=True)
+        st.plotly_chart(harvest_bar(plant_totals, colors), use_container_width=True)
 
         # ── Harvest over time ──
         if len(h_display) > 1:
             st.subheader("📅 Harvest Over Time")
-            daily = (
-                h_display.groupby(["Date", "Plant"])["Quantity_kg"]
-                .sum()
-                .reset_index()
+            daily = harvest_rollups.daily(start, end, plants)
+            line_colors = {p: get_plant_color(p, companion_data) for p in daily["Plant"].unique()}
+            st.plotly_chart(harvest_line(daily, line_colors), use_container_width=True)
+
+        # ── Harvest by bed ──
+        by_bed = harvest_rollups.by_bed(load_bed_index(year).assign)
+        if by_bed["Bed"].ne(UNASSIGNED).any():
+            st.subheader("🛏️ Harvest by Bed")
+            st.dataframe(
+                by_bed, use_container_width=True, hide_index=True,
+                column_config={
+                    "Total (kg)": st.column_config.NumberColumn("Total (kg)", format="%.2f")
+                },
             )
-            fig_line = px.line(
-                daily,
-                x="Date",
-                y="Quantity_kg",
-                color="Plant",
-                markers=True,
-                labels={"Quantity_kg": "Harvest (kg)", "Date": ""},
-                color_discrete_map={p: get_plant_color(p, companion_data) for p in daily["Plant"].unique()},
-            )
-            fig_line.update_layout(
-                height=300,
-                margin=dict(l=0, r=0, t=20, b=0),
-                paper_bgcolor="rgba(0,0,0,0)",
-                plot_bgcolor="rgba(0,0,0,0)",
-                legend_title_text="Plant",
-            )
-            st.plotly_chart(fig_line, use_container_width=True)
 
         # Export harvest log
         st.download_button(
@@ -229,66 +419,22 @@ with tab_harvest:
         )
 
 
+if tab == "🌾 Harvest Tracker":
+    harvest_tab()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # TAB 2 — GARDEN INSIGHTS
 # ═══════════════════════════════════════════════════════════════════════════════
-with tab_insights:
+@st.fragment
+def insights_tab():
     st.subheader("📊 Garden Insights")
 
     # ── Planting timeline density ──
     st.markdown("#### 📅 Planting Activity by Month")
-    df_activity = df.copy()
-    df_activity["Start Month"] = df_activity["Start Date"].dt.month
-    df_activity["End Month"] = df_activity["End Date"].dt.month
-
-    month_labels = {1:"Jan",2:"Feb",3:"Mar",4:"Apr",5:"May",6:"Jun",
-                    7:"Jul",8:"Aug",9:"Sep",10:"Oct",11:"Nov",12:"Dec"}
-
-    monthly_counts = (
-        df_activity["Start Month"]
-        .dropna()
-        .astype(int)
-        .value_counts()
-        .sort_index()
-        .reset_index()
-    )
-    monthly_counts.columns = ["Month", "Starts"]
-    monthly_counts["Month Label"] = monthly_counts["Month"].map(month_labels)
-
-    monthly_ends = (
-        df_activity["End Month"]
-        .dropna()
-        .astype(int)
-        .value_counts()
-        .sort_index()
-        .reset_index()
-    )
-    monthly_ends.columns = ["Month", "Transplants"]
-    monthly_ends["Month Label"] = monthly_ends["Month"].map(month_labels)
+    merged = monthly_activity(df)
 
-    merged = pd.merge(monthly_counts, monthly_ends, on=["Month", "Month Label"], how="outer").fillna(0)
-    merged = merged.sort_values("Month")
-
-    fig_activity = go.Figure()
-    fig_activity.add_trace(
-        go.Bar(name="Start Indoors / Direct Sow", x=merged["Month Label"], y=merged["Starts"],
-               marker_color="#4CAF50")
-    )
-    fig_activity.add_trace(
-        go.Bar(name="Transplant / Final Sow", x=merged["Month Label"], y=merged["Transplants"],
-               marker_color="#FF9800")
-    )
-    fig_activity.update_layout(
-        barmode="group",
-        height=300,
-        margin=dict(l=0, r=0, t=20, b=0),
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        xaxis_title="",
-        yaxis_title="Number of Plants",
-        legend_title_text="Activity",
-    )
-    st.plotly_chart(fig_activity, use_container_width=True)
+    st.plotly_chart(activity_chart(merged), use_container_width=True)
 
     # ── Days to harvest distribution ──
     st.markdown("#### ⏱️ Days to Harvest Distribution")
@@ -296,21 +442,7 @@ with tab_insights:
     try:
         days_numeric = pd.to_numeric(days_data, errors="coerce").dropna()
         if not days_numeric.empty:
-            fig_hist = px.histogram(
-                days_numeric,
-                nbins=15,
-                labels={"value": "Days to Harvest", "count": "# Plants"},
-                color_discrete_sequence=["#4CAF50"],
-            )
-            fig_hist.update_layout(
-                height=280,
-                margin=dict(l=0, r=0, t=20, b=0),
-                paper_bgcolor="rgba(0,0,0,0)",
-                plot_bgcolor="rgba(0,0,0,0)",
-                showlegend=False,
-            )
-            fig_hist.update_traces(marker_line_width=1, marker_line_color="white")
-            st.plotly_chart(fig_hist, use_container_width=True)
+            st.plotly_chart(days_histogram(days_numeric), use_container_width=True)
             col_d1, col_d2, col_d3 = st.columns(3)
             col_d1.metric("Fastest", f"{int(days_numeric.min())} days")
             col_d2.metric("Average", f"{int(days_numeric.mean())} days")
@@ -322,25 +454,9 @@ with tab_insights:
     st.markdown("---")
     st.markdown("#### 🏷️ Seed Brand Breakdown")
     if "Brand" in df.columns:
-        brand_df = df.groupby("Brand").agg(
-            Varieties=("Seed", "count"),
-            Plants=("Display Name", "nunique"),
-        ).reset_index().sort_values("Varieties", ascending=False)
-
-        fig_brand = px.treemap(
-            brand_df,
-            path=["Brand"],
-            values="Varieties",
-            color="Varieties",
-            color_continuous_scale="Greens",
-            hover_data=["Plants"],
-        )
-        fig_brand.update_layout(
-            height=350,
-            margin=dict(l=0, r=0, t=20, b=0),
-            coloraxis_showscale=False,
-        )
-        st.plotly_chart(fig_brand, use_container_width=True)
+        brand_df = brand_breakdown(df)
+
+        st.plotly_chart(brand_treemap(brand_df), use_container_width=True)
 
     # ── Frost tolerance ──
     st.markdown("---")
@@ -348,31 +464,18 @@ with tab_insights:
     if "Frost" in df.columns:
         frost_df = df["Frost"].value_counts().reset_index()
         frost_df.columns = ["Tolerance", "Count"]
-        frost_color_map = {
-            "Tolerant": "#42A5F5",
-            "Semi-tolerant": "#FFA726",
-            "Not tolerant": "#EF5350",
-        }
-        fig_frost = px.pie(
-            frost_df,
-            names="Tolerance",
-            values="Count",
-            color="Tolerance",
-            color_discrete_map=frost_color_map,
-            hole=0.4,
-        )
-        fig_frost.update_layout(
-            height=280,
-            margin=dict(l=0, r=0, t=10, b=0),
-            paper_bgcolor="rgba(0,0,0,0)",
-        )
-        st.plotly_chart(fig_frost, use_container_width=True)
+        st.plotly_chart(frost_pie(frost_df), use_container_width=True)
+
+
+if tab == "📊 Garden Insights":
+    insights_tab()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # TAB 3 — COMPANION EFFECTIVENESS
 # ═══════════════════════════════════════════════════════════════════════════════
-with tab_companion:
+@st.fragment
+def companion_tab():
     st.subheader("🤝 Companion Effectiveness")
     st.caption("Analyze how companion planting affects yields and growth.")
     rules = load_planting_rules()
@@ -387,15 +490,22 @@ with tab_companion:
         st.subheader("📊 Companion Impact on Yields")
         if not harvest_df.empty:
             # This would require more complex analysis - for now just show harvest data
-            st.dataframe(harvest_df, use_container_width=True, hide_index=True)
+            st.dataframe(
+                harvest_df, use_container_width=True, hide_index=True, column_config={"ID": None}
+            )
         else:
             st.info("Log harvests to analyze companion planting effectiveness.")
 
 
+if tab == "🤝 Companion Effectiveness":
+    companion_tab()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # TAB 4 — COST ANALYSIS
 # ═══════════════════════════════════════════════════════════════════════════════
-with tab_cost:
+@st.fragment
+def cost_tab():
     st.subheader("💰 Cost Analysis")
     st.caption("Estimate the value of growing your own produce vs. buying from a store.")
 
@@ -404,26 +514,11 @@ with tab_cost:
         "the value of your homegrown produce."
     )
 
-    # ── Market price database ──
-    default_prices = {
-        "Tomato": 3.50, "Basil": 2.00, "Carrot": 1.50, "Lettuce": 2.50,
-        "Radish": 1.80, "Cucumber": 1.80, "Beet": 2.00, "Spinach": 3.00,
-        "Corn": 0.80, "Zucchini": 1.50, "Eggplant": 2.50, "Bokchoy": 2.00,
-        "Snap Peas": 4.00, "Snow Peas": 4.00, "Ground Cherry": 6.00,
-        "Parsnip": 2.50, "Green Onion": 2.00, "Parsley": 2.50, "Sage": 3.00,
-        "Dill": 2.00, "Borage": 3.00, "Nasturtium": 2.50, "Shiso": 4.00,
-    }
-
     st.markdown("#### 🏷️ Market Prices ($/kg)")
     st.caption("Adjust these prices to match your local market.")
 
     # Build editable price table from plants in CSV
-    price_data = []
-    for plant in plant_list:
-        default_price = default_prices.get(plant, 2.00)
-        price_data.append({"Plant": plant, "Market Price ($/kg)": default_price})
-
-    price_df = pd.DataFrame(price_data)
+    price_df = market_price_table(plant_list)
     edited_prices = st.data_editor(
         price_df,
         use_container_width=True,
@@ -465,41 +560,17 @@ with tab_cost:
             "Showing example projection below."
         )
         # Build an example projection
-        example_data = []
-        for plant in plant_list[:8]:
-            price_row = edited_prices[edited_prices["Plant"] == plant]
-            if not price_row.empty:
-                market_price = float(price_row["Market Price ($/kg)"].iloc[0])
-                example_qty = 2.0  # 2kg example
-                value = example_qty * market_price
-                example_data.append({
-                    "Plant": plant,
-                    "Projected Harvest (kg)": example_qty,
-                    "Market Price ($/kg)": market_price,
-                    "Estimated Value ($)": round(value, 2),
-                })
-        if example_data:
-            ex_df = pd.DataFrame(example_data)
+        ex_df = example_projection(plant_list[:8], edited_prices, quantity_kg=2.0)
+        if not ex_df.empty:
             st.caption("*Example projection (2kg per plant). Log actual harvests for real calculations.*")
             st.dataframe(ex_df, use_container_width=True, hide_index=True,
                          column_config={"Estimated Value ($)": st.column_config.NumberColumn(format="$%.2f"),
                                         "Market Price ($/kg)": st.column_config.NumberColumn(format="$%.2f")})
     else:
         # Real calculation from harvest log
-        harvest_by_plant = (
-            harvest_df.groupby("Plant")["Quantity_kg"].sum().reset_index()
-        )
-        harvest_by_plant.columns = ["Plant", "Harvested (kg)"]
-
-        # Merge with prices
-        cost_analysis = pd.merge(harvest_by_plant, edited_prices, on="Plant", how="left")
-        cost_analysis["Market Price ($/kg)"] = cost_analysis["Market Price ($/kg)"].fillna(2.0)
-        cost_analysis["Value ($)"] = (
-            cost_analysis["Harvested (kg)"] * cost_analysis["Market Price ($/kg)"]
-        ).round(2)
-        total_value = cost_analysis["Value ($)"].sum()
-        roi = total_value - total_investment
-        roi_pct = (roi / total_investment * 100) if total_investment > 0 else 0
+        cost_df = cost_analysis(harvest_df, edited_prices)
+        total_value = cost_df["Value ($)"].sum()
+        roi, roi_pct = return_on_investment(total_value, total_investment)
 
         # Metrics
         rm1, rm2, rm3, rm4 = st.columns(4)
@@ -510,7 +581,7 @@ with tab_cost:
 
         st.markdown("---")
         st.dataframe(
-            cost_analysis,
+            cost_df,
             use_container_width=True,
             hide_index=True,
             column_config={
@@ -521,24 +592,8 @@ with tab_cost:
         )
 
         # Value breakdown chart
-        fig_value = go.Figure(
-            go.Bar(
-                x=cost_analysis["Plant"],
-                y=cost_analysis["Value ($)"],
-                marker_color=[get_plant_color(p, companion_data) for p in cost_analysis["Plant"]],
-                text=cost_analysis["Value ($)"].apply(lambda x: f"${x:.2f}"),
-                textposition="outside",
-            )
-        )
-        fig_value.update_layout(
-            xaxis_title="",
-            yaxis_title="Estimated Value ($)",
-            height=320,
-            margin=dict(l=0, r=0, t=20, b=0),
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-        )
-        st.plotly_chart(fig_value, use_container_width=True)
+        colors = [get_plant_color(p, companion_data) for p in cost_df["Plant"]]
+        st.plotly_chart(value_chart(cost_df, colors), use_container_width=True)
 
         # Break-even line
         if roi < 0:
@@ -550,4 +605,65 @@ with tab_cost:
             st.success(
                 f"🎉 You've exceeded your investment by **${roi:.2f}**! "
                 f"Great return on your garden this season."
-            )
\ No newline at end of file
+            )
+
+
+if tab == "💰 Cost Analysis":
+    cost_tab()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TAB 5 — SEASONS
+# ═══════════════════════════════════════════════════════════════════════════════
+@st.fragment
+def seasons_tab():
+    st.subheader("📆 Season Comparison")
+    st.caption("Yields, schedule drift and completion across growing seasons.")
+
+    all_years = season_years()
+    sel_years = tuple(sorted(st.multiselect("Seasons", all_years, default=all_years[-5:])))
+    if not sel_years:
+        st.info("Pick at least one season.")
+        return
+
+    plants = load_season_plants(sel_years)
+    harvests = load_season_harvests(sel_years)
+
+    st.markdown("**✅ Completion rates**")
+    rates = completion_rates(plants)
+    rates.index = rates.index.astype(str)
+    st.dataframe(
+        rates,
+        use_container_width=True,
+        column_config={
+            "Started %": st.column_config.ProgressColumn(
+                "Started", format="%.0f%%", min_value=0, max_value=100
+            ),
+            "Transplanted %": st.column_config.ProgressColumn(
+                "Transplanted", format="%.0f%%", min_value=0, max_value=100
+            ),
+        },
+    )
+
+    st.markdown("**🌾 Yield by season**")
+    yields = yield_by_year(harvests)
+    if yields.empty:
+        st.info("No harvests logged in these seasons.")
+    else:
+        st.plotly_chart(season_yield_chart(yields), use_container_width=True)
+
+    st.markdown("**⏱️ Timing drift**")
+    st.caption(
+        "Planned start day of year, its shift from the previous season, and actual start delay."
+    )
+    drift = timing_drift(plants)
+    drift = drift[drift.groupby("Plant")["Year"].transform("size") > 1]
+    if drift.empty:
+        st.info("No plant appears in more than one of these seasons.")
+    else:
+        drift["Year"] = drift["Year"].astype(str)
+        st.dataframe(drift, use_container_width=True, hide_index=True)
+
+
+if tab == "📆 Seasons":
+    seasons_tab()
@@ -0,0 +1,27 @@
+import warnings
+
+import pandas as pd
+
+from utils.harvest_journal import HarvestJournal
+
+
+def test_fractional_edit_of_whole_number_log(tmp_path):
+    path = tmp_path / "2025_harvest.csv"
+    journal = HarvestJournal(path)
+    first, second = journal.append([
+        {"Date": "2025-07-01", "Plant": "Tomato", "Variant": "Roma", "Quantity_kg": 2},
+        {"Date": "2025-07-02", "Plant": "Basil", "Variant": "Genovese", "Quantity_kg": 1},
+    ])
+    # Load once so the frame holds Quantity_kg as int64 before the edit
+    assert journal.read()["Quantity_kg"].dtype == "int64"
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", FutureWarning)
+        assert journal.update(first, {"Quantity_kg": 1.25})
+        df = journal.read()
+    assert df.set_index("ID").loc[first, "Quantity_kg"] == 1.25
+
+    reloaded = HarvestJournal(path).read().set_index("ID")
+    assert reloaded.loc[first, "Quantity_kg"] == 1.25
+    assert reloaded.loc[second, "Quantity_kg"] == 1
+    assert reloaded.loc[first, "Date"] == pd.Timestamp("2025-07-01")
@@ -0,0 +1,199 @@
+"""
+Square-foot cell grids for beds.
+
+A bed is stored as a width, a length and a ``plants`` list; the Garden
+Planner draws plant ``k`` in the ``k``-th ``core.bed_grid`` cell. ``BedCells``
+rasterizes that drawing onto the bed's square feet: ``cells`` is a
+rows × cols int16 array holding, per square foot, the position in ``plants``
+of the plant covering the square's centre (``EMPTY`` where none does). Edge
+squares of a bed whose sides are not whole feet are partial.
+
+Companion checks then compare each cell with its shifted neighbours (right,
+down and both diagonals) instead of every pair of plants in the bed, and a
+plant's capacity is counted from the squares it actually covers.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from utils.companions import NEUTRAL, RELATIONSHIP_NAMES, CompanionIndex
+from utils.core import bed_grid, get_spacing
+
+CELL_IN = 12
+EMPTY = -1
+# Bed types planted in rows (``row_spacing_in`` apart); the rest are planted
+# intensively at ``spacing_in`` both ways
+ROW_PLANTED = ("In-Ground",)
+
+# Forward steps (each neighbour pair is seen once) and whether they're diagonal
+_STEPS = [((0, 1), False), ((1, 0), False), ((1, 1), True), ((1, -1), True)]
+
+
+def _edges(size_ft: float) -> np.ndarray:
+    """Square boundaries along one side, in inches (the last square may be partial)."""
+    size_in = size_ft * CELL_IN
+    n = max(1, math.ceil(size_ft - 1e-9))
+    return np.minimum(np.arange(n + 1) * CELL_IN, size_in).astype(float)
+
+
+def _shift(cells: np.ndarray, dr: int, dc: int) -> tuple[np.ndarray, np.ndarray]:
+    """``cells`` and its neighbour ``dr`` rows down / ``dc`` cols right, overlapping part."""
+    rows, cols = cells.shape
+    a = cells[: rows - dr, max(0, -dc): cols - max(0, dc)]
+    b = cells[dr:, max(0, dc): cols - max(0, -dc)]
+    return a, b
+
+
+class BedCells:
+    """One bed's square-foot grid of plant positions."""
+
+    def __init__(self, bed: dict):
+        self.bed = bed
+        self.plants = list(bed.get("plants", []))
+        self.x_edges = _edges(bed["width"])
+        self.y_edges = _edges(bed["length"])
+        n = len(self.plants)
+        if not n:
+            shape = (len(self.y_edges) - 1, len(self.x_edges) - 1)
+            self.cells = np.full(shape, EMPTY, dtype=np.int16)
+            return
+        # Square centres (ft) → the bed_grid cell, i.e. the plant, drawn there
+        n_cols, _, cell_w, cell_h = bed_grid(bed["width"], bed["length"], n)
+        cx = (self.x_edges[:-1] + self.x_edges[1:]) / (2 * CELL_IN)
+        cy = (self.y_edges[:-1] + self.y_edges[1:]) / (2 * CELL_IN)
+        col = np.minimum((cx / cell_w).astype(int), n_cols - 1)
+        row = (cy / cell_h).astype(int)
+        k = row[:, None] * n_cols + col[None, :]
+        self.cells = np.where(k < n, k, EMPTY).astype(np.int16)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.cells.shape
+
+    def counts(self) -> np.ndarray:
+        """Squares covered by each listed plant."""
+        covered = self.cells[self.cells != EMPTY]
+        return np.bincount(covered, minlength=len(self.plants))
+
+    def square_areas(self) -> np.ndarray:
+        """Area of every square in sq ft (partial squares on the far edges)."""
+        return np.outer(np.diff(self.y_edges), np.diff(self.x_edges)) / CELL_IN ** 2
+
+    # ─── Companions ───────────────────────────────────────────────────────────
+    def adjacency(self, index: CompanionIndex) -> pd.DataFrame:
+        """
+        Good and bad companions that touch: Plant A, Plant B, Relationship,
+        plus how many square edges and corners they share.
+        """
+        n = len(self.plants)
+        codes = index.submatrix(self.plants)
+        edges = np.zeros(n * n, dtype=np.intp)
+        corners = np.zeros(n * n, dtype=np.intp)
+        for (dr, dc), diagonal in _STEPS:
+            a, b = _shift(self.cells, dr, dc)
+            touch = (a != EMPTY) & (b != EMPTY) & (a != b)
+            a, b = a[touch].astype(np.intp), b[touch].astype(np.intp)
+            key = np.minimum(a, b) * n + np.maximum(a, b)
+            np.add.at(corners if diagonal else edges, key, 1)
+        key = np.flatnonzero((edges + corners > 0) & (codes.ravel() != NEUTRAL))
+        a, b = np.divmod(key, n) if n else (key, key)
+        return pd.DataFrame({
+            "Plant A": [self.plants[i] for i in a],
+            "Plant B": [self.plants[j] for j in b],
+            "Relationship": [RELATIONSHIP_NAMES[int(c)] for c in codes.ravel()[key]],
+            "Edges": edges[key],
+            "Corners": corners[key],
+        })
+
+    # ─── Capacity ─────────────────────────────────────────────────────────────
+    def capacity(self, spacing_guide: dict) -> pd.DataFrame:
+        """
+        Per listed plant: squares and sq ft covered, the spacing used and how
+        many plants fit. Plants sit on a lattice from the corner of their
+        squares; one counts when its spacing × spacing footprint (spacing ×
+        row spacing in row-planted beds) lies entirely on the plant's squares.
+        """
+        rows = []
+        counts = self.counts()
+        areas = self.square_areas()
+        by_rows = self.bed.get("type") in ROW_PLANTED
+        default = get_spacing(None, {})
+        for k, plant in enumerate(self.plants):
+            info = spacing_guide.get(plant, default)
+            spacing = float(info.get("spacing_in", default["spacing_in"]))
+            row_spacing = (
+                float(info.get("row_spacing_in", default["row_spacing_in"])) if by_rows else spacing
+            )
+            mask = self.cells == k
+            rows.append({
+                "Plant": plant,
+                "Squares": int(counts[k]),
+                "Sq Ft": round(float(areas[mask].sum()), 2),
+                "Spacing (in)": spacing,
+                "Row Spacing (in)": row_spacing,
+                "Plants": self._fit(mask, spacing, row_spacing),
+            })
+        return pd.DataFrame(rows, columns=[
+            "Plant", "Squares", "Sq Ft", "Spacing (in)", "Row Spacing (in)", "Plants",
+        ])
+
+    def _fit(self, mask: np.ndarray, dx: float, dy: float) -> int:
+        """Lattice footprints of ``dx`` × ``dy`` inches lying wholly on ``mask``."""
+        if dx <= 0 or dy <= 0 or not mask.any():
+            return 0
+        rr, cc = np.nonzero(mask)
+        x0, x1 = self.x_edges[cc.min()], self.x_edges[cc.max() + 1]
+        y0, y1 = self.y_edges[rr.min()], self.y_edges[rr.max() + 1]
+        xs = x0 + dx * np.arange(int((x1 - x0) // dx + 1e-9))
+        ys = y0 + dy * np.arange(int((y1 - y0) // dy + 1e-9))
+        if not len(xs) or not len(ys):
+            return 0
+        # Squares each footprint spans, then one summed-area lookup per footprint
+        c0 = np.searchsorted(self.x_edges, xs + 1e-9, side="right") - 1
+        c1 = np.searchsorted(self.x_edges, xs + dx - 1e-9, side="left")
+        r0 = np.searchsorted(self.y_edges, ys + 1e-9, side="right") - 1
+        r1 = np.searchsorted(self.y_edges, ys + dy - 1e-9, side="left")
+        table = np.zeros((mask.shape[0] + 1, mask.shape[1] + 1), dtype=np.intp)
+        table[1:, 1:] = mask.cumsum(axis=0).cumsum(axis=1)
+        r0, r1 = r0[:, None], r1[:, None]
+        covered = table[r1, c1] - table[r0, c1] - table[r1, c0] + table[r0, c0]
+        return int((covered == (r1 - r0) * (c1 - c0)).sum())
+
+    # ─── Drawing ──────────────────────────────────────────────────────────────
+    def runs(self) -> pd.DataFrame:
+        """
+        Horizontal runs of one plant per row: Plant (position in ``plants``),
+        x0, x1, y0, y1 in feet — one rectangle each when drawing the grid.
+        """
+        cells = self.cells
+        rows, cols = cells.shape
+        starts = np.ones_like(cells, dtype=bool)
+        starts[:, 1:] = cells[:, 1:] != cells[:, :-1]
+        r, c = np.nonzero(starts)
+        # Each run ends where the next one in the same row starts
+        order = np.flatnonzero(starts.ravel())
+        end = np.append(order[1:], rows * cols)
+        end = np.where(end // cols == r, end % cols, cols)
+        keep = cells[r, c] != EMPTY
+        r, c, end = r[keep], c[keep], end[keep]
+        return pd.DataFrame({
+            "Plant": cells[r, c].astype(int),
+            "x0": self.x_edges[c] / CELL_IN,
+            "x1": self.x_edges[end] / CELL_IN,
+            "y0": self.y_edges[r] / CELL_IN,
+            "y1": self.y_edges[r + 1] / CELL_IN,
+        })
+
+    def label_points(self) -> dict[int, tuple[float, float]]:
+        """Per listed plant with squares: the centre (ft) of its square nearest its centroid."""
+        points = {}
+        cx = (self.x_edges[:-1] + self.x_edges[1:]) / (2 * CELL_IN)
+        cy = (self.y_edges[:-1] + self.y_edges[1:]) / (2 * CELL_IN)
+        for k in np.unique(self.cells[self.cells != EMPTY]):
+            rr, cc = np.nonzero(self.cells == k)
+            x, y = cx[cc], cy[rr]
+            i = np.argmin((x - x.mean()) ** 2 + (y - y.mean()) ** 2)
+            points[int(k)] = (float(x[i]), float(y[i]))
+        return points
@@ -0,0 +1,72 @@
+"""
+Precomputed plant ↔ bed membership.
+
+``BedIndex`` resolves every plant's bed once — seed families listed in
+garden_beds.json, overridden by a per-plant ``bed`` stored in progress — and
+keeps both directions as dicts, so "which bed is this plant in" and "which
+plants are in this bed" are O(1) instead of a scan over beds × seed rows.
+"""
+
+from types import MappingProxyType
+
+import pandas as pd
+
+UNASSIGNED = "Unassigned"
+
+
+class BedIndex:
+    """
+    Bed membership for the plants (Display Names) in a seeds frame.
+
+    When a seed family is listed in several beds the last listing wins, and a
+    progress ``bed`` override always beats the garden_beds.json assignment.
+    """
+
+    def __init__(self, beds: list, df: pd.DataFrame, progress: dict):
+        self.bed_names = [bed["name"] for bed in beds]
+        self.beds = MappingProxyType({bed["name"]: bed for bed in beds})
+
+        seed_bed: dict[str, str] = {}
+        seed_rank: dict[str, int] = {}
+        self._seed_first: dict[str, str] = {}
+        rank = 0
+        for bed in beds:
+            for seed in bed.get("plants", []):
+                self._seed_first.setdefault(seed, bed["name"])
+                seed_bed[seed] = bed["name"]
+                seed_rank[seed] = rank
+                rank += 1
+
+        # Display names whose seed family sits in a bed; if two families share
+        # a display name, the later listing wins (as the old nested loops did)
+        pairs = df[["Seed", "Display Name"]].drop_duplicates()
+        pairs = pairs.assign(_rank=pairs["Seed"].map(seed_rank)).dropna(subset=["_rank"])
+        pairs = pairs.sort_values("_rank", kind="stable")
+        pairs = pairs.drop_duplicates("Display Name", keep="last")
+        plant_bed = dict(zip(pairs["Display Name"], pairs["Seed"].map(seed_bed)))
+
+        for name, entry in progress.items():
+            if entry.get("bed"):
+                plant_bed[name] = entry["bed"]
+
+        members: dict[str, list[str]] = {}
+        for name, bed_name in plant_bed.items():
+            members.setdefault(bed_name, []).append(name)
+        self.plant_bed = MappingProxyType(plant_bed)
+        self._members = {bed_name: sorted(names) for bed_name, names in members.items()}
+
+    def bed_of(self, display_name: str, default: str = UNASSIGNED) -> str:
+        """Bed a plant is in, or ``default``."""
+        return self.plant_bed.get(display_name, default)
+
+    def bed_for_seed(self, seed_name: str) -> str:
+        """First bed listing a seed family in garden_beds.json ("" if none)."""
+        return self._seed_first.get(seed_name, "")
+
+    def members(self, bed_name: str) -> list[str]:
+        """Display names assigned to a bed, sorted."""
+        return list(self._members.get(bed_name, []))
+
+    def assign(self, display_names: pd.Series) -> pd.Series:
+        """Bed for each display name, ``Unassigned`` where there is none."""
+        return display_names.map(self.plant_bed).fillna(UNASSIGNED)
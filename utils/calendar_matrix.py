@@ -0,0 +1,88 @@
+"""
+Plant × period activity matrix for the Monthly Planting Calendar.
+
+A plant is "active" in a period when any of its seed rows has a
+``Start Date`` → ``End Date`` interval overlapping that period. All rows are
+compared against all period bounds in one broadcasted NumPy expression and
+then OR-reduced per plant, so cost is O(rows × periods) vectorized work with
+no Python-level loop over plants or months.
+"""
+
+import numpy as np
+import pandas as pd
+
+GRANULARITIES = ("month", "week", "day")
+
+
+def period_bounds(
+    year: int,
+    granularity: str = "month",
+    first_month: int = 1,
+    last_month: int = 10,
+) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    """
+    Return ``(starts, ends, labels)`` for the periods covering
+    ``first_month``..``last_month`` of ``year``.
+
+    ``ends`` are inclusive (midnight of the last day in the period). Weeks
+    start on Monday; the first and last week are clipped to the range.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of {GRANULARITIES}, got {granularity!r}")
+
+    range_start = pd.Timestamp(year=year, month=first_month, day=1)
+    range_end = pd.Timestamp(year=year, month=last_month, day=1) + pd.offsets.MonthEnd(0)
+
+    if granularity == "month":
+        starts = pd.date_range(range_start, range_end, freq="MS")
+        ends = starts + pd.offsets.MonthEnd(0)
+        labels = starts.strftime("%b").tolist()
+    elif granularity == "week":
+        first_monday = range_start - pd.Timedelta(days=range_start.weekday())
+        mondays = pd.date_range(first_monday, range_end, freq="W-MON")
+        starts = mondays.where(mondays >= range_start, range_start)
+        ends = (mondays + pd.Timedelta(days=6)).where(
+            mondays + pd.Timedelta(days=6) <= range_end, range_end
+        )
+        labels = starts.strftime("%b %d").tolist()
+    else:
+        starts = pd.date_range(range_start, range_end, freq="D")
+        ends = starts
+        labels = starts.strftime("%b %d").tolist()
+
+    return starts.to_numpy(), ends.to_numpy(), labels
+
+
+def activity_matrix(
+    df: pd.DataFrame,
+    year: int,
+    granularity: str = "month",
+    first_month: int = 1,
+    last_month: int = 10,
+) -> pd.DataFrame:
+    """
+    Boolean frame indexed by sorted ``Display Name`` with one column per
+    period; True where the plant has a scheduled interval in that period.
+    Rows without both dates never count as active.
+    """
+    starts, ends, labels = period_bounds(year, granularity, first_month, last_month)
+    codes, names = pd.factorize(df["Display Name"], sort=True)
+    active = np.zeros((len(names), len(labels)), dtype=bool)
+
+    valid = df["Start Date"].notna().to_numpy() & df["End Date"].notna().to_numpy()
+    if valid.any():
+        row_start = df["Start Date"].to_numpy()[valid]
+        row_end = df["End Date"].to_numpy()[valid]
+        row_codes = codes[valid]
+
+        overlap = (row_start[:, None] <= ends[None, :]) & (row_end[:, None] >= starts[None, :])
+
+        # OR-reduce the per-row overlaps into per-plant rows
+        order = np.argsort(row_codes, kind="stable")
+        sorted_codes = row_codes[order]
+        group_starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        active[sorted_codes[group_starts]] = np.logical_or.reduceat(
+            overlap[order], group_starts, axis=0
+        )
+
+    return pd.DataFrame(active, index=pd.Index(names, name="Display Name"), columns=labels)
@@ -0,0 +1,104 @@
+"""
+Precomputed companion-planting relationships.
+
+``CompanionIndex`` turns the ``companions`` section of companion_plants.json
+into a symmetric int8 matrix (1 = good, -1 = bad, 0 = neutral) plus packed
+per-plant good/bad bitsets, so pair lookups are O(1) and an N×N heatmap is a
+single fancy-index slice.
+"""
+
+import numpy as np
+
+GOOD = 1
+NEUTRAL = 0
+BAD = -1
+
+RELATIONSHIP_NAMES = {GOOD: "good", NEUTRAL: "neutral", BAD: "bad"}
+
+
+class CompanionIndex:
+    """
+    Symmetric relationship matrix over every plant named in the companion
+    database (as a key or inside any good/bad list).
+
+    A relationship listed by either plant applies both ways. If the two
+    plants disagree, "bad" wins. Plants unknown to the database map to an
+    extra all-neutral row/column, so lookups never raise.
+    """
+
+    def __init__(self, companion_data: dict):
+        companions = companion_data.get("companions", {})
+        names = set(companions)
+        for info in companions.values():
+            names.update(info.get("good", []))
+            names.update(info.get("bad", []))
+        self.names = sorted(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        n = len(self.names)
+        self._unknown = n
+
+        rows = {GOOD: ([], []), BAD: ([], [])}
+        for plant, info in companions.items():
+            a = self.index[plant]
+            for rel, key in ((GOOD, "good"), (BAD, "bad")):
+                targets = [self.index[p] for p in info.get(key, [])]
+                rows[rel][0].extend([a] * len(targets))
+                rows[rel][1].extend(targets)
+
+        matrix = np.zeros((n + 1, n + 1), dtype=np.int8)
+        for rel in (GOOD, BAD):  # BAD assigned last so it wins conflicts
+            a, b = (np.asarray(x, dtype=np.intp) for x in rows[rel])
+            matrix[a, b] = rel
+            matrix[b, a] = rel
+        np.fill_diagonal(matrix, NEUTRAL)
+        matrix.flags.writeable = False
+        self.matrix = matrix
+
+        self.good_bits = np.packbits(matrix[:n, :n] == GOOD, axis=1)
+        self.bad_bits = np.packbits(matrix[:n, :n] == BAD, axis=1)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def positions(self, plants) -> np.ndarray:
+        """Matrix row for each plant name (unknown names share a neutral row)."""
+        return np.fromiter(
+            (self.index.get(p, self._unknown) for p in plants), dtype=np.intp
+        )
+
+    def relationship(self, plant_a: str, plant_b: str) -> str:
+        """Return 'good', 'bad', or 'neutral' for two plants."""
+        a = self.index.get(plant_a, self._unknown)
+        b = self.index.get(plant_b, self._unknown)
+        return RELATIONSHIP_NAMES[int(self.matrix[a, b])]
+
+    def submatrix(self, plants) -> np.ndarray:
+        """Relationship codes among ``plants`` as a len(plants)² int8 array."""
+        pos = self.positions(plants)
+        return self.matrix[np.ix_(pos, pos)]
+
+    def pairs(self, plants) -> list[tuple[str, str, str]]:
+        """Non-neutral ``(plant_a, plant_b, relationship)`` pairs, each once."""
+        plants = list(plants)
+        sub = self.submatrix(plants)
+        ii, jj = np.triu_indices(len(plants), k=1)
+        rel = sub[ii, jj]
+        keep = np.flatnonzero(rel != NEUTRAL)
+        return [
+            (plants[ii[k]], plants[jj[k]], RELATIONSHIP_NAMES[int(rel[k])]) for k in keep
+        ]
+
+    def _members(self, bits: np.ndarray, plant: str) -> list[str]:
+        i = self.index.get(plant)
+        if i is None:
+            return []
+        mask = np.unpackbits(bits[i], count=len(self.names)).astype(bool)
+        return [self.names[j] for j in np.flatnonzero(mask)]
+
+    def good_with(self, plant: str) -> list[str]:
+        """All plants with a good relationship to ``plant`` (either direction)."""
+        return self._members(self.good_bits, plant)
+
+    def bad_with(self, plant: str) -> list[str]:
+        """All plants with a bad relationship to ``plant`` (either direction)."""
+        return self._members(self.bad_bits, plant)
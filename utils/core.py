@@ -0,0 +1,539 @@
+"""
+Headless garden computations shared by the Streamlit pages.
+
+Everything here is plain Python/pandas over already-loaded data — no
+Streamlit import and no file I/O — so batch jobs, benchmarks and worker
+processes can use it without starting the UI. Data loading and persistence
+live in ``utils/helpers.py`` (Streamlit-cached) and the storage modules; the
+task list, calendar matrix and companion matrix have their own modules
+(``tasks``, ``calendar_matrix``, ``companions``).
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from utils.beds import UNASSIGNED
+from utils.schedule_engine import DEFAULT_LAST_FROST, rule_offsets
+from utils.tasks import PROGRESS_DEFAULTS, overall_status, progress_frame
+
+# ─── Progress status ──────────────────────────────────────────────────────────
+STATUS_OPTIONS = ["not_started", "in_progress", "done", "skipped"]
+STATUS_LABELS = {
+    "not_started": "⬜ Not Started",
+    "in_progress": "🔄 In Progress",
+    "done": "✅ Done",
+    "skipped": "⏭️ Skipped",
+}
+STATUS_COLORS = {
+    "not_started": "#e0e0e0",
+    "in_progress": "#fff9c4",
+    "done": "#c8e6c9",
+    "skipped": "#f3e5f5",
+}
+
+
+def get_plant_status(display_name: str, progress: dict) -> dict:
+    """Return progress entry for a plant, with defaults."""
+    return {**PROGRESS_DEFAULTS, **progress.get(display_name, {})}
+
+
+# ─── Progress editor ──────────────────────────────────────────────────────────
+# Editable grid column → progress field
+PROGRESS_EDITOR_FIELDS = {
+    "Start Status": "start_status",
+    "Transplant Status": "transplant_status",
+    "Bed": "bed",
+    "Notes": "notes",
+}
+STATUS_KEYS = {label: key for key, label in STATUS_LABELS.items()}
+
+
+def progress_editor_frame(df: pd.DataFrame, progress: dict, bed_map: dict) -> pd.DataFrame:
+    """
+    One row per plant for the progress grid, ordered by bed then plant.
+    Statuses are shown as their labels; ``Status`` is the read-only overall
+    state (done / in progress / the start status).
+    """
+    rows = df.drop_duplicates("Display Name")
+    names = rows["Display Name"]
+    prog = progress_frame(progress, names)
+    ss, ts = prog["start_status"], prog["transplant_status"]
+    overall = np.select(
+        [ts.eq("done"), ss.isin(["in_progress", "done"])], ["done", "in_progress"], default=ss
+    )
+    not_started = STATUS_LABELS["not_started"]
+    frame = pd.DataFrame({
+        "Plant": names.to_numpy(),
+        "Bed": names.map(bed_map).fillna(UNASSIGNED).to_numpy(),
+        "Method": rows["Planting Method"].astype(object).to_numpy(),
+        "Sow": rows["Start Date"].to_numpy(),
+        "Transplant": rows["End Date"].to_numpy(),
+        "Status": pd.Series(overall).map(STATUS_LABELS).fillna(not_started).to_numpy(),
+        "Start Status": ss.map(STATUS_LABELS).fillna(not_started).to_numpy(),
+        "Transplant Status": ts.map(STATUS_LABELS).fillna(not_started).to_numpy(),
+        "Notes": prog["notes"].to_numpy(),
+    })
+    return frame.sort_values(["Bed", "Plant"], kind="stable").reset_index(drop=True)
+
+
+def progress_edits(frame: pd.DataFrame, edited_rows: dict) -> dict:
+    """
+    Turn a data editor's ``edited_rows`` (``{row_position: {column: value}}``)
+    on ``frame`` into ``{display_name: {field: value}}`` for bulk_set(),
+    skipping cells that were edited back to their original value.
+    """
+    updates: dict[str, dict] = {}
+    for pos, cells in edited_rows.items():
+        row = frame.iloc[int(pos)]
+        for col, value in cells.items():
+            field = PROGRESS_EDITOR_FIELDS.get(col)
+            if field == "notes" and value is None:
+                value = ""  # cleared text cell
+            if field is None or value == row[col]:
+                continue
+            if field.endswith("_status"):
+                value = STATUS_KEYS.get(value, "not_started")
+            elif field == "bed":
+                value = "" if value in (None, UNASSIGNED) else value
+            updates.setdefault(row["Plant"], {})[field] = value
+    return updates
+
+
+# ─── Beds ─────────────────────────────────────────────────────────────────────
+def bed_plant_frame(df: pd.DataFrame, progress: dict, plant_bed) -> pd.DataFrame:
+    """
+    Every bed-assigned plant with its dates, method and progress, sorted by
+    bed then plant. ``bucket`` is the dashboard category: done, skipped,
+    in_progress or not_started; ``in_seeds`` is False for plants only known
+    from a progress override.
+    """
+    names = pd.Index(list(plant_bed), name="Display Name")
+    rows = df.drop_duplicates("Display Name").set_index("Display Name").reindex(names)
+    prog = progress_frame(progress, names)
+    ss, ts = prog["start_status"], prog["transplant_status"]
+    frame = pd.DataFrame({
+        "Bed": [plant_bed[n] for n in names],
+        "Plant": names.to_numpy(),
+        "Method": rows["Planting Method"].astype(object).to_numpy(),
+        "Start Date": rows["Start Date"].to_numpy(),
+        "End Date": rows["End Date"].to_numpy(),
+        "start_status": ss.to_numpy(),
+        "transplant_status": ts.to_numpy(),
+        "notes": prog["notes"].to_numpy(),
+        "bucket": np.select(
+            [ts.eq("done"), ts.eq("skipped") | ss.eq("skipped"), ss.isin(["in_progress", "done"])],
+            ["done", "skipped", "in_progress"],
+            default="not_started",
+        ),
+        "in_seeds": names.isin(df["Display Name"]),
+    })
+    return frame.sort_values(["Bed", "Plant"], kind="stable").reset_index(drop=True)
+
+
+def bed_grid(width: float, length: float, n: int) -> tuple[int, int, float, float]:
+    """Columns, rows and cell width/length for laying ``n`` plants out in a bed."""
+    cols = max(1, math.ceil(math.sqrt(n * width / length)))
+    rows = math.ceil(n / cols)
+    return cols, rows, width / cols, length / rows
+
+
+# ─── Spacing & yield ──────────────────────────────────────────────────────────
+# Used for plants missing from the companion JSON's spacing guide
+DEFAULT_SPACING_IN = 12
+DEFAULT_ROW_SPACING_IN = 18
+
+
+def plants_per_sqft(spacing_in: float) -> float:
+    """Square-foot gardening: plants per sq ft based on plant spacing (inches)."""
+    if spacing_in <= 0:
+        return 0
+    return (12 / spacing_in) ** 2
+
+
+def plants_in_bed(bed_width_ft: float, bed_length_ft: float, spacing_in: float) -> int:
+    """Total plant count that fits in a rectangular bed."""
+    return int(math.floor(plants_per_sqft(spacing_in) * bed_width_ft * bed_length_ft))
+
+
+def get_plant_color(plant_name: str, companion_data: dict) -> str:
+    """Return a hex color for a plant, with fallback."""
+    colors = companion_data.get("plant_colors", {})
+    return colors.get(plant_name, "#78909c")
+
+
+def get_spacing(plant_name: str, companion_data: dict) -> dict:
+    """Return spacing guide entry for a plant."""
+    guide = companion_data.get("spacing_guide", {})
+    return guide.get(plant_name, {
+        "spacing_in": DEFAULT_SPACING_IN, "row_spacing_in": DEFAULT_ROW_SPACING_IN, "depth_in": 0.5,
+    })
+
+
+# ─── Planting dates ───────────────────────────────────────────────────────────
+def calculate_planting_dates(plant_name: str, year: int, rules: dict,
+                             last_frost: pd.Timestamp | None = None) -> dict:
+    """
+    Start/end dates for one plant from its planting rule. ``last_frost``
+    defaults to the Toronto-area May 9; ``ScheduleEngine`` does the same for
+    every plant, site and year at once.
+    """
+    plant_rules = rules.get("planting_rules", {}).get(plant_name, {})
+    if not plant_rules:
+        return {"start_date": None, "end_date": None}
+
+    if last_frost is None:
+        month, day = DEFAULT_LAST_FROST
+        last_frost = pd.Timestamp(year=year, month=month, day=day)
+    offsets = rule_offsets({plant_name: plant_rules}).iloc[0]
+
+    def shift(days):
+        return None if pd.isna(days) else last_frost + pd.Timedelta(days=int(days))
+
+    return {"start_date": shift(offsets["start"]), "end_date": shift(offsets["end"])}
+
+
+def _per_square(df: pd.DataFrame) -> pd.Series:
+    """Each seed family's first ``Per Square`` value from the CSV."""
+    if "Per Square" not in df.columns:
+        return pd.Series(dtype=object)
+    return df.groupby("Seed", observed=True)["Per Square"].first().dropna()
+
+
+def _spacing_arrays(
+    plants: list, companion_data: dict
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Spacing, row spacing and depth (inches) per plant, with ``get_spacing`` defaults."""
+    default = get_spacing(None, {})
+    guide = companion_data.get("spacing_guide", {})
+    info = [guide.get(p, default) for p in plants]
+    return tuple(
+        np.array([i.get(key, default[key]) for i in info])
+        for key in ("spacing_in", "row_spacing_in", "depth_in")
+    )
+
+
+def spacing_reference(df: pd.DataFrame, companion_data: dict) -> pd.DataFrame:
+    """Spacing guide table with each plant's first ``Per Square`` value from the CSV."""
+    plants = list(companion_data.get("spacing_guide", {}))
+    spacing, row_spacing, depth = _spacing_arrays(plants, companion_data)
+    with np.errstate(divide="ignore"):
+        per_sqft = np.where(spacing > 0, (12 / spacing) ** 2, 0.0)
+    return pd.DataFrame({
+        "Plant": plants,
+        "Spacing (in)": spacing,
+        "Row Spacing (in)": row_spacing,
+        "Depth (in)": depth,
+        "Per Sq Ft (SFG)": per_sqft.round(1),
+        "Per Sq (CSV)": _per_square(df).reindex(plants).fillna("").to_numpy(object),
+    }).sort_values("Plant")
+
+
+CAPACITY_COLUMNS = [
+    "Plant", "Bed", "Width (ft)", "Length (ft)", "Sq Ft",
+    "Spacing (in)", "Row Spacing (in)", "SFG", "Row-based", "Per Square (CSV)",
+]
+
+
+def capacity_grid(df: pd.DataFrame, companion_data: dict, beds: list,
+                  plants: list | None = None) -> pd.DataFrame:
+    """
+    How many of each plant fit in each bed, one row per plant × bed.
+
+    ``beds`` only needs ``name``, ``width`` and ``length`` (feet), so ad-hoc
+    areas can be mixed in with the saved beds; ``plants`` defaults to every
+    seed family in ``df``. Counts per method:
+
+    - ``SFG``: square-foot gardening density, as ``plants_in_bed``;
+    - ``Row-based``: rows ``row_spacing_in`` apart with plants ``spacing_in``
+      apart along them, rows along whichever side fits more;
+    - ``Per Square (CSV)``: the catalogue's ``Per Square`` × area (NaN when
+      the CSV has no value).
+
+    All plants × beds are computed in one broadcast.
+    """
+    if plants is None:
+        plants = sorted(df["Seed"].dropna().unique())
+    plants = list(plants)
+    spacing, row_spacing, _ = (a.astype(float) for a in _spacing_arrays(plants, companion_data))
+    per_square = pd.to_numeric(_per_square(df).reindex(plants), errors="coerce").to_numpy(float)
+    width = np.array([bed["width"] for bed in beds], dtype=float)
+    length = np.array([bed["length"] for bed in beds], dtype=float)
+    area = width * length
+
+    # plants on axis 0, beds on axis 1
+    s, r = spacing[:, None], row_spacing[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sfg = np.floor(np.where(s > 0, (12 / s) ** 2, 0.0) * area)
+        w_in, l_in = 12 * width, 12 * length
+        ok = (s > 0) & (r > 0)
+        along_length = np.floor(w_in / r + 1e-9) * np.floor(l_in / s + 1e-9)
+        along_width = np.floor(l_in / r + 1e-9) * np.floor(w_in / s + 1e-9)
+        rows = np.where(ok, np.maximum(along_length, along_width), 0.0)
+    csv = np.floor(per_square[:, None] * area + 1e-9)
+
+    n_plants, n_beds = len(plants), len(beds)
+    return pd.DataFrame({
+        "Plant": np.repeat(np.array(plants, dtype=object), n_beds),
+        "Bed": np.tile(np.array([bed["name"] for bed in beds], dtype=object), n_plants),
+        "Width (ft)": np.tile(width, n_plants),
+        "Length (ft)": np.tile(length, n_plants),
+        "Sq Ft": np.tile(area, n_plants),
+        "Spacing (in)": np.repeat(spacing, n_beds),
+        "Row Spacing (in)": np.repeat(row_spacing, n_beds),
+        "SFG": sfg.ravel().astype(np.int64),
+        "Row-based": rows.ravel().astype(np.int64),
+        "Per Square (CSV)": pd.array(csv.ravel(), dtype="Int64"),
+    }, columns=CAPACITY_COLUMNS)
+
+
+def companion_stats(plants, companion_data: dict) -> pd.DataFrame:
+    """Good/poor companion counts per plant, most sociable first."""
+    companions = companion_data.get("companions", {})
+    stats = []
+    for plant in plants:
+        info = companions.get(plant, {})
+        stats.append({
+            "Plant": plant,
+            "In Companion DB": "✅" if plant in companions else "—",
+            "Good Companions": len(info.get("good", [])),
+            "Poor Companions": len(info.get("bad", [])),
+            "Notes": info.get("notes", ""),
+        })
+    return pd.DataFrame(stats).sort_values("Good Companions", ascending=False)
+
+
+# ─── Schedule ─────────────────────────────────────────────────────────────────
+def events_in_window(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    """Rows whose growing span overlaps ``[start, end]`` or that start inside it."""
+    mask = (
+        (df["Start Date"] <= end) & (df["End Date"] >= start)
+        | (df["Start Date"] >= start) & (df["Start Date"] <= end)
+    )
+    return df[mask].copy()
+
+
+def schedule_plot_frame(df: pd.DataFrame, progress: dict, group_by: str) -> pd.DataFrame:
+    """
+    Timeline rows for the schedule page — per plant, per seed family or per
+    bed — with start/transplant/overall progress status attached.
+    """
+    if group_by == "Seed Family":
+        df_plot = (
+            df.groupby(["Seed", "Planting Method"], observed=True)
+            .agg({"Start Date": "min", "End Date": "max", "Bed": "first"})
+            .reset_index()
+            .rename(columns={"Seed": "Display Name"})
+        )
+    elif group_by == "Bed":
+        df_plot = (
+            df.groupby(["Bed", "Planting Method"], observed=True)
+            .agg({"Start Date": "min", "End Date": "max"})
+            .reset_index()
+            .rename(columns={"Bed": "Display Name"})
+        )
+    else:
+        df_plot = df.copy()
+
+    plot_ps = progress_frame(progress, df_plot["Display Name"])
+    df_plot["start_status"] = plot_ps["start_status"].to_numpy()
+    df_plot["transplant_status"] = plot_ps["transplant_status"].to_numpy()
+    df_plot["Overall Status"] = overall_status(
+        df_plot["start_status"], df_plot["transplant_status"]
+    )
+    df_plot["Status Label"] = df_plot["Overall Status"].map(STATUS_LABELS)
+    return df_plot
+
+
+def phase_segments(df_plot: pd.DataFrame, grow_days: int = 14) -> pd.DataFrame:
+    """
+    Split each timeline row into a sow/indoors segment (Start → End Date,
+    by start status) and a transplant/outdoor segment (End Date + grow_days,
+    by transplant status), interleaved per plant.
+    """
+    bed = df_plot["Bed"] if "Bed" in df_plot.columns else "Unassigned"
+    base = pd.DataFrame({
+        "Display Name": df_plot["Display Name"],
+        "Planting Method": df_plot.get("Planting Method", ""),
+        "Bed": bed,
+    })
+    sow = base.assign(
+        Phase="🌱 Sow / Indoors",
+        **{"Start Date": df_plot["Start Date"], "End Date": df_plot["End Date"]},
+        Status=df_plot["start_status"].map(STATUS_LABELS),
+        _order=0,
+    )[df_plot["Start Date"].notna() & df_plot["End Date"].notna()]
+    grow = base.assign(
+        Phase="🌿 Transplant / Outdoor",
+        **{
+            "Start Date": df_plot["End Date"],
+            "End Date": df_plot["End Date"] + pd.Timedelta(days=grow_days),
+        },
+        Status=df_plot["transplant_status"].map(STATUS_LABELS),
+        _order=1,
+    )[df_plot["End Date"].notna()]
+    columns = [
+        "Display Name", "Phase", "Start Date", "End Date", "Status", "Planting Method", "Bed",
+    ]
+    segments = pd.concat([sow, grow]).reset_index(names="_row")
+    segments = segments.sort_values(["_row", "_order"], kind="stable")
+    return segments[columns].reset_index(drop=True)
+
+
+# Above this many rows the schedule timeline switches to WebGL line segments
+TIMELINE_WEBGL_ROWS = 300
+
+
+def gantt_segments(df_tl: pd.DataFrame, color_col: str, order: list) -> list[dict]:
+    """
+    Timeline rows as line segments, one entry per ``color_col`` value.
+
+    Each entry holds ``x`` (start/end in epoch milliseconds), ``y`` (the row's
+    position in ``order``) and ``text`` (its Display Name), three points per
+    row with a NaN gap after each segment, ready for one ``Scattergl`` trace
+    per colour instead of one bar shape per row.
+    """
+    rows = df_tl[df_tl["Start Date"].notna() & df_tl["End Date"].notna()]
+    position = pd.Categorical(rows["Display Name"], categories=order).codes.astype(float)
+    start = rows["Start Date"].to_numpy("datetime64[ms]").astype("int64").astype(float)
+    end = rows["End Date"].to_numpy("datetime64[ms]").astype("int64").astype(float)
+    names = rows["Display Name"].to_numpy(object)
+    colors = rows[color_col].astype(object).fillna("").to_numpy()
+
+    segments = []
+    for value in pd.unique(colors):
+        mask = colors == value
+        n = int(mask.sum())
+        x = np.full(3 * n, np.nan)
+        y = np.full(3 * n, np.nan)
+        text = np.empty(3 * n, dtype=object)
+        x[0::3], x[1::3] = start[mask], end[mask]
+        y[0::3] = y[1::3] = position[mask]
+        text[0::3] = text[1::3] = names[mask]
+        segments.append({"name": value, "x": x, "y": y, "text": text})
+    return segments
+
+
+def timeline_density(df_plot: pd.DataFrame, band_col: str, days: int = 7) -> pd.DataFrame:
+    """
+    Rows growing in each ``days``-long window, per ``band_col`` value.
+
+    Bands × window-start frame, built from a difference array so the cost is
+    one pass over the rows plus one cumulative sum, not rows × windows.
+    """
+    rows = df_plot[df_plot["Start Date"].notna() & df_plot["End Date"].notna()]
+    if rows.empty:
+        return pd.DataFrame()
+    origin = rows["Start Date"].min().normalize()
+    first = ((rows["Start Date"] - origin).dt.days // days).to_numpy()
+    last = np.maximum(((rows["End Date"] - origin).dt.days // days).to_numpy(), first)
+    codes, bands = pd.factorize(rows[band_col].astype(object).fillna(UNASSIGNED), sort=True)
+
+    n_windows = int(last.max()) + 1
+    diff = np.zeros((len(bands), n_windows + 1), dtype=np.int64)
+    np.add.at(diff, (codes, first), 1)
+    np.add.at(diff, (codes, last + 1), -1)
+    return pd.DataFrame(
+        diff.cumsum(axis=1)[:, :n_windows],
+        index=pd.Index(bands, name=band_col),
+        columns=pd.date_range(origin, periods=n_windows, freq=f"{days}D"),
+    )
+
+
+# ─── Analytics ────────────────────────────────────────────────────────────────
+MONTH_LABELS = {1: "Jan", 2: "Feb", 3: "Mar", 4: "Apr", 5: "May", 6: "Jun",
+                7: "Jul", 8: "Aug", 9: "Sep", 10: "Oct", 11: "Nov", 12: "Dec"}
+
+# Default market prices ($/kg) for the cost analysis
+DEFAULT_MARKET_PRICES = {
+    "Tomato": 3.50, "Basil": 2.00, "Carrot": 1.50, "Lettuce": 2.50,
+    "Radish": 1.80, "Cucumber": 1.80, "Beet": 2.00, "Spinach": 3.00,
+    "Corn": 0.80, "Zucchini": 1.50, "Eggplant": 2.50, "Bokchoy": 2.00,
+    "Snap Peas": 4.00, "Snow Peas": 4.00, "Ground Cherry": 6.00,
+    "Parsnip": 2.50, "Green Onion": 2.00, "Parsley": 2.50, "Sage": 3.00,
+    "Dill": 2.00, "Borage": 3.00, "Nasturtium": 2.50, "Shiso": 4.00,
+}
+FALLBACK_MARKET_PRICE = 2.00
+
+
+def harvest_totals(harvest_df: pd.DataFrame) -> pd.DataFrame:
+    """Total kg per plant, largest first (columns Plant, Total (kg))."""
+    totals = (
+        harvest_df.groupby("Plant")["Quantity_kg"]
+        .sum()
+        .sort_values(ascending=False)
+        .reset_index()
+    )
+    totals.columns = ["Plant", "Total (kg)"]
+    return totals
+
+
+def harvest_daily(harvest_df: pd.DataFrame) -> pd.DataFrame:
+    """Kg per (Date, Plant)."""
+    return harvest_df.groupby(["Date", "Plant"])["Quantity_kg"].sum().reset_index()
+
+
+def _month_counts(dates: pd.Series, name: str) -> pd.DataFrame:
+    counts = dates.dt.month.dropna().astype(int).value_counts().sort_index().reset_index()
+    counts.columns = ["Month", name]
+    counts["Month Label"] = counts["Month"].map(MONTH_LABELS)
+    return counts
+
+
+def monthly_activity(df: pd.DataFrame) -> pd.DataFrame:
+    """Number of plants started and transplanted in each calendar month."""
+    merged = pd.merge(
+        _month_counts(df["Start Date"], "Starts"),
+        _month_counts(df["End Date"], "Transplants"),
+        on=["Month", "Month Label"],
+        how="outer",
+    ).fillna(0)
+    return merged.sort_values("Month")
+
+
+def brand_breakdown(df: pd.DataFrame) -> pd.DataFrame:
+    """Variety count and distinct plants per seed brand."""
+    return df.groupby("Brand", observed=True).agg(
+        Varieties=("Seed", "count"),
+        Plants=("Display Name", "nunique"),
+    ).reset_index().sort_values("Varieties", ascending=False)
+
+
+def market_price_table(plants, prices: dict | None = None) -> pd.DataFrame:
+    """Editable ``Plant`` / ``Market Price ($/kg)`` table seeded with defaults."""
+    prices = DEFAULT_MARKET_PRICES if prices is None else prices
+    return pd.DataFrame({
+        "Plant": list(plants),
+        "Market Price ($/kg)": [prices.get(p, FALLBACK_MARKET_PRICE) for p in plants],
+    })
+
+
+def example_projection(plants, prices: pd.DataFrame, quantity_kg: float = 2.0) -> pd.DataFrame:
+    """What ``quantity_kg`` of each plant would be worth at ``prices``."""
+    price = prices.drop_duplicates("Plant").set_index("Plant")["Market Price ($/kg)"]
+    known = [p for p in plants if p in price.index]
+    market = price.reindex(known).astype(float).to_numpy()
+    return pd.DataFrame({
+        "Plant": known,
+        "Projected Harvest (kg)": quantity_kg,
+        "Market Price ($/kg)": market,
+        "Estimated Value ($)": (quantity_kg * market).round(2),
+    })
+
+
+def cost_analysis(harvest_df: pd.DataFrame, prices: pd.DataFrame) -> pd.DataFrame:
+    """Harvested kg and market value per plant (unpriced plants use the fallback)."""
+    by_plant = harvest_df.groupby("Plant")["Quantity_kg"].sum().reset_index()
+    by_plant.columns = ["Plant", "Harvested (kg)"]
+    cost = pd.merge(by_plant, prices, on="Plant", how="left")
+    cost["Market Price ($/kg)"] = cost["Market Price ($/kg)"].fillna(FALLBACK_MARKET_PRICE)
+    cost["Value ($)"] = (cost["Harvested (kg)"] * cost["Market Price ($/kg)"]).round(2)
+    return cost
+
+
+def return_on_investment(total_value: float, total_investment: float) -> tuple[float, float]:
+    """Net return in dollars and as a percentage of the investment."""
+    roi = total_value - total_investment
+    roi_pct = (roi / total_investment * 100) if total_investment > 0 else 0
+    return roi, roi_pct
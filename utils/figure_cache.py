@@ -0,0 +1,106 @@
+"""
+Process-wide cache of built Plotly figures.
+
+``figure_cached`` wraps a function that builds a figure. Each call is keyed by
+the builder plus a fingerprint of its arguments (frames are hashed by content,
+so an equal frame rebuilt on another rerun or in another session hits the same
+entry). The figure is stored as its serialized JSON in an LRU bounded by total
+bytes, and a hit re-creates a ``go.Figure`` from that JSON without Plotly's
+property validation — a few milliseconds instead of re-running ``px``/``go``
+construction, which dominates page render time for the larger charts.
+
+Builders must take everything they read as arguments; anything captured from
+the enclosing scope is not part of the key.
+"""
+
+import functools
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from utils.fingerprint import fingerprint
+
+MAX_BYTES = 64 * 1024 * 1024
+
+
+# ─── Cache ────────────────────────────────────────────────────────────────────
+class FigureCache:
+    """LRU of serialized figure JSON, evicting once over ``max_bytes``."""
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._specs: OrderedDict[tuple, str] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def get_or_build(self, key: tuple, build: Callable[[], go.Figure]) -> str:
+        """Cached JSON for ``key``, building and serializing it on a miss."""
+        with self._lock:
+            spec = self._specs.get(key)
+            if spec is not None:
+                self._specs.move_to_end(key)
+                self.hits += 1
+                return spec
+            self.misses += 1
+        # Built outside the lock; two sessions racing on one key both build
+        # and the second store simply replaces the first
+        spec = pio.to_json(build(), validate=False)
+        with self._lock:
+            old = self._specs.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            if len(spec) <= self.max_bytes:
+                self._specs[key] = spec
+                self._bytes += len(spec)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._specs.popitem(last=False)
+                self._bytes -= len(evicted)
+        return spec
+
+    def clear(self):
+        with self._lock:
+            self._specs.clear()
+            self._bytes = 0
+
+
+FIGURES = FigureCache()
+
+
+def figure_from_json(spec: str) -> go.Figure:
+    """Figure from JSON written by ``pio.to_json``, skipping re-validation."""
+    return go.Figure(json.loads(spec), _validate=False)
+
+
+def figure_cached(func: Callable[..., go.Figure]):
+    """
+    Serve a figure builder's output from :data:`FIGURES`.
+
+    The wrapper returns a fresh ``go.Figure`` (safe to tweak before display);
+    ``.spec(*args)`` returns the cached JSON itself.
+    """
+    # Pages all run as __main__, so the source file tells same-named builders apart
+    ident = (func.__code__.co_filename, func.__qualname__)
+
+    def spec(*args, **kwargs) -> str:
+        key = ident + (fingerprint(args, kwargs),)
+        return FIGURES.get_or_build(key, lambda: func(*args, **kwargs))
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return figure_from_json(spec(*args, **kwargs))
+
+    wrapper.spec = spec
+    return wrapper
@@ -0,0 +1,100 @@
+"""
+Process-wide loader cache invalidated by file changes.
+
+``file_cached`` memoises a loader once per process (shared by every Streamlit
+session) and re-runs it only when one of its source files changes, detected
+by comparing ``(st_ino, st_mtime_ns, st_size)`` on each call — a couple of
+``stat`` calls instead of a TTL timer. Edits made by another process or by
+hand are picked up on the next read; writes made through this process also
+call ``.clear()`` so same-tick rewrites are never missed.
+
+DataFrames are handed out as shallow views of the one cached frame (the data
+buffers are shared, not copied or pickled); with pandas copy-on-write enabled
+any change a page makes to its view copies just the touched columns and never
+reaches the shared frame. JSON-style dicts and lists are small and are edited
+in place by the pages, so they are returned as deep copies.
+"""
+
+import copy
+import functools
+import inspect
+import threading
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+
+def file_signature(paths) -> tuple:
+    """Identity of ``paths`` as it stands on disk right now."""
+    sig = []
+    for path in paths:
+        try:
+            st_ = Path(path).stat()
+        except FileNotFoundError:
+            sig.append(None)  # creating it later counts as a change
+        else:
+            sig.append((st_.st_ino, st_.st_mtime_ns, st_.st_size))
+    return tuple(sig)
+
+
+def _shared_view(value):
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=False)
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
+
+
+class _Entry:
+    __slots__ = ("lock", "signature", "value")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.signature = None
+        self.value = None
+
+
+def file_cached(paths: Callable[..., list]):
+    """
+    Cache a loader until any of ``paths(*args)`` changes on disk.
+
+    The wrapped function gains ``.clear(*args)``, mirroring ``st.cache_data``:
+    with arguments it drops that one entry, without arguments all of them.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        entries: dict[tuple, _Entry] = {}
+        entries_lock = threading.Lock()
+
+        def _key(args, kwargs) -> tuple:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return tuple(bound.arguments.values())
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _key(args, kwargs)
+            with entries_lock:
+                entry = entries.setdefault(key, _Entry())
+            # Per-key lock: concurrent sessions wait for one load, not N loads
+            with entry.lock:
+                current = file_signature(paths(*key))
+                if entry.signature != current:
+                    entry.value = func(*key)
+                    entry.signature = current
+                value = entry.value
+            return _shared_view(value)
+
+        def clear(*args, **kwargs):
+            with entries_lock:
+                if args or kwargs:
+                    entries.pop(_key(args, kwargs), None)
+                else:
+                    entries.clear()
+
+        wrapper.clear = clear
+        return wrapper
+
+    return decorator
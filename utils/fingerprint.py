@@ -0,0 +1,51 @@
+"""
+Content hashes of the values pages and caches are keyed on.
+
+``fingerprint`` hashes frames by their data (so an equal frame rebuilt on
+another rerun or in another session hashes the same), arrays by their bytes
+and containers by their items. It only needs hashlib, NumPy and pandas, so
+headless modules can key caches on it without pulling in Plotly.
+"""
+
+import hashlib
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+
+def _feed(h, value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        h.update(f"{type(value).__name__}{value.shape}".encode())
+        h.update(repr(value.dtypes.to_dict() if isinstance(value, pd.DataFrame)
+                      else (value.name, value.dtype)).encode())
+        try:
+            h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        except TypeError:  # unhashable cells (lists, dicts)
+            h.update(value.to_json(date_format="iso").encode())
+    elif isinstance(value, np.ndarray):
+        h.update(f"ndarray{value.dtype}{value.shape}".encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, Mapping):
+        h.update(b"{")
+        for k in sorted(value, key=repr):
+            _feed(h, k)
+            _feed(h, value[k])
+        h.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        h.update(b"[")
+        for item in value:
+            _feed(h, item)
+        h.update(b"]")
+    elif isinstance(value, (set, frozenset)):
+        _feed(h, sorted(value, key=repr))
+    else:
+        h.update(f"{type(value).__name__}:{value!r};".encode())
+
+
+def fingerprint(*values) -> str:
+    """Content hash of frames, arrays, containers and scalars."""
+    h = hashlib.blake2b(digest_size=16)
+    for value in values:
+        _feed(h, value)
+    return h.hexdigest()
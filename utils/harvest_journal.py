@@ -0,0 +1,498 @@
+"""
+Append-only harvest log storage.
+
+Logging a harvest appends one CSV row to the end of the log file and fsyncs
+it — O(1) I/O regardless of how long the season's history is. Each process
+keeps the parsed frame in memory together with the byte offset it has read
+up to, so later reads only parse rows appended since (by this or any other
+process). ``rewrite()`` replaces the whole log by writing a temp file and
+atomically renaming it over the original.
+
+Every entry carries a stable integer ``ID``. Editing or deleting one entry
+appends a JSON line to a sidecar ``.edits`` journal
+(``{"id": 17…, "f": {field: value}}`` or ``{"id": 17…, "del": 1}``)
+instead of rewriting the log. Readers replay new lines onto their frame,
+finding each entry through a sorted ID index (``searchsorted``). Once
+``compact_every`` lines have piled up, they are folded back into the CSV.
+Replaying a line is idempotent, so a crash mid-compaction loses nothing.
+
+``rollups()`` keeps a ``HarvestRollups`` snapshot next to the frame and
+folds appended rows into it the same way, so analytics never re-aggregate
+the whole season after a new entry.
+"""
+
+import io
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from utils.harvest_rollups import HarvestRollups
+
+HARVEST_COLUMNS = ["Date", "Plant", "Variant", "Quantity_kg", "Notes", "ID"]
+EDITABLE_COLUMNS = ("Date", "Plant", "Variant", "Quantity_kg", "Notes")
+
+# Bytes just before the read offset that must still match for the in-memory
+# frame to be reused; catches in-place hand edits of already-parsed rows.
+_GUARD_BYTES = 64
+
+_id_lock = threading.Lock()
+_last_id = 0
+
+
+def new_harvest_ids(n: int) -> np.ndarray:
+    """
+    ``n`` fresh entry IDs: microseconds since the epoch, strictly increasing
+    within the process, so they sort in logging order and never collide
+    across season files or with the positional IDs of pre-ID logs.
+    """
+    global _last_id
+    with _id_lock:
+        start = max(time.time_ns() // 1000, _last_id + 1)
+        _last_id = start + n - 1
+    return np.arange(start, start + n, dtype="int64")
+
+
+def edits_path(path: Path) -> Path:
+    """The edits journal that goes with the harvest log at ``path``."""
+    return Path(path).with_suffix(".edits")
+
+
+def _empty_frame() -> pd.DataFrame:
+    df = pd.DataFrame({c: pd.Series(dtype=object) for c in HARVEST_COLUMNS})
+    df["Date"] = pd.to_datetime(df["Date"])
+    df["ID"] = df["ID"].astype("int64")
+    return df
+
+
+def _parse(raw: bytes) -> pd.DataFrame:
+    df = pd.read_csv(io.BytesIO(raw))
+    if "Date" in df.columns:
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    return df
+
+
+def _id_column(df: pd.DataFrame) -> pd.Series:
+    """``df``'s IDs as numbers, NaN where missing (all of them without an ``ID`` column)."""
+    if "ID" not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    return pd.to_numeric(df["ID"], errors="coerce")
+
+
+def _fill_ids(df: pd.DataFrame, first_position: int = 0) -> tuple[pd.DataFrame, bool]:
+    """
+    ``df`` with an int64 ``ID`` column, and whether every ID came from disk.
+    Rows without one (logs written before IDs existed, hand-added lines) get
+    their 1-based position in the log.
+    """
+    ids = _id_column(df)
+    missing = ids.isna().to_numpy()
+    if missing.any():
+        positions = np.arange(first_position + 1, first_position + len(df) + 1)
+        ids = ids.where(~missing, positions)
+    return df.assign(ID=ids.to_numpy("int64")), not missing.any()
+
+
+def _edit_value(column: str, value):
+    if column == "Date":
+        return pd.Timestamp(value)
+    if column == "Quantity_kg":
+        return float(value)
+    return value
+
+
+class HarvestJournal:
+    """Incrementally-read, append-only CSV harvest log for one file."""
+
+    def __init__(self, path: Path, compact_every: int = 500):
+        self.path = Path(path)
+        self.edits_path = edits_path(self.path)
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._frame = None
+        self._rollups = None
+        self._id_index = None
+        self._ids_on_disk = True
+        self._header = b""
+        self._offset = 0
+        self._guard = b""
+        self._file_id = None
+        self._edits_offset = 0
+        self._edits_file_id = None
+        self._edit_lines = 0
+
+    # ─── Reading ──────────────────────────────────────────────────────────────
+    def read(self) -> pd.DataFrame:
+        """Return the full log, parsing only bytes appended since last read."""
+        with self._lock:
+            self._refresh()
+            # New rows and edits produce a fresh frame (or copy-on-write
+            # columns), never writes into this one, so a shallow view is safe
+            return self._frame.copy(deep=False)
+
+    def rollups(self) -> HarvestRollups:
+        """Rollups over the current log (an immutable snapshot, safe to share)."""
+        with self._lock:
+            self._refresh()
+            if self._rollups is None:
+                self._rollups = HarvestRollups(self._frame)
+            return self._rollups
+
+    def entry(self, harvest_id: int) -> dict | None:
+        """The entry with ``harvest_id`` as a dict, None if there is none."""
+        with self._lock:
+            self._refresh()
+            pos = self._positions([harvest_id])[0]
+            return None if pos < 0 else self._frame.iloc[pos].to_dict()
+
+    def _refresh(self) -> None:
+        try:
+            st_ = self.path.stat()
+        except FileNotFoundError:
+            self._reset(_empty_frame())
+            return
+
+        file_id = (st_.st_dev, st_.st_ino)
+        if (
+            self._frame is None
+            or file_id != self._file_id
+            or st_.st_size < self._offset
+            or not self._guard_matches()
+            or self._edits_rewound()
+        ):
+            self._load_full(file_id)
+        elif st_.st_size > self._offset:
+            self._load_tail()
+        # Edits are read after the rows they refer to were appended
+        self._load_edits()
+
+    def _reset(self, frame: pd.DataFrame, file_id=None) -> None:
+        self._frame = frame
+        self._rollups = None
+        self._id_index = None
+        self._ids_on_disk = True
+        self._header = b""
+        self._offset = 0
+        self._guard = b""
+        self._file_id = file_id
+        self._edits_offset = 0
+        self._edits_file_id = None
+        self._edit_lines = 0
+
+    def _guard_matches(self) -> bool:
+        if not self._guard:
+            return True
+        with open(self.path, "rb") as f:
+            f.seek(self._offset - len(self._guard))
+            return f.read(len(self._guard)) == self._guard
+
+    def _edits_rewound(self) -> bool:
+        # Edits already applied to the frame are gone or replaced (rewrite,
+        # compaction): the frame has to be rebuilt from the log
+        if not self._edits_offset:
+            return False
+        try:
+            st_ = self.edits_path.stat()
+        except FileNotFoundError:
+            return True
+        return (st_.st_dev, st_.st_ino) != self._edits_file_id or st_.st_size < self._edits_offset
+
+    def _load_full(self, file_id) -> None:
+        raw = self.path.read_bytes()
+        end = raw.rfind(b"\n") + 1
+        if end == 0:
+            # Empty file, or a header still missing its trailing newline
+            self._reset(_empty_frame(), file_id)
+            return
+        self._reset(None, file_id)
+        self._frame, self._ids_on_disk = _fill_ids(_parse(raw[:end]))
+        self._header = raw[:raw.find(b"\n") + 1]
+        self._offset = end
+        self._guard = raw[max(0, end - _GUARD_BYTES):end]
+
+    def _load_tail(self) -> None:
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            tail = f.read()
+        end = tail.rfind(b"\n") + 1
+        if end == 0:
+            return  # partial line still being written
+        new_rows, on_disk = _fill_ids(_parse(self._header + tail[:end]), len(self._frame))
+        self._ids_on_disk &= on_disk
+        n = len(self._frame)
+        self._frame = pd.concat([self._frame, new_rows], ignore_index=True)
+        if self._rollups is not None:
+            self._rollups = self._rollups.extended(self._frame)
+        if self._id_index is not None:
+            self._id_index = _extend_index(self._id_index, new_rows["ID"].to_numpy("int64"), n)
+        self._offset += end
+        self._guard = (self._guard + tail[:end])[-_GUARD_BYTES:]
+
+    def _load_edits(self) -> None:
+        try:
+            with open(self.edits_path, "rb") as f:
+                st_ = os.fstat(f.fileno())
+                f.seek(self._edits_offset)
+                tail = f.read()
+        except FileNotFoundError:
+            return
+        end = tail.rfind(b"\n") + 1
+        if end == 0:
+            return  # nothing new, or a partial line still being written
+        edits = []
+        for line in tail[:end].splitlines():
+            try:
+                edits.append(json.loads(line))
+            except ValueError:
+                continue  # torn line from an interrupted write
+        self._apply(edits)
+        self._edits_offset += end
+        self._edits_file_id = (st_.st_dev, st_.st_ino)
+        self._edit_lines += len(edits)
+
+    def _apply(self, edits: list[dict]) -> None:
+        positions = self._positions([e["id"] for e in edits])
+        changes: dict[str, dict[int, object]] = {}
+        deleted = set()
+        for edit, pos in zip(edits, positions):
+            if pos < 0 or pos in deleted:
+                continue  # entry gone (deleted earlier, or compacted away)
+            if edit.get("del"):
+                deleted.add(pos)
+                continue
+            for column, value in edit["f"].items():
+                changes.setdefault(column, {})[pos] = _edit_value(column, value)
+        # Changed columns are replaced, never written into: rollup snapshots
+        # and views handed out keep the frame they were given
+        frame = self._frame.copy(deep=False)
+        for column, values in changes.items():
+            col = frame[column] if column in frame.columns else pd.Series(np.nan, index=frame.index)
+            # Cast to the edited values' type first: a whole-number log reads
+            # Quantity_kg as int64, which rejects a fractional edit
+            if column == "Date":
+                col = pd.to_datetime(col, errors="coerce")
+            elif column == "Quantity_kg":
+                if pd.api.types.is_integer_dtype(col):
+                    col = col.astype(float)
+            else:
+                col = col.astype(object)
+            col = col.copy()
+            col.iloc[list(values)] = list(values.values())
+            frame[column] = col
+        if deleted:
+            frame = frame.drop(index=frame.index[sorted(deleted)]).reset_index(drop=True)
+            self._id_index = None
+        self._frame = frame
+        self._rollups = None
+
+    def _positions(self, ids) -> np.ndarray:
+        """Row position of each of ``ids`` in the frame, -1 where absent."""
+        if self._id_index is None:
+            all_ids = self._frame["ID"].to_numpy("int64")
+            order = np.argsort(all_ids, kind="stable")
+            self._id_index = (all_ids[order], order)
+        sorted_ids, order = self._id_index
+        ids = np.asarray(ids, dtype="int64")
+        if not len(sorted_ids):
+            return np.full(len(ids), -1)
+        at = np.searchsorted(sorted_ids, ids).clip(max=len(sorted_ids) - 1)
+        return np.where(sorted_ids[at] == ids, order[at], -1)
+
+    # ─── Writing ──────────────────────────────────────────────────────────────
+    def append(self, entries) -> list[int]:
+        """
+        Append one entry (dict) or several (list of dicts / DataFrame) and
+        return their IDs. Entries without an ``ID`` are given a new one.
+        """
+        if isinstance(entries, dict):
+            entries = [entries]
+        new = pd.DataFrame(entries)
+        if new.empty:
+            return []
+        ids = _id_column(new)
+        missing = ids.isna().to_numpy()
+        ids[missing] = new_harvest_ids(int(missing.sum()))
+        new["ID"] = ids.to_numpy("int64")
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if "ID" not in self._columns_on_disk():
+                # Logs from before entries had IDs are rewritten once with them
+                self._refresh()
+                self._rewrite(self._frame)
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            with os.fdopen(fd, "ab") as f:
+                size = f.seek(0, os.SEEK_END)
+                columns = self._columns_on_disk() if size else HARVEST_COLUMNS
+                body = _to_csv_bytes(new.reindex(columns=columns), header=(size == 0))
+                if size and not self._ends_with_newline():
+                    body = b"\n" + body
+                f.write(body)
+                f.flush()
+                os.fsync(f.fileno())
+        return new["ID"].tolist()
+
+    def update(self, harvest_id: int, fields: dict) -> bool:
+        """
+        Change ``fields`` of one entry with a single journal append; False if
+        there is no entry with ``harvest_id``.
+        """
+        unknown = set(fields) - set(EDITABLE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Not editable: {sorted(unknown)}")
+        values = {
+            column: (
+                pd.Timestamp(value).strftime("%Y-%m-%d") if column == "Date" else _json_value(value)
+            )
+            for column, value in fields.items()
+        }
+        return self._amend({"id": int(harvest_id), "f": values})
+
+    def delete(self, harvest_id: int) -> bool:
+        """Delete one entry with a single journal append; False if it doesn't exist."""
+        return self._amend({"id": int(harvest_id), "del": 1})
+
+    def _amend(self, edit: dict) -> bool:
+        with self._lock:
+            self._refresh()
+            if self._positions([edit["id"]])[0] < 0:
+                return False
+            if not self._ids_on_disk:
+                # Positional IDs only hold until the log changes; persist them first
+                self._rewrite(self._frame)
+                self._refresh()
+            with open(self.edits_path, "ab") as f:
+                line = json.dumps(edit, ensure_ascii=False, separators=(",", ":"))
+                f.write(line.encode("utf-8") + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._load_edits()
+            if self._edit_lines >= self.compact_every:
+                self._compact()
+            return True
+
+    def compact(self) -> None:
+        """Fold the edits journal into the log."""
+        with self._lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        self._refresh()
+        self._rewrite(self._frame)
+
+    def _columns_on_disk(self) -> list:
+        try:
+            with open(self.path, "rb") as f:
+                header = f.readline()
+        except FileNotFoundError:
+            return HARVEST_COLUMNS
+        if not header.strip():
+            return HARVEST_COLUMNS
+        return header.decode("utf-8").strip().split(",")
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def rewrite(self, df: pd.DataFrame) -> None:
+        """
+        Replace the whole log atomically (bulk edits and imports); entries
+        without an ``ID`` are given one. Pending edits are discarded.
+        """
+        with self._lock:
+            self._rewrite(df)
+
+    def _rewrite(self, df: pd.DataFrame) -> None:
+        absent = [c for c in HARVEST_COLUMNS if c not in df.columns]
+        out = df.reindex(columns=[*df.columns, *absent])
+        ids = pd.to_numeric(out["ID"], errors="coerce")
+        missing = ids.isna().to_numpy()
+        if missing.any():
+            ids[missing] = new_harvest_ids(int(missing.sum()))
+        out["ID"] = ids.to_numpy("int64")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                f.write(_to_csv_bytes(out, header=True))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        # The log now holds every edit; replaying them again would be harmless
+        self.edits_path.unlink(missing_ok=True)
+        self._frame = None
+        self._rollups = None
+
+
+def _extend_index(index: tuple, new_ids: np.ndarray, first_position: int) -> tuple | None:
+    """ID index with appended rows added, None (rebuild) if they don't sort last."""
+    sorted_ids, order = index
+    if len(new_ids) and len(sorted_ids) and (
+        new_ids.min() <= sorted_ids[-1] or np.any(np.diff(new_ids) <= 0)
+    ):
+        return None
+    return (np.concatenate([sorted_ids, new_ids]),
+            np.concatenate([order, np.arange(first_position, first_position + len(new_ids))]))
+
+
+def _json_value(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return None if pd.isna(value) else value
+
+
+def _to_csv_bytes(df: pd.DataFrame, header: bool) -> bytes:
+    out = df.copy()
+    if "Date" in out.columns:
+        out["Date"] = pd.to_datetime(out["Date"], errors="coerce").dt.strftime("%Y-%m-%d")
+    return out.to_csv(index=False, header=header, lineterminator="\n").encode("utf-8")
+
+
+_journals: dict[Path, HarvestJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_journal(path: Path) -> HarvestJournal:
+    """Process-wide journal for ``path`` (shared by all Streamlit sessions)."""
+    path = Path(path).resolve()
+    with _journals_lock:
+        if path not in _journals:
+            _journals[path] = HarvestJournal(path)
+        return _journals[path]
+
+
+_split_lock = threading.Lock()
+
+
+def split_by_season(path: Path, season_path: Callable[[int], Path]) -> int:
+    """
+    Move every entry of the single pre-season log at ``path`` (edits
+    applied) into ``season_path(year)`` for the year of its Date, then
+    rename the log, and its edits journal, to ``*.migrated``. Entries keep
+    their IDs unless the season's log already has them. Undated entries
+    stay only in the renamed copy. Returns the number of entries moved;
+    0 when there is no log to split.
+    """
+    path = Path(path)
+    with _split_lock:
+        if not path.exists():
+            return 0
+        legacy = HarvestJournal(path).read()
+        dated = legacy[legacy["Date"].notna()]
+        for year, rows in dated.groupby(dated["Date"].dt.year, sort=True):
+            target = get_journal(season_path(int(year)))
+            taken = target.read()["ID"].to_numpy("int64")
+            rows = rows.assign(ID=rows["ID"].where(~rows["ID"].isin(taken)))
+            target.append(rows)
+        for old in (edits_path(path), path):
+            if old.exists():
+                os.replace(old, old.with_name(old.name + ".migrated"))
+        return len(dated)
@@ -0,0 +1,195 @@
+"""
+Pre-aggregated harvest analytics.
+
+``HarvestRollups`` indexes one harvest log frame: its rows sorted by date
+(``datetime64`` array, so a date range is two ``searchsorted`` calls) and
+kg totals per day × plant, week × plant, plant and variant. Range and plant
+filtered totals are answered from the daily rollup, whose size is bounded by
+days × plants rather than by the number of log entries.
+
+Snapshots are immutable: ``extended()`` returns a new one that folds in only
+the rows appended since, sharing nothing mutable with the old one, so a
+snapshot handed to one session never changes under it.
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from utils.beds import UNASSIGNED
+
+_DAY = np.timedelta64(1, "D")
+
+
+def _day(value) -> np.datetime64:
+    return np.datetime64(pd.Timestamp(value).date(), "D")
+
+
+def _week_start(days: np.ndarray) -> np.ndarray:
+    # 1970-01-01 was a Thursday; shift so weeks start on Monday
+    weekday = ((days.astype("int64") + 3) % 7).astype("timedelta64[D]")
+    return (days - weekday).astype("datetime64[D]")
+
+
+class HarvestRollups:
+    """Date-sorted index and kg rollups over one harvest log frame."""
+
+    def __init__(self, harvests: pd.DataFrame):
+        self.frame = harvests
+        self.n = len(harvests)
+        rows = self._prepare(harvests)
+        days = rows["Day"].to_numpy("datetime64[D]")
+        self._order = np.argsort(days, kind="stable")
+        self._days = days[self._order]
+        self._daily = self._group(rows, ["Day", "Plant"])
+        self._weekly = self._group(rows.assign(Week=_week_start(days)), ["Week", "Plant"])
+        self._plant = self._group(rows, ["Plant"])
+        self._variant = self._group(rows, ["Variant"])
+        self.total_kg = float(rows["kg"].sum())
+        self._finish()
+
+    @staticmethod
+    def _prepare(rows: pd.DataFrame) -> pd.DataFrame:
+        # NaT days sort last, so they never fall inside a finite date range.
+        # (pandas stores the day column as datetime64[s]; read it back as [D])
+        return pd.DataFrame({
+            "Day": pd.to_datetime(rows["Date"], errors="coerce").to_numpy("datetime64[D]"),
+            "Plant": rows["Plant"].astype(object).to_numpy(),
+            "Variant": (
+                rows["Variant"].astype(object).fillna("").to_numpy() if "Variant" in rows else ""
+            ),
+            "kg": pd.to_numeric(rows["Quantity_kg"], errors="coerce").fillna(0.0).to_numpy(float),
+        })
+
+    @staticmethod
+    def _group(rows: pd.DataFrame, keys: list) -> pd.Series:
+        return rows.groupby(keys, sort=True)["kg"].sum()
+
+    def _finish(self):
+        self._daily_days = self._daily.index.get_level_values(0).to_numpy("datetime64[D]")
+        self.plants = sorted(self._plant.index)
+
+    # ─── Updating ─────────────────────────────────────────────────────────────
+    def extended(self, harvests: pd.DataFrame) -> "HarvestRollups":
+        """
+        Rollups for ``harvests``, a frame whose first ``self.n`` rows are the
+        ones already indexed; only the rows after them are aggregated.
+        """
+        new = self._prepare(harvests.iloc[self.n:])
+        out = object.__new__(HarvestRollups)
+        out.frame = harvests
+        out.n = len(harvests)
+        new_days = new["Day"].to_numpy("datetime64[D]")
+        new_order = np.arange(self.n, out.n)[np.argsort(new_days, kind="stable")]
+        days = np.concatenate([self._days, np.sort(new_days, kind="stable")])
+        order = np.concatenate([self._order, new_order])
+        n_old = len(self._days)
+        if n_old and len(new_days) and not days[n_old - 1] <= days[n_old]:
+            # Back-dated entries: one stable merge of two sorted runs
+            merge = np.argsort(days, kind="stable")
+            days, order = days[merge], order[merge]
+        out._days, out._order = days, order
+        out._daily = self._merge(self._daily, self._group(new, ["Day", "Plant"]))
+        out._weekly = self._merge(
+            self._weekly, self._group(new.assign(Week=_week_start(new_days)), ["Week", "Plant"])
+        )
+        out._plant = self._merge(self._plant, self._group(new, ["Plant"]))
+        out._variant = self._merge(self._variant, self._group(new, ["Variant"]))
+        out.total_kg = self.total_kg + float(new["kg"].sum())
+        out._finish()
+        return out
+
+    @staticmethod
+    def _merge(rollup: pd.Series, new: pd.Series) -> pd.Series:
+        if new.empty:
+            return rollup
+        if rollup.empty:
+            return new
+        # Add onto the keys already present by position, append the unseen
+        # ones and re-sort only when there are any (no index alignment)
+        pos = rollup.index.get_indexer(new.index)
+        seen = pos >= 0
+        values = rollup.to_numpy(copy=True)
+        values[pos[seen]] += new.to_numpy()[seen]
+        merged = pd.Series(values, index=rollup.index, name=rollup.name)
+        if seen.all():
+            return merged
+        return pd.concat([merged, new[~seen]]).sort_index()
+
+    # ─── Queries ──────────────────────────────────────────────────────────────
+    @property
+    def bounds(self) -> tuple[datetime.date, datetime.date] | None:
+        """First and last harvest day, None when no row has a date."""
+        dated = self._days[~np.isnat(self._days)]
+        if not len(dated):
+            return None
+        return dated[0].item(), dated[-1].item()
+
+    def _span(self, days: np.ndarray, start, end) -> slice:
+        lo = 0 if start is None else np.searchsorted(days, _day(start), side="left")
+        hi = len(days) if end is None else np.searchsorted(days, _day(end) + _DAY, side="left")
+        return slice(lo, hi)
+
+    def positions(self, start=None, end=None) -> np.ndarray:
+        """Row positions in ``frame`` dated ``start``..``end`` (inclusive), by date."""
+        if start is None and end is None:
+            return self._order
+        return self._order[self._span(self._days, start, end)]
+
+    def rows(self, start=None, end=None, plants=None) -> pd.DataFrame:
+        """Log rows in the date range (and among ``plants``), oldest first."""
+        out = self.frame.iloc[self.positions(start, end)]
+        if plants is not None:
+            out = out[out["Plant"].isin(plants)]
+        return out
+
+    def _daily_range(self, start, end, plants) -> pd.Series:
+        daily = self._daily.iloc[self._span(self._daily_days, start, end)]
+        if plants is not None:
+            daily = daily[daily.index.get_level_values("Plant").isin(plants)]
+        return daily
+
+    def daily(self, start=None, end=None, plants=None) -> pd.DataFrame:
+        """Kg per (Date, Plant) — the shape of ``core.harvest_daily``."""
+        daily = self._daily_range(start, end, plants)
+        return pd.DataFrame({
+            "Date": daily.index.get_level_values("Day").astype("datetime64[ns]"),
+            "Plant": daily.index.get_level_values("Plant"),
+            "Quantity_kg": daily.to_numpy(),
+        })
+
+    def weekly(self, plants=None) -> pd.DataFrame:
+        """Kg per (Week starting Monday, Plant)."""
+        weekly = self._weekly
+        if plants is not None:
+            weekly = weekly[weekly.index.get_level_values("Plant").isin(plants)]
+        return pd.DataFrame({
+            "Week": weekly.index.get_level_values("Week").astype("datetime64[ns]"),
+            "Plant": weekly.index.get_level_values("Plant"),
+            "Quantity_kg": weekly.to_numpy(),
+        })
+
+    def totals(self, start=None, end=None, plants=None) -> pd.DataFrame:
+        """Total kg per plant, largest first — the shape of ``core.harvest_totals``."""
+        if start is None and end is None:
+            by_plant = self._plant
+            if plants is not None:
+                by_plant = by_plant[by_plant.index.isin(plants)]
+        else:
+            by_plant = self._daily_range(start, end, plants).groupby(level="Plant").sum()
+        totals = by_plant.sort_values(ascending=False, kind="stable").reset_index()
+        totals.columns = ["Plant", "Total (kg)"]
+        return totals
+
+    def by_bed(self, assign) -> pd.DataFrame:
+        """
+        Total kg per bed. ``assign`` maps a Series of variant display names to
+        beds (e.g. ``BedIndex.assign``); the variant rollup keeps this cheap.
+        """
+        if self._variant.empty:
+            return pd.DataFrame(columns=["Bed", "Total (kg)"])
+        beds = assign(pd.Series(self._variant.index, dtype=object)).fillna(UNASSIGNED)
+        by_bed = self._variant.groupby(beds.to_numpy()).sum()
+        by_bed = by_bed.sort_values(ascending=False, kind="stable")
+        return pd.DataFrame({"Bed": by_bed.index, "Total (kg)": by_bed.to_numpy()})
@@ -1,15 +1,41 @@
 """
 Shared utilities and helper functions for the Verti Garden Planner app.
+
+This is the Streamlit-facing layer: cached loaders, persistence and page
+chrome. Pure computations live in ``utils/core.py`` (no Streamlit import) and
+the most used ones are re-exported here.
 """
 
 import json
-import math
 import os
 from pathlib import Path
 
 import pandas as pd
 import streamlit as st
 
+from utils.beds import BedIndex
+from utils.companions import CompanionIndex
+from utils.core import (  # noqa: F401 - re-exported for the pages
+    STATUS_COLORS,
+    STATUS_LABELS,
+    STATUS_OPTIONS,
+    calculate_planting_dates,
+    get_plant_color,
+    get_plant_status,
+    get_spacing,
+    plants_in_bed,
+    plants_per_sqft,
+)
+from utils.file_cache import file_cached, file_signature
+from utils.harvest_journal import edits_path, get_journal, split_by_season
+from utils.harvest_rollups import HarvestRollups
+from utils.progress_store import PHASES, ProgressStore
+from utils.schedule_engine import ScheduleEngine, default_frost_table
+from utils.seasons import season_plants, stack_seasons
+from utils.seed_store import load_seeds_cached, prepare_seeds
+from utils.sites import SiteScheduler, normalize_sites
+from utils.sqlite_store import SQLiteStore
+
 # ─── Paths ────────────────────────────────────────────────────────────────────
 ROOT_DIR = Path(__file__).parent.parent
 DATA_DIR = ROOT_DIR / "data"
@@ -19,27 +45,76 @@ HARVEST_DIR = DATA_DIR / "harvests"
 HARVEST_CSV = HARVEST_DIR / "harvest_log.csv"
 COMPANION_JSON = DATA_DIR / "companion_plants.json"
 GARDEN_BEDS_JSON = DATA_DIR / "garden_beds.json"
+CACHE_DIR = DATA_DIR / ".cache"
+PLANTING_RULES_JSON = DATA_DIR / "planting_rules.json"
+SITES_JSON = DATA_DIR / "sites.json"
+
+# Loaders below hand out shallow views of one process-wide cached frame (see
+# utils/file_cache.py); copy-on-write keeps page edits off the shared copy.
+# It is always on from pandas 3.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# ─── Storage backend ──────────────────────────────────────────────────────────
+# "files" (default): CSV/JSON under data/. "sqlite": see utils/sqlite_store.py.
+STORAGE_BACKEND = os.environ.get("VERTI_STORAGE", "files").lower()
+SQLITE_DB = Path(os.environ.get("VERTI_DB_PATH", DATA_DIR / "verti.db"))
+
+
+@st.cache_resource
+def _sqlite_store() -> SQLiteStore:
+    return SQLiteStore(SQLITE_DB)
+
+
+def sqlite_store() -> SQLiteStore | None:
+    """The SQLite store when that backend is enabled, else None."""
+    return _sqlite_store() if STORAGE_BACKEND == "sqlite" else None
+
+
+def _sqlite_files() -> list[Path]:
+    # Committed writes land in the -wal file first, the main file on checkpoint
+    return [SQLITE_DB, SQLITE_DB.with_name(SQLITE_DB.name + "-wal")]
+
+
+def _watched(*paths: Path) -> list[Path]:
+    """Files a loader depends on under the active storage backend."""
+    return _sqlite_files() if STORAGE_BACKEND == "sqlite" else list(paths)
 
 
 # ─── Data Loading ─────────────────────────────────────────────────────────────
-@st.cache_data(ttl=60)
-def load_seeds_df(year: int = 2025) -> pd.DataFrame:
-    """Load and pre-process the seeds CSV for a specific year."""
+def seeds_csv_path(year: int = 2025) -> Path:
+    """Path of the seeds CSV for a year, falling back to 2025."""
     seeds_file = SEEDS_DIR / f"{year}-seeds.csv"
     if not seeds_file.exists():
         # Fall back to 2025 if specific year file doesn't exist
         seeds_file = SEEDS_DIR / "2025-seeds.csv"
-    df = pd.read_csv(seeds_file)
-    df["Start Indoors"] = pd.to_datetime(df["Start Indoors"], errors="coerce")
-    df["Transplant / Sow"] = pd.to_datetime(df["Transplant / Sow"], errors="coerce")
-    df = df.rename(columns={"Start Indoors": "Start Date", "Transplant / Sow": "End Date"})
-    df["Seed"] = df["Seed"].astype(str)
-    df["Variant"] = df["Variant"].astype(str)
-    df["Display Name"] = df[["Seed", "Variant"]].agg(" ".join, axis=1).str.strip()
-    # For Direct Sow: start date 3 days before end date
-    idx = df["Planting Method"] == "Direct Sow"
-    df.loc[idx, "Start Date"] = df.loc[idx, "End Date"] - pd.Timedelta(days=3)
-    return df
+    return seeds_file
+
+
+def _seeds_files(year: int) -> list[Path]:
+    return _watched(SEEDS_DIR / f"{year}-seeds.csv", SEEDS_DIR / "2025-seeds.csv")
+
+
+@file_cached(_seeds_files)
+def load_seeds_df(year: int = 2025) -> pd.DataFrame:
+    """Load and pre-process the seeds CSV for a specific year."""
+    store = sqlite_store()
+    if store is not None:
+        return prepare_seeds(store.load_seeds(year if store.has_seeds(year) else 2025))
+    return load_seeds_cached(seeds_csv_path(year), CACHE_DIR)
+
+
+def season_years() -> list[int]:
+    """Years that have their own seeds data, oldest first."""
+    store = sqlite_store()
+    if store is not None:
+        return store.seed_years()
+    return sorted(int(f.name.split("-")[0]) for f in SEEDS_DIR.glob("*-seeds.csv"))
+
+
+def current_season() -> int:
+    """The latest season with seeds data (2025 when there is none)."""
+    return max(season_years(), default=2025)
 
 
 def reload_seeds():
@@ -47,41 +122,147 @@ def reload_seeds():
     load_seeds_df.clear()
 
 
-@st.cache_data(ttl=300)
+@file_cached(lambda: [COMPANION_JSON])
 def load_companion_data() -> dict:
     """Load companion planting JSON."""
     with open(COMPANION_JSON, "r", encoding="utf-8") as f:
         return json.load(f)
 
-@st.cache_data(ttl=60)
+
+@file_cached(lambda: [COMPANION_JSON])
+def load_companion_index() -> CompanionIndex:
+    """Shared, read-only relationship matrix built from the companion JSON."""
+    return CompanionIndex(load_companion_data())
+
+
+@file_cached(lambda: _watched(PLANTING_RULES_JSON))
 def load_planting_rules() -> dict:
     """Load planting rules JSON."""
-    rules_file = DATA_DIR / "planting_rules.json"
-    if rules_file.exists():
-        with open(rules_file, "r", encoding="utf-8") as f:
+    store = sqlite_store()
+    if store is not None:
+        return store.load_planting_rules()
+    if PLANTING_RULES_JSON.exists():
+        with open(PLANTING_RULES_JSON, "r", encoding="utf-8") as f:
             return json.load(f)
     return {}
 
 
-@st.cache_data(ttl=60)
-def load_harvest_log() -> pd.DataFrame:
-    """Load harvest log; create empty frame if file doesn't exist."""
-    if HARVEST_CSV.exists():
-        df = pd.read_csv(HARVEST_CSV, parse_dates=["Date"])
-        return df
-    return pd.DataFrame(columns=["Date", "Plant", "Variant", "Quantity_kg", "Notes"])
-
-
-def save_harvest_log(df: pd.DataFrame):
-    """Persist harvest log to CSV."""
-    DATA_DIR.mkdir(exist_ok=True)
-    df.to_csv(HARVEST_CSV, index=False)
-    load_harvest_log.clear()
+def _season_harvest_csv(year: int) -> Path:
+    return HARVEST_DIR / f"{year}_harvest.csv"
 
 
-@st.cache_data(ttl=60)
+def _split_legacy_harvests():
+    """Split a legacy ``harvest_log.csv`` from before per-season logs into them by entry date."""
+    if HARVEST_CSV.exists():
+        split_by_season(HARVEST_CSV, _season_harvest_csv)
+
+
+def harvest_csv_path(year: int | None = None) -> Path:
+    """
+    A season's harvest log; the legacy single log when ``year`` is None.
+    The first time a season's log is asked for, the legacy log is split.
+    """
+    if year is None:
+        return HARVEST_CSV
+    _split_legacy_harvests()
+    return _season_harvest_csv(year)
+
+
+def harvest_years() -> list[int]:
+    """Years with logged harvests (or a harvest log), oldest first."""
+    store = sqlite_store()
+    if store is not None:
+        return store.harvest_years()
+    _split_legacy_harvests()
+    return sorted(int(f.name.split("_")[0]) for f in HARVEST_DIR.glob("*_harvest.csv"))
+
+
+def load_harvest_log(year: int | None = None) -> pd.DataFrame:
+    """
+    Load a season's harvest log; empty frame if the file doesn't exist.
+
+    Not wrapped in file_cached: the journal keeps the parsed log in memory
+    and only parses rows appended since the previous read.
+    """
+    store = sqlite_store()
+    if store is not None:
+        return store.load_harvest_log(year)
+    return get_journal(harvest_csv_path(year)).read()
+
+
+def append_harvest(entry: dict) -> int:
+    """Append a single harvest entry to its season's log (one fsync'd row write); returns its ID."""
+    store = sqlite_store()
+    if store is not None:
+        return store.append_harvest(entry)
+    return get_journal(harvest_csv_path(pd.Timestamp(entry["Date"]).year)).append(entry)[0]
+
+
+def update_harvest(harvest_id: int, fields: dict, year: int | None = None) -> bool:
+    """
+    Change ``fields`` of the entry ``harvest_id`` in ``year``'s log, touching
+    only that entry in storage; False if there is no such entry. An entry
+    whose date moves to another season moves to that season's log, keeping
+    its ID unless that log already has an entry with it.
+    """
+    store = sqlite_store()
+    if store is not None:
+        return store.update_harvest(harvest_id, fields)
+    journal = get_journal(harvest_csv_path(year))
+    if year is not None and "Date" in fields and pd.Timestamp(fields["Date"]).year != year:
+        entry = journal.entry(harvest_id)
+        if entry is None:
+            return False
+        target = get_journal(harvest_csv_path(pd.Timestamp(fields["Date"]).year))
+        moved = {**entry, **fields}
+        if target.entry(harvest_id) is not None:
+            # Taken there, e.g. by a pre-ID log's positional IDs: take a fresh one
+            del moved["ID"]
+        target.append(moved)
+        return journal.delete(harvest_id)
+    return journal.update(harvest_id, fields)
+
+
+def delete_harvest(harvest_id: int, year: int | None = None) -> bool:
+    """Delete the entry ``harvest_id`` from ``year``'s log; False if there is none."""
+    store = sqlite_store()
+    if store is not None:
+        return store.delete_harvest(harvest_id)
+    return get_journal(harvest_csv_path(year)).delete(harvest_id)
+
+
+def save_harvest_log(df: pd.DataFrame, year: int | None = None):
+    """Atomically rewrite a season's whole harvest log (bulk edits, imports)."""
+    store = sqlite_store()
+    if store is not None:
+        store.save_harvest_log(df, year)
+        return
+    get_journal(harvest_csv_path(year)).rewrite(df)
+
+
+@file_cached(lambda year: _sqlite_files())
+def _sqlite_harvest_rollups(year: int | None) -> HarvestRollups:
+    return HarvestRollups(sqlite_store().load_harvest_log(year))
+
+
+def load_harvest_rollups(year: int | None = None) -> HarvestRollups:
+    """
+    Date index and kg rollups of a season's harvest log (utils/harvest_rollups.py).
+
+    With CSV storage the journal folds each appended row into its rollups;
+    with SQLite they are rebuilt once per database change.
+    """
+    if sqlite_store() is not None:
+        return _sqlite_harvest_rollups(year)
+    return get_journal(harvest_csv_path(year)).rollups()
+
+
+@file_cached(lambda: _watched(GARDEN_BEDS_JSON))
 def load_garden_beds() -> list:
     """Load saved garden bed layouts."""
+    store = sqlite_store()
+    if store is not None:
+        return store.load_garden_beds()
     if GARDEN_BEDS_JSON.exists():
         with open(GARDEN_BEDS_JSON, "r", encoding="utf-8") as f:
             return json.load(f)
@@ -90,21 +271,154 @@ def load_garden_beds() -> list:
 
 def save_garden_beds(beds: list):
     """Persist garden bed layouts to JSON."""
-    DATA_DIR.mkdir(exist_ok=True)
-    with open(GARDEN_BEDS_JSON, "w", encoding="utf-8") as f:
-        json.dump(beds, f, indent=2, ensure_ascii=False)
+    store = sqlite_store()
+    if store is not None:
+        store.save_garden_beds(beds)
+    else:
+        DATA_DIR.mkdir(exist_ok=True)
+        with open(GARDEN_BEDS_JSON, "w", encoding="utf-8") as f:
+            json.dump(beds, f, indent=2, ensure_ascii=False)
     load_garden_beds.clear()
 
 
 def save_planting_rules(rules: dict):
     """Persist planting rules to JSON."""
-    DATA_DIR.mkdir(exist_ok=True)
-    rules_file = DATA_DIR / "planting_rules.json"
-    with open(rules_file, "w", encoding="utf-8") as f:
-        json.dump(rules, f, indent=2, ensure_ascii=False)
+    store = sqlite_store()
+    if store is not None:
+        store.save_planting_rules(rules)
+    else:
+        DATA_DIR.mkdir(exist_ok=True)
+        with open(PLANTING_RULES_JSON, "w", encoding="utf-8") as f:
+            json.dump(rules, f, indent=2, ensure_ascii=False)
     load_planting_rules.clear()
 
 
+@file_cached(lambda: _watched(SITES_JSON))
+def load_sites() -> list:
+    """Growing sites (see utils/sites.py); just the default site if none are saved."""
+    store = sqlite_store()
+    if store is not None:
+        sites = store.load_sites()
+    elif SITES_JSON.exists():
+        with open(SITES_JSON, "r", encoding="utf-8") as f:
+            sites = json.load(f)
+    else:
+        sites = []
+    return normalize_sites(sites)
+
+
+def save_sites(sites: list):
+    """Validate and persist growing sites."""
+    sites = normalize_sites(sites)
+    store = sqlite_store()
+    if store is not None:
+        store.save_sites(sites)
+    else:
+        DATA_DIR.mkdir(exist_ok=True)
+        with open(SITES_JSON, "w", encoding="utf-8") as f:
+            json.dump(sites, f, indent=2, ensure_ascii=False)
+    load_sites.clear()
+
+
+# ─── Rule-based schedule ──────────────────────────────────────────────────────
+@st.cache_resource
+def _schedule_engine() -> ScheduleEngine:
+    return ScheduleEngine()
+
+
+def rule_schedule(years=(2025,), frost: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Start/end dates from planting_rules.json for every site and year in
+    ``frost`` (default: the May 9 default site in ``years``). The shared engine
+    recomputes only rules and frost dates that changed since the last call.
+    """
+    if frost is None:
+        frost = default_frost_table(years)
+    return _schedule_engine().update(load_planting_rules(), frost).frame()
+
+
+# ─── Site calendars ───────────────────────────────────────────────────────────
+@st.cache_resource
+def _site_scheduler() -> SiteScheduler:
+    return SiteScheduler()
+
+
+def load_site_calendars(year: int = 2025) -> dict[str, pd.DataFrame]:
+    """
+    Every site's planting calendar for ``year`` from the shared seeds
+    catalogue and rules, keyed by site id. Sites are rebuilt only when the
+    catalogue, the rules or their own record change.
+    """
+    # The catalogue is keyed by its files on disk, not by hashing every row;
+    # taken before loading, so a write in between only costs one rebuild
+    catalogue_key = file_signature(_seeds_files(year))
+    return _site_scheduler().calendars(
+        load_seeds_df(year), load_planting_rules(), load_sites(), year, catalogue_key=catalogue_key
+    )
+
+
+def load_site_seeds_df(site_id: str, year: int = 2025) -> pd.DataFrame:
+    """load_seeds_df() with Start/End Date moved to one site's frost dates."""
+    calendars = load_site_calendars(year)
+    return calendars.get(site_id, calendars[load_sites()[0]["id"]])
+
+
+def select_site(key: str = "site_id") -> dict:
+    """
+    Sidebar site picker; only shown when more than one site is defined. The
+    choice lives in ``st.session_state[key]`` so every page keeps it.
+    """
+    sites = load_sites()
+    by_id = {site["id"]: site for site in sites}
+    if st.session_state.get(key) not in by_id:
+        st.session_state[key] = sites[0]["id"]
+    if len(sites) > 1:
+        # Widget state is dropped on pages that don't render it; keep a plain copy
+        widget_key = f"{key}__widget"
+        st.session_state[widget_key] = st.session_state[key]
+
+        def remember():
+            st.session_state[key] = st.session_state[widget_key]
+
+        st.sidebar.selectbox(
+            "📍 Site", list(by_id), key=widget_key, on_change=remember,
+            format_func=lambda site_id: by_id[site_id]["name"],
+        )
+    return by_id[st.session_state[key]]
+
+
+# ─── Seasons ──────────────────────────────────────────────────────────────────
+def _season_files(years: tuple) -> list[Path]:
+    paths = []
+    for year in years:
+        harvests = harvest_csv_path(year)
+        paths += _watched(SEEDS_DIR / f"{year}-seeds.csv", harvests, edits_path(harvests))
+        paths += _progress_files(year)
+    return paths
+
+
+@file_cached(lambda year: _season_files((year,)))
+def _season_plants(year: int) -> pd.DataFrame:
+    return season_plants(load_seeds_df(year), load_progress(year))
+
+
+@file_cached(_season_files)
+def load_season_plants(years: tuple) -> pd.DataFrame:
+    """
+    Planned dates and progress of every season in ``years`` that has its own
+    seeds, stacked with a categorical ``Year`` (see utils/seasons.py). Each
+    season is built once and kept until its own files change.
+    """
+    available = set(season_years())
+    return stack_seasons({year: _season_plants(year) for year in years if year in available})
+
+
+@file_cached(_season_files)
+def load_season_harvests(years: tuple) -> pd.DataFrame:
+    """Harvest logs of ``years`` stacked with a categorical ``Year``."""
+    return stack_seasons({year: load_harvest_log(year) for year in years})
+
+
 # ─── Planting Progress ────────────────────────────────────────────────────────
 # Progress structure per plant (keyed by Display Name):
 # {
@@ -118,68 +432,76 @@ def save_planting_rules(rules: dict):
 #   }
 # }
 
-@st.cache_data(ttl=30)
+@st.cache_resource
+def _progress_store() -> ProgressStore:
+    return ProgressStore(PROGRESS_DIR)
+
+
+def _progress_files(year: int) -> list[Path]:
+    snapshot = PROGRESS_DIR / f"{year}_progress.json"
+    journal = PROGRESS_DIR / f"{year}_progress.journal"
+    return _watched(snapshot, journal, journal.with_suffix(".compacting"))
+
+
+@file_cached(_progress_files)
 def load_progress(year: int = 2025) -> dict:
     """Load planting progress from JSON for a specific year."""
-    progress_file = PROGRESS_DIR / f"{year}_progress.json"
-    if progress_file.exists():
-        with open(progress_file, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+    store = sqlite_store()
+    if store is not None:
+        return store.load_progress(year)
+    return _progress_store().load(year)
+
+
+@file_cached(lambda year: [
+    *_watched(GARDEN_BEDS_JSON, SEEDS_DIR / f"{year}-seeds.csv", SEEDS_DIR / "2025-seeds.csv"),
+    *_progress_files(year),
+])
+def load_bed_index(year: int = 2025) -> BedIndex:
+    """Shared plant ↔ bed index; rebuilt only when beds, seeds or progress change."""
+    return BedIndex(load_garden_beds(), load_seeds_df(year), load_progress(year))
 
 
 def save_progress(progress: dict, year: int = 2025):
     """Persist planting progress to JSON for a specific year."""
-    PROGRESS_DIR.mkdir(exist_ok=True)
-    progress_file = PROGRESS_DIR / f"{year}_progress.json"
-    with open(progress_file, "w", encoding="utf-8") as f:
-        json.dump(progress, f, indent=2, ensure_ascii=False)
-    load_progress.clear()
-
-
-def get_plant_status(display_name: str, progress: dict) -> dict:
-    """Return progress entry for a plant, with defaults."""
-    default = {
-        "start_status": "not_started",
-        "transplant_status": "not_started",
-        "start_actual": "",
-        "transplant_actual": "",
-        "notes": "",
-        "bed": "",
-    }
-    return {**default, **progress.get(display_name, {})}
-
-
-def bed_for_plant(seed_name: str, beds: list) -> str:
-    """Find which bed a seed family is assigned to (first match)."""
-    for bed in beds:
-        if seed_name in bed.get("plants", []):
-            return bed["name"]
-    return ""
-
-
-# STATUS display helpers
-STATUS_OPTIONS = ["not_started", "in_progress", "done", "skipped"]
-STATUS_LABELS = {
-    "not_started": "⬜ Not Started",
-    "in_progress": "🔄 In Progress",
-    "done": "✅ Done",
-    "skipped": "⏭️ Skipped",
-}
-STATUS_COLORS = {
-    "not_started": "#e0e0e0",
-    "in_progress": "#fff9c4",
-    "done": "#c8e6c9",
-    "skipped": "#f3e5f5",
-}
+    store = sqlite_store()
+    if store is not None:
+        # Only rows that differ from the database are upserted/deleted
+        store.save_progress(progress, year)
+    else:
+        _progress_store().save(progress, year)
+    load_progress.clear(year)
+
+
+def set_status(display_name: str, phase: str, value: str, year: int = 2025):
+    """Set one plant's ``start`` or ``transplant`` status without a full rewrite."""
+    if phase not in PHASES:
+        raise ValueError(f"phase must be one of {PHASES}, got {phase!r}")
+    bulk_set({display_name: {f"{phase}_status": value}}, year)
+
+
+def bulk_set(updates: dict, year: int = 2025):
+    """
+    Merge ``{display_name: {field: value}}`` into a year's progress as one
+    row-level write, invalidating only that year's cached progress.
+    """
+    if not updates:
+        return
+    store = sqlite_store()
+    if store is not None:
+        store.update_progress(updates, year)
+    else:
+        _progress_store().bulk_set(updates, year)
+    load_progress.clear(year)
 
 
 # ─── Seeds CSV persistence ─────────────────────────────────────────────────────
-def save_seeds_df(df: pd.DataFrame):
+def save_seeds_df(df: pd.DataFrame, year: int = 2025):
     """Save the seeds dataframe back to CSV."""
     save_df = df.copy()
     # Restore original column names before saving
-    save_df = save_df.rename(columns={"Start Date": "Start Indoors", "End Date": "Transplant / Sow"})
+    save_df = save_df.rename(
+        columns={"Start Date": "Start Indoors", "End Date": "Transplant / Sow"}
+    )
     # Split Display Name back into Seed + Variant if needed
     if "Display Name" in save_df.columns:
         save_df = save_df.drop(columns=["Display Name"], errors="ignore")
@@ -190,78 +512,15 @@ def save_seeds_df(df: pd.DataFrame):
             save_df[col] = dt_col.apply(
                 lambda d: f"{d.month}/{d.day}/{d.year}" if pd.notna(d) else ""
             )
-    save_df.to_csv(SEEDS_CSV, index=False)
+    store = sqlite_store()
+    if store is not None:
+        store.save_seeds(save_df, year)
+    else:
+        SEEDS_DIR.mkdir(parents=True, exist_ok=True)
+        save_df.to_csv(SEEDS_DIR / f"{year}-seeds.csv", index=False)
     reload_seeds()
 
 
-# ─── Spacing & Yield helpers ──────────────────────────────────────────────────
-def plants_per_sqft(spacing_in: float) -> float:
-    """Square-foot gardening: plants per sq ft based on plant spacing (inches)."""
-    if spacing_in <= 0:
-        return 0
-    return (12 / spacing_in) ** 2
-
-
-def plants_in_bed(bed_width_ft: float, bed_length_ft: float, spacing_in: float) -> int:
-    """Total plant count that fits in a rectangular bed."""
-    return int(math.floor(plants_per_sqft(spacing_in) * bed_width_ft * bed_length_ft))
-
-
-def get_plant_color(plant_name: str, companion_data: dict) -> str:
-    """Return a hex color for a plant, with fallback."""
-    colors = companion_data.get("plant_colors", {})
-    return colors.get(plant_name, "#78909c")
-
-
-def get_spacing(plant_name: str, companion_data: dict) -> dict:
-    """Return spacing guide entry for a plant."""
-    guide = companion_data.get("spacing_guide", {})
-    return guide.get(plant_name, {"spacing_in": 12, "row_spacing_in": 18, "depth_in": 0.5})
-
-
-def companion_relationship(plant_a: str, plant_b: str, companion_data: dict) -> str:
-    """Return 'good', 'bad', or 'neutral' for two plants."""
-    companions = companion_data.get("companions", {})
-    info_a = companions.get(plant_a, {})
-    if plant_b in info_a.get("good", []):
-        return "good"
-    if plant_b in info_a.get("bad", []):
-        return "bad"
-    info_b = companions.get(plant_b, {})
-    if plant_a in info_b.get("good", []):
-        return "good"
-    if plant_a in info_b.get("bad", []):
-        return "bad"
-    return "neutral"
-
-def calculate_planting_dates(plant_name: str, year: int, rules: dict) -> dict:
-    """Calculate planting dates for a plant based on rules and year."""
-    plant_rules = rules.get("planting_rules", {}).get(plant_name, {})
-    if not plant_rules:
-        return {"start_date": None, "end_date": None}
-
-    # Get last frost date for the location (simplified - in a real app this would be configurable)
-    # For Toronto area, last frost is typically around May 9
-    last_frost_date = pd.Timestamp(year=year, month=5, day=9)
-
-    start_date = None
-    end_date = None
-
-    # Calculate start date based on rules
-    if plant_rules.get("start_indoors_delta"):
-        start_date = last_frost_date + pd.Timedelta(days=plant_rules["start_indoors_delta"])
-    elif plant_rules.get("last_frost_delta"):
-        start_date = last_frost_date + pd.Timedelta(days=plant_rules["last_frost_delta"])
-
-    # Calculate end date based on rules
-    if plant_rules.get("transplant_delta"):
-        end_date = last_frost_date + pd.Timedelta(days=plant_rules["transplant_delta"])
-    elif plant_rules.get("last_frost_delta"):
-        end_date = last_frost_date + pd.Timedelta(days=plant_rules["last_frost_delta"])
-
-    return {"start_date": start_date, "end_date": end_date}
-
-
 # ─── Page config helper ───────────────────────────────────────────────────────
 def setup_page(title: str, icon: str = "🌱"):
     """Consistent page setup across all pages."""
@@ -322,3 +581,27 @@ def sidebar_nav():
     """Render consistent sidebar navigation branding."""
     st.sidebar.markdown('<div class="sidebar-logo">🌿 Verti Garden</div>', unsafe_allow_html=True)
     st.sidebar.markdown("---")
+
+
+def section_tabs(labels: list[str], key: str) -> str:
+    """
+    Tab strip that only renders the selected section.
+
+    ``st.tabs`` runs every tab body on every rerun; this returns the chosen
+    label so a page can call just that section (typically an ``st.fragment``,
+    so its own widgets rerun only that section).
+    """
+    last_key = f"{key}__last"
+    if key not in st.session_state:
+        st.session_state[key] = labels[0]
+
+    def keep_selection():
+        # Clicking the active option deselects it; stay on that section instead
+        if st.session_state[key] is None:
+            st.session_state[key] = st.session_state.get(last_key, labels[0])
+        st.session_state[last_key] = st.session_state[key]
+
+    choice = st.segmented_control(
+        "Section", labels, key=key, label_visibility="collapsed", on_change=keep_selection
+    )
+    return choice or labels[0]
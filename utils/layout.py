@@ -0,0 +1,285 @@
+"""
+Companion-aware bed layouts.
+
+A bed's plants are drawn in the ``core.bed_grid`` cells of that bed, in the
+order of its ``plants`` list (see the Garden Planner's bed diagram). A
+``BedLayout`` turns every bed's cells into slots with their neighbours
+(orthogonal neighbours count fully, diagonal ones half) and scores a layout
+as the sum, over neighbouring slots, of the two plants' companion weight:
++1 for good companions, ``-BAD_WEIGHT`` for bad ones. A plant in a cell too
+small for its ``spacing_in`` costs ``MISFIT_PENALTY``, and so does each
+extra copy of a plant in one bed (a bed lists a seed family once).
+
+``optimize`` improves a layout by simulated annealing over slot swaps. Each
+step proposes a batch of random swaps, scores all of them at once from the
+slot × neighbour arrays (a swap only changes the terms of its two slots, so
+its delta is two short rows of lookups), and applies every accepted swap
+whose neighbourhood (and, for a swap between beds, whose two beds) no
+other accepted swap touches.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.companions import BAD, GOOD, RELATIONSHIP_NAMES, CompanionIndex
+from utils.core import DEFAULT_SPACING_IN, bed_grid, plants_per_sqft
+
+BAD_WEIGHT = 4.0  # one bad neighbour outweighs several good ones
+DIAGONAL_WEIGHT = 0.5
+MISFIT_PENALTY = 100.0
+DUPLICATE_PENALTY = MISFIT_PENALTY
+
+# Row/column steps to the 8 neighbours of a cell and the weight of each
+_STEPS = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if (dr, dc) != (0, 0)]
+_STEP_WEIGHTS = np.array([1.0 if 0 in step else DIAGONAL_WEIGHT for step in _STEPS])
+
+
+def apportion(beds: list, n: int) -> np.ndarray:
+    """Split ``n`` plants over ``beds`` in proportion to bed area (largest remainder)."""
+    area = np.array([bed["width"] * bed["length"] for bed in beds], dtype=float)
+    if not len(area) or area.sum() <= 0:
+        return np.zeros(len(area), dtype=int)
+    share = n * area / area.sum()
+    counts = np.floor(share).astype(int)
+    counts[np.argsort(-(share - counts), kind="stable")[: n - counts.sum()]] += 1
+    return counts
+
+
+class BedLayout:
+    """
+    Slots of every bed with their neighbours, and the plants to place in
+    them; a layout is an int array giving each slot's plant.
+
+    By default each bed keeps as many slots as it lists plants, and the
+    listed plants are the ones placed. Passing ``plants`` places those
+    instead, with each bed's slots apportioned by area.
+    """
+
+    def __init__(self, beds: list, index: CompanionIndex, spacing_guide: dict, plants=None):
+        self.beds_in = beds
+        if plants is None:
+            counts = np.array([len(bed.get("plants", [])) for bed in beds], dtype=int)
+            plants = [p for bed in beds for p in bed.get("plants", [])]
+        else:
+            plants = list(plants)
+            counts = apportion(beds, len(plants))
+        self.counts = counts
+        self.n = int(counts.sum())
+
+        # Plant types: the weight matrix is types × types, plus an all-zero
+        # "nothing" row for the padding slot
+        self.types, plant_type = np.unique(np.array(plants, dtype=object), return_inverse=True)
+        codes = index.submatrix(list(self.types)).astype(float)
+        weights = np.where(codes == GOOD, 1.0, np.where(codes == BAD, -BAD_WEIGHT, 0.0))
+        self._none = len(self.types)
+        self.weights = np.zeros((self._none + 1, self._none + 1))
+        self.weights[: self._none, : self._none] = weights
+        self.initial = plant_type.astype(np.intp)
+
+        # Slots in bed order, row-major within a bed (the diagram's order)
+        bed_of, rows, cols, area = [], [], [], []
+        neighbours, nweights = [], []
+        self.bed_start = np.concatenate([[0], np.cumsum(counts)]).astype(np.intp)
+        for b, (bed, n) in enumerate(zip(beds, counts)):
+            if not n:
+                continue
+            n_cols, _, cell_w, cell_h = bed_grid(bed["width"], bed["length"], int(n))
+            k = np.arange(n)
+            r, c = k // n_cols, k % n_cols
+            bed_of.append(np.full(n, b))
+            rows.append(r)
+            cols.append(c)
+            area.append(np.full(n, cell_w * cell_h))
+            nb = np.full((n, len(_STEPS)), -1, dtype=np.intp)
+            for d, (dr, dc) in enumerate(_STEPS):
+                rr, cc = r + dr, c + dc
+                j = rr * n_cols + cc
+                ok = (rr >= 0) & (cc >= 0) & (cc < n_cols) & (j < n)
+                nb[ok, d] = self.bed_start[b] + j[ok]
+            neighbours.append(nb)
+            nweights.append(np.where(nb >= 0, _STEP_WEIGHTS, 0.0))
+        empty = np.array([], dtype=np.intp)
+        self.slot_bed = np.concatenate(bed_of) if bed_of else empty
+        self.slot_row = np.concatenate(rows) if rows else empty
+        self.slot_col = np.concatenate(cols) if cols else empty
+        slot_area = np.concatenate(area) if area else np.array([])
+        # Missing neighbours point at a padding slot that always holds "nothing"
+        self._pad = self.n
+        if neighbours:
+            nb, self.neighbour_weights = np.concatenate(neighbours), np.concatenate(nweights)
+        else:
+            nb = np.empty((0, len(_STEPS)), dtype=np.intp)
+            self.neighbour_weights = np.empty((0, len(_STEPS)))
+        self.neighbours = np.where(nb >= 0, nb, self._pad)
+
+        # Misfit cost of each type in each slot: the cell can't hold one plant
+        spacing = np.array(
+            [spacing_guide.get(t, {}).get("spacing_in", DEFAULT_SPACING_IN) for t in self.types],
+            dtype=float,
+        )
+        per_sqft = np.array([plants_per_sqft(s) for s in spacing])
+        self.misfit = np.zeros((self._none + 1, self.n))
+        cramped = per_sqft[:, None] * slot_area[None, :] < 1
+        self.misfit[: self._none] = np.where(cramped, MISFIT_PENALTY, 0.0)
+
+    # ─── Scoring ──────────────────────────────────────────────────────────────
+    def _padded(self, layout: np.ndarray) -> np.ndarray:
+        return np.append(layout, self._none)
+
+    def bed_counts(self, layout: np.ndarray) -> np.ndarray:
+        """Copies of each plant type per bed (beds × types)."""
+        counts = np.zeros((len(self.beds_in), self._none + 1), dtype=np.intp)
+        np.add.at(counts, (self.slot_bed, layout), 1)
+        return counts
+
+    def score(self, layout: np.ndarray) -> float:
+        """Companion score of ``layout`` minus penalties (higher is better)."""
+        x = self._padded(layout)
+        pair = self.weights[x[: self.n, None], x[self.neighbours]]
+        # Every neighbour pair is seen from both ends
+        companions = (pair * self.neighbour_weights).sum() / 2
+        duplicates = np.maximum(self.bed_counts(layout) - 1, 0).sum()
+        misfits = self.misfit[layout, np.arange(self.n)].sum()
+        return float(companions - misfits - DUPLICATE_PENALTY * duplicates)
+
+    def swap_deltas(self, layout: np.ndarray, a: np.ndarray, b: np.ndarray,
+                    bed_counts: np.ndarray | None = None) -> np.ndarray:
+        """
+        Score change of swapping slots ``a[i]`` and ``b[i]``, for each i
+        independently. ``bed_counts`` (from ``bed_counts(layout)``) saves
+        recounting when the caller keeps it up to date.
+        """
+        if bed_counts is None:
+            bed_counts = self.bed_counts(layout)
+        x = self._padded(layout)
+        ta, tb = x[a], x[b]
+        na, nb = self.neighbours[a], self.neighbours[b]
+        # The a–b edge itself is unchanged by the swap
+        wa = np.where(na == b[:, None], 0.0, self.neighbour_weights[a])
+        wb = np.where(nb == a[:, None], 0.0, self.neighbour_weights[b])
+        xa, xb = x[na], x[nb]
+        delta = (wa * (self.weights[tb[:, None], xa] - self.weights[ta[:, None], xa])).sum(axis=1)
+        delta += (wb * (self.weights[ta[:, None], xb] - self.weights[tb[:, None], xb])).sum(axis=1)
+        delta -= self.misfit[ta, b] + self.misfit[tb, a] - self.misfit[ta, a] - self.misfit[tb, b]
+        # Between beds, each plant may become (or stop being) a second copy
+        bed_a, bed_b = self.slot_bed[a], self.slot_bed[b]
+        moved = (bed_a != bed_b) & (ta != tb)
+        extra = (
+            (bed_counts[bed_b, ta] >= 1).astype(int) + (bed_counts[bed_a, tb] >= 1)
+            - (bed_counts[bed_a, ta] >= 2) - (bed_counts[bed_b, tb] >= 2)
+        )
+        delta -= np.where(moved, DUPLICATE_PENALTY * extra, 0.0)
+        return delta
+
+    # ─── Search ───────────────────────────────────────────────────────────────
+    def optimize(self, layout: np.ndarray | None = None, steps: int = 2000, batch: int = 256,
+                 move_between_beds: bool = True, t_start: float = 2.0, t_end: float = 0.02,
+                 seed: int = 0) -> np.ndarray:
+        """
+        Best layout found by annealing from ``layout`` (the beds' current
+        one by default). With ``move_between_beds`` off every plant stays in
+        its bed and only the arrangement inside each bed changes.
+        """
+        x = (self.initial if layout is None else layout).copy()
+        if self.n < 2:
+            return x
+        rng = np.random.default_rng(seed)
+        batch = max(1, min(batch, self.n // 2))
+        sizes = np.diff(self.bed_start)
+        score = best_score = self.score(x)
+        best = x.copy()
+        counts = self.bed_counts(x)
+        for temperature in np.geomspace(t_start, t_end, steps):
+            a = rng.integers(0, self.n, batch)
+            # Half the proposals stay inside a's bed; the rest go anywhere
+            bed = self.slot_bed[a]
+            local = self.bed_start[bed] + (rng.random(batch) * sizes[bed]).astype(np.intp)
+            if move_between_beds:
+                b = np.where(rng.random(batch) < 0.5, local, rng.integers(0, self.n, batch))
+            else:
+                b = local
+            delta = self.swap_deltas(x, a, b, counts)
+            accept = (a != b) & (x[a] != x[b])
+            accept &= (delta > 0) | (rng.random(batch) < np.exp(np.minimum(delta, 0) / temperature))
+            if not accept.any():
+                continue
+            a, b, delta = a[accept], b[accept], delta[accept]
+            keep = self._independent(a, b)
+            a, b = a[keep], b[keep]
+            ta, tb, bed_a, bed_b = x[a], x[b], self.slot_bed[a], self.slot_bed[b]
+            np.add.at(counts, (bed_a, ta), -1)
+            np.add.at(counts, (bed_b, ta), 1)
+            np.add.at(counts, (bed_b, tb), -1)
+            np.add.at(counts, (bed_a, tb), 1)
+            x[a], x[b] = tb, ta
+            score += delta[keep].sum()
+            if score > best_score + 1e-9:
+                best_score, best = score, x.copy()
+        return best
+
+    def _independent(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Swaps whose slots and neighbours no other swap in the batch touches;
+        a swap between beds also claims both beds (their plant counts).
+        """
+        bed_a, bed_b = self.slot_bed[a], self.slot_bed[b]
+        between = bed_a != bed_b
+        # Beds are numbered after the slots (and the padding slot) in one key space
+        claims = np.where(between, self.n + 1 + np.stack([bed_a, bed_b]), self._pad).T
+        region = np.concatenate(
+            [a[:, None], b[:, None], self.neighbours[a], self.neighbours[b], claims], axis=1
+        )
+        size = self.n + 1 + len(self.beds_in)
+        # (swap, key) pairs, each once, as single integers
+        keys = np.unique(np.repeat(np.arange(len(a)), region.shape[1]) * size + region.ravel())
+        swap, key = np.divmod(keys, size)
+        shared = np.bincount(key, minlength=size) > 1
+        shared[self._pad] = False
+        return np.bincount(swap, weights=shared[key], minlength=len(a)) == 0
+
+    # ─── Results ──────────────────────────────────────────────────────────────
+    def frame(self, layout: np.ndarray) -> pd.DataFrame:
+        """One row per slot: Bed, Row, Col, Plant."""
+        return pd.DataFrame({
+            "Bed": [self.beds_in[b]["name"] for b in self.slot_bed],
+            "Row": self.slot_row,
+            "Col": self.slot_col,
+            "Plant": self.types[layout] if self.n else [],
+        })
+
+    def beds(self, layout: np.ndarray) -> list[dict]:
+        """Copies of the beds with ``plants`` in slot order, as the diagram draws them."""
+        names = self.types[layout] if self.n else []
+        return [
+            {**bed, "plants": [str(p) for p in names[self.bed_start[b]:self.bed_start[b + 1]]]}
+            for b, bed in enumerate(self.beds_in)
+        ]
+
+    def adjacencies(self, layout: np.ndarray) -> pd.DataFrame:
+        """Neighbouring non-neutral plant pairs: Bed, Plant A, Plant B, Relationship."""
+        x = self._padded(layout)
+        slot = np.repeat(np.arange(self.n), self.neighbours.shape[1])
+        other = self.neighbours.ravel()
+        # Each pair once: real neighbours with a higher slot number
+        keep = (other != self._pad) & (other > slot)
+        slot, other = slot[keep], other[keep]
+        weight = self.weights[x[slot], x[other]]
+        keep = weight != 0
+        slot, other, weight = slot[keep], other[keep], weight[keep]
+        return pd.DataFrame({
+            "Bed": [self.beds_in[b]["name"] for b in self.slot_bed[slot]],
+            "Plant A": self.types[x[slot]] if len(slot) else [],
+            "Plant B": self.types[x[other]] if len(slot) else [],
+            "Relationship": [RELATIONSHIP_NAMES[GOOD if w > 0 else BAD] for w in weight],
+        })
+
+    def summary(self, layout: np.ndarray) -> dict:
+        """Score plus counts of good and bad neighbour pairs, misfits and duplicates."""
+        rel = self.adjacencies(layout)["Relationship"]
+        return {
+            "score": self.score(layout),
+            "good": int((rel == "good").sum()),
+            "bad": int((rel == "bad").sum()),
+            "misfits": int((self.misfit[layout, np.arange(self.n)] > 0).sum()),
+            "duplicates": int(np.maximum(self.bed_counts(layout) - 1, 0).sum()),
+        }
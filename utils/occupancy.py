@@ -0,0 +1,270 @@
+"""
+Bed occupancy over a season.
+
+A planting holds one slot of its bed from going in (``End Date``: the
+transplant or direct-sow date) until harvest, ``days_to_harvest`` later, or
+until the season end when the catalogue gives no days. A bed has one slot per
+seed family it lists, the cells of the bed diagram.
+
+``BedOccupancy`` lays out every assigned variety and chains succession
+sowings into the slot each planting frees, as long as the bed has a free
+slot for the whole of the next sowing. Over-allocation is found with a sweep
+line: every bed's start (+1) and end (-1) events sorted once by bed and day
+(ends first on a tie, so back-to-back plantings share a slot), and a running
+sum giving the occupied slots between consecutive events. Everything is
+O(n log n) in the number of plantings.
+"""
+
+import datetime
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from utils.beds import BedIndex
+from utils.seed_order import DEFAULT_MAX_SOWINGS, days_to_harvest, sowings
+
+PLANTING_COLUMNS = ["Bed", "Plant", "Seed", "Sowing", "Start", "End", "Lane"]
+CONFLICT_COLUMNS = ["Bed", "From", "To", "Occupied", "Slots", "Plants"]
+
+
+def _range_max(values: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """``values[lo[i]:hi[i]].max()`` for every i (all ranges non-empty), via a sparse table."""
+    table = [values]
+    width = 1
+    while 2 * width <= len(values):
+        prev = table[-1]
+        table.append(np.maximum(prev[:-width], prev[width:]))
+        width *= 2
+    level = np.floor(np.log2(hi - lo)).astype(np.intp)
+    out = np.empty(len(lo), dtype=values.dtype)
+    for k in np.unique(level):
+        sel = level == k
+        row = table[k]
+        out[sel] = np.maximum(row[lo[sel]], row[hi[sel] - (1 << k)])
+    return out
+
+
+class _Sweep:
+    """Occupied slots per bed between consecutive start/end events."""
+
+    def __init__(self, bed: np.ndarray, start: np.ndarray, end: np.ndarray):
+        time = np.concatenate([start, end])
+        delta = np.concatenate([np.ones(len(start), np.int64), -np.ones(len(end), np.int64)])
+        beds = np.concatenate([bed, bed])
+        order = np.lexsort((delta, time, beds))
+        self.bed, self.time = beds[order], time[order]
+        # Each bed's events sum to zero, so one running sum serves every bed
+        self.count = np.cumsum(delta[order])
+        # (bed, day) as one sortable integer for searching; query days are
+        # clipped to just outside the events' range so they stay in their bed
+        self._t0 = int(self.time.min()) - 1 if len(self.time) else 0
+        self._span = int(self.time.max()) - self._t0 + 2 if len(self.time) else 1
+        self._key = self.bed * self._span + (self.time - self._t0)
+
+    def _search(self, bed: np.ndarray, day: np.ndarray, side: str) -> np.ndarray:
+        offset = np.clip(day - self._t0, 0, self._span - 1)
+        return np.searchsorted(self._key, bed * self._span + offset, side=side)
+
+    def peak(self, bed: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+        """Most slots occupied in ``bed`` at any time in ``[start, end)``, for each query."""
+        if not len(self.time):
+            return np.zeros(len(bed), dtype=np.int64)
+        # The count in force at ``start`` comes from the last event at or before it
+        lo = self._search(bed, start, "right") - 1
+        hi = self._search(bed, end, "left")
+        before = (lo < 0) | (self.bed[np.maximum(lo, 0)] != bed)
+        # No earlier event in this bed: nothing occupied until its first event
+        lo = np.where(before, lo + 1, lo)
+        peak = np.zeros(len(bed), dtype=np.int64)
+        has = lo < hi
+        if has.any():
+            peak[has] = _range_max(self.count, lo[has], hi[has])
+        return peak
+
+
+class BedOccupancy:
+    """
+    Every planting of a season's assigned varieties, with succession sowings,
+    as intervals in bed slots.
+
+    ``seeds`` is one site's calendar for the year (sow or transplant date in
+    ``End Date``); ``bed_index`` puts varieties in beds. Varieties without a
+    bed or a date are left out.
+    """
+
+    def __init__(self, seeds: pd.DataFrame, beds: list, bed_index: BedIndex,
+                 season_end: datetime.date, max_sowings: int = DEFAULT_MAX_SOWINGS):
+        self.bed_names = [bed["name"] for bed in beds]
+        self.slots = np.array(
+            [max(1, len(set(bed.get("plants", [])))) for bed in beds], dtype=np.int64,
+        )
+        self.season_end = np.datetime64(season_end, "D")
+
+        rows = seeds.drop_duplicates("Display Name")
+        assigned = bed_index.assign(rows["Display Name"])
+        bed = pd.Categorical(assigned, categories=self.bed_names).codes
+        start = rows["End Date"].to_numpy("datetime64[D]")
+        days = days_to_harvest(rows).to_numpy(float)
+        keep = (bed >= 0) & ~np.isnat(start) & (start < self.season_end)
+        bed, start, days = bed[keep].astype(np.int64), start[keep], days[keep]
+        self._plant = rows["Display Name"].to_numpy(object)[keep]
+        self._seed = rows["Seed"].astype(str).to_numpy(object)[keep]
+
+        # Without days to harvest a planting holds its slot to the season end
+        timed = days > 0
+        day0 = start.astype(np.int64)
+        end0 = np.where(
+            timed, day0 + np.nan_to_num(days).astype(np.int64), self.season_end.astype(np.int64),
+        )
+        base = _Sweep(bed, day0, end0)
+
+        # Candidate successions: sowing k re-sows in the slot sowing k - 1 frees
+        n_sowings = np.where(
+            timed, sowings(pd.Series(start), pd.Series(days), season_end, max_sowings), 1
+        )
+        extra = n_sowings - 1
+        who = np.repeat(np.arange(len(bed)), extra)
+        k = np.arange(len(who)) - np.repeat(np.cumsum(extra) - extra, extra) + 2
+        step = np.nan_to_num(days).astype(np.int64)[who]
+        s = day0[who] + (k - 1) * step
+        e = s + step
+        keep = self._fill(bed[who], who, s, e, base.peak(bed[who], s, e))
+
+        self.bed = np.concatenate([bed, bed[who][keep]])
+        self.start = np.concatenate([day0, s[keep]])
+        self.end = np.concatenate([end0, e[keep]])
+        self.sowing = np.concatenate([np.ones(len(bed), np.int64), k[keep]])
+        self.source = np.concatenate([np.arange(len(bed)), who[keep]])
+        self.sweep = _Sweep(self.bed, self.start, self.end)
+
+    def _fill(self, bed, chain, start, end, base_peak) -> np.ndarray:
+        """
+        Which succession candidates to sow. Going through each bed's
+        candidates by start day, one is sown when the slots taken over its
+        run (the base plan's peak plus the successions already sown and still
+        growing at its start) leave one free; a chain stops at its first
+        candidate that doesn't fit.
+        """
+        keep = np.zeros(len(chain), dtype=bool)
+        stopped = set()
+        growing: list = []  # end days of the current bed's sown successions
+        current = None
+        for i in np.lexsort((start, bed)):
+            if bed[i] != current:
+                current, growing = bed[i], []
+            if chain[i] in stopped:
+                continue
+            while growing and growing[0] <= start[i]:
+                heapq.heappop(growing)
+            if base_peak[i] + len(growing) < self.slots[bed[i]]:
+                keep[i] = True
+                heapq.heappush(growing, end[i])
+            else:
+                stopped.add(chain[i])
+        return keep
+
+    # ─── Results ──────────────────────────────────────────────────────────────
+    def _dates(self, days: np.ndarray) -> np.ndarray:
+        return days.astype("datetime64[D]").astype("datetime64[ns]")
+
+    def lanes(self) -> np.ndarray:
+        """
+        Slot lane of each planting: per bed, each planting takes the lowest
+        lane free at its start (interval partitioning). Lanes at or beyond the
+        bed's slots are over-allocated.
+        """
+        lane = np.empty(len(self.bed), dtype=np.int64)
+        order = np.lexsort((self.end, self.start, self.bed))
+        busy: list = []  # (end, lane) in use
+        free: list = []
+        current = None
+        for i in order:
+            if self.bed[i] != current:
+                current, busy, free = self.bed[i], [], []
+            while busy and busy[0][0] <= self.start[i]:
+                heapq.heappush(free, heapq.heappop(busy)[1])
+            lane[i] = heapq.heappop(free) if free else len(busy)
+            heapq.heappush(busy, (self.end[i], lane[i]))
+        return lane
+
+    def plantings(self) -> pd.DataFrame:
+        """One row per planting: Bed, Plant, Seed, Sowing (1 = main), Start, End, Lane."""
+        names = np.array(self.bed_names, dtype=object)
+        frame = pd.DataFrame({
+            "Bed": names[self.bed] if len(self.bed) else [],
+            "Plant": self._plant[self.source],
+            "Seed": self._seed[self.source],
+            "Sowing": self.sowing,
+            "Start": self._dates(self.start),
+            "End": self._dates(self.end),
+            "Lane": self.lanes(),
+        }, columns=PLANTING_COLUMNS)
+        return frame.sort_values(["Bed", "Lane", "Start"], kind="stable").reset_index(drop=True)
+
+    def conflicts(self) -> pd.DataFrame:
+        """
+        Spans where a bed holds more plantings than it has slots: Bed, From,
+        To, the most plantings at once, its Slots and the Plants involved.
+        """
+        sw = self.sweep
+        if not len(sw.time):
+            return pd.DataFrame(columns=CONFLICT_COLUMNS)
+        # Between event i and i + 1 of the same bed, ``count[i]`` slots are taken
+        nxt = np.append(sw.time[1:], sw.time[-1])
+        same_bed = np.append(sw.bed[1:] == sw.bed[:-1], False)
+        over = same_bed & (nxt > sw.time) & (sw.count > self.slots[sw.bed])
+        idx = np.flatnonzero(over)
+        if not len(idx):
+            return pd.DataFrame(columns=CONFLICT_COLUMNS)
+        # Merge touching over-allocated segments of a bed into one span
+        new_span = np.r_[
+            True, (sw.bed[idx[1:]] != sw.bed[idx[:-1]]) | (sw.time[idx[1:]] != nxt[idx[:-1]])
+        ]
+        first, last = idx[new_span], idx[np.r_[new_span[1:], True]]
+        peak = np.maximum.reduceat(sw.count[idx], np.flatnonzero(new_span))
+        # Plantings grouped by bed, so each span only scans its own bed's
+        by_bed = np.argsort(self.bed, kind="stable")
+        bounds = np.searchsorted(self.bed[by_bed], np.arange(len(self.bed_names) + 1))
+        rows = []
+        for b, t0, t1, p in zip(sw.bed[first], sw.time[first], nxt[last], peak):
+            own = by_bed[bounds[b]:bounds[b + 1]]
+            involved = own[(self.start[own] < t1) & (self.end[own] > t0)]
+            rows.append({
+                "Bed": self.bed_names[b],
+                "From": self._dates(np.array([t0]))[0],
+                "To": self._dates(np.array([t1]))[0],
+                "Occupied": int(p),
+                "Slots": int(self.slots[b]),
+                "Plants": ", ".join(sorted(set(self._plant[self.source[involved]]))),
+            })
+        return pd.DataFrame(rows, columns=CONFLICT_COLUMNS)
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Per bed: Slots, Plantings, Successions, Peak plantings at once and
+        Utilization (% of slot-days in use from the first planting to the
+        season end).
+        """
+        n = len(self.bed_names)
+        sw = self.sweep
+        peak = np.zeros(n, dtype=np.int64)
+        if len(sw.time):
+            np.maximum.at(peak, sw.bed, sw.count)
+        start = np.full(n, self.season_end.astype(np.int64))
+        np.minimum.at(start, self.bed, self.start)
+        grown = np.minimum(self.end, self.season_end.astype(np.int64)) - self.start
+        used = np.bincount(self.bed, weights=grown, minlength=n)
+        window = (self.season_end.astype(np.int64) - start) * self.slots
+        with np.errstate(divide="ignore", invalid="ignore"):
+            utilization = np.where(window > 0, 100 * used / window, 0.0)
+        return pd.DataFrame({
+            "Bed": self.bed_names,
+            "Slots": self.slots,
+            "Plantings": np.bincount(self.bed, minlength=n),
+            "Successions": (
+                np.bincount(self.bed, weights=self.sowing > 1, minlength=n).astype(np.int64)
+            ),
+            "Peak": peak,
+            "Utilization %": utilization.round(1),
+        })
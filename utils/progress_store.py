@@ -0,0 +1,154 @@
+"""
+Row-level planting-progress persistence for the file backend.
+
+Each year keeps its full ``{year}_progress.json`` snapshot plus a compact
+delta journal ``{year}_progress.journal`` of JSON lines, one per changed
+plant (``{"n": display_name, "f": {field: value, ...}}``). Status edits
+append to the journal (one small fsync'd write) instead of re-dumping the
+whole snapshot; once the journal reaches ``compact_every`` lines it is folded
+back into the snapshot with an atomic rename. Replaying a journal line is
+idempotent, so a crash mid-compaction loses nothing.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+PHASES = ("start", "transplant")
+
+
+class ProgressStore:
+    """Snapshot + delta-journal progress files under ``progress_dir``."""
+
+    def __init__(self, progress_dir: Path, compact_every: int = 200):
+        self.progress_dir = Path(progress_dir)
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._journal_lines: dict[int, int] = {}
+
+    def _snapshot(self, year: int) -> Path:
+        return self.progress_dir / f"{year}_progress.json"
+
+    def _journal(self, year: int) -> Path:
+        return self.progress_dir / f"{year}_progress.journal"
+
+    # ─── Reading ──────────────────────────────────────────────────────────────
+    def load(self, year: int) -> dict:
+        """Snapshot for ``year`` with every journaled delta applied."""
+        with self._lock:
+            return self._load(year)
+
+    def _load(self, year: int) -> dict:
+        snapshot = self._snapshot(year)
+        progress = {}
+        if snapshot.exists():
+            with open(snapshot, "r", encoding="utf-8") as f:
+                progress = json.load(f)
+        lines = 0
+        for journal in (self._journal(year).with_suffix(".compacting"), self._journal(year)):
+            lines += _replay(journal, progress)
+        self._journal_lines[year] = lines
+        return progress
+
+    # ─── Writing ──────────────────────────────────────────────────────────────
+    def set_status(self, display_name: str, phase: str, value: str, year: int):
+        """Set ``start_status`` or ``transplant_status`` for one plant."""
+        if phase not in PHASES:
+            raise ValueError(f"phase must be one of {PHASES}, got {phase!r}")
+        self.bulk_set({display_name: {f"{phase}_status": value}}, year)
+
+    def bulk_set(self, updates: dict, year: int):
+        """
+        Merge ``{display_name: {field: value}}`` into the year's progress with
+        a single journal append.
+        """
+        if not updates:
+            return
+        body = "".join(
+            json.dumps({"n": name, "f": fields}, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for name, fields in updates.items()
+        )
+        with self._lock:
+            self.progress_dir.mkdir(parents=True, exist_ok=True)
+            journal = self._journal(year)
+            with open(journal, "ab") as f:
+                size = f.seek(0, os.SEEK_END)
+                data = body.encode("utf-8")
+                if size and not _ends_with_newline(journal):
+                    data = b"\n" + data
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            if year not in self._journal_lines:
+                self._load(year)
+            else:
+                self._journal_lines[year] += len(updates)
+            if self._journal_lines[year] >= self.compact_every:
+                self._compact(year)
+
+    def save(self, progress: dict, year: int):
+        """Replace the whole year's progress (also discards its journal)."""
+        with self._lock:
+            self.progress_dir.mkdir(parents=True, exist_ok=True)
+            self._write_snapshot(progress, year)
+            self._journal(year).unlink(missing_ok=True)
+            self._journal(year).with_suffix(".compacting").unlink(missing_ok=True)
+            self._journal_lines[year] = 0
+
+    def compact(self, year: int):
+        """Fold the year's journal into its snapshot."""
+        with self._lock:
+            self._compact(year)
+
+    def _compact(self, year: int):
+        journal = self._journal(year)
+        compacting = journal.with_suffix(".compacting")
+        if journal.exists() and not compacting.exists():
+            # New appends start a fresh journal while this one is folded in
+            os.replace(journal, compacting)
+        progress = self._load(year)
+        self._write_snapshot(progress, year)
+        compacting.unlink(missing_ok=True)
+        self._journal_lines[year] = _count_lines(journal)
+
+    def _write_snapshot(self, progress: dict, year: int):
+        snapshot = self._snapshot(year)
+        tmp = snapshot.with_name(f".{snapshot.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(progress, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, snapshot)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+
+def _replay(journal: Path, progress: dict) -> int:
+    """Apply journal lines to ``progress`` in place; return lines applied."""
+    if not journal.exists():
+        return 0
+    applied = 0
+    with open(journal, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                delta = json.loads(line)
+            except ValueError:
+                continue  # torn final line from an interrupted write
+            progress[delta["n"]] = {**progress.get(delta["n"], {}), **delta["f"]}
+            applied += 1
+    return applied
+
+
+def _ends_with_newline(path: Path) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def _count_lines(path: Path) -> int:
+    if not path.exists():
+        return 0
+    with open(path, "rb") as f:
+        return sum(1 for _ in f)
@@ -0,0 +1,180 @@
+"""
+Vectorized planting dates from planting_rules.json.
+
+A rule gives each plant day offsets from the last frost date
+(``start_indoors_delta`` / ``transplant_delta``, falling back to
+``last_frost_delta``); a frost table gives the last frost date of every
+(site, year) slot. Dates for all plants × slots are one broadcast add of
+``datetime64[D]`` arrays.
+
+``ScheduleEngine`` keeps the resulting start/end matrices between calls and,
+on ``update``, recomputes only the rows whose rule changed and the columns
+whose frost date changed, so editing one rule across dozens of sites touches
+one row.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Toronto-area average last frost, used when no site frost table is given
+DEFAULT_LAST_FROST = (5, 9)
+DEFAULT_SITE = "default"
+
+_NAT = np.datetime64("NaT", "D")
+
+
+def default_frost_table(years) -> pd.DataFrame:
+    """Frost table for the single default site in each of ``years``."""
+    month, day = DEFAULT_LAST_FROST
+    return pd.DataFrame({
+        "Site": DEFAULT_SITE,
+        "Year": list(years),
+        "Last Frost": [pd.Timestamp(year=y, month=month, day=day) for y in years],
+    })
+
+
+def _delta(rule: dict, field: str) -> float:
+    # Missing, None and 0 all mean "not set", as in the rule editor
+    value = rule.get(field)
+    return float(value) if value else np.nan
+
+
+def rule_offsets(plant_rules: dict) -> pd.DataFrame:
+    """
+    Start/end offsets in days from last frost, one row per rule (NaN = none).
+
+    Start uses ``start_indoors_delta``, else ``last_frost_delta``; end uses
+    ``transplant_delta``, else ``last_frost_delta``.
+    """
+    names = list(plant_rules)
+    start_indoors = np.array([_delta(plant_rules[n], "start_indoors_delta") for n in names])
+    transplant = np.array([_delta(plant_rules[n], "transplant_delta") for n in names])
+    last_frost = np.array([_delta(plant_rules[n], "last_frost_delta") for n in names])
+    return pd.DataFrame(
+        {
+            "start": np.where(np.isnan(start_indoors), last_frost, start_indoors),
+            "end": np.where(np.isnan(transplant), last_frost, transplant),
+        },
+        index=pd.Index(names, name="Plant"),
+    )
+
+
+def _add_days(frost: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """``frost[None, :] + offsets[:, None]`` as datetime64[D], NaT where offset is NaN."""
+    out = np.full((len(offsets), len(frost)), _NAT)
+    known = ~np.isnan(offsets)
+    out[known] = frost[None, :] + offsets[known].astype("int64")[:, None].astype("timedelta64[D]")
+    return out
+
+
+class ScheduleEngine:
+    """Plants × (site, year) start/end dates kept up to date incrementally."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._plants: list[str] = []
+        self._seen: dict[str, dict] = {}
+        self._offsets = pd.DataFrame(columns=["start", "end"], dtype=float)
+        self._slots: list[tuple] = []
+        self._frost = np.array([], dtype="datetime64[D]")
+        self._start = np.empty((0, 0), dtype="datetime64[D]")
+        self._end = np.empty((0, 0), dtype="datetime64[D]")
+        self.last_update = {"rules": 0, "slots": 0}
+
+    def update(self, rules: dict, frost: pd.DataFrame) -> "ScheduleEngine":
+        """
+        Bring the matrices in line with ``rules`` (planting_rules.json shape)
+        and ``frost`` (``Site``, ``Year``, ``Last Frost`` columns, one row per
+        site and year).
+
+        ``last_update`` records how many rule rows and slot columns were
+        recomputed.
+        """
+        plant_rules = rules.get("planting_rules", {})
+        slots = list(zip(frost["Site"], frost["Year"]))
+        frost_days = pd.to_datetime(frost["Last Frost"]).to_numpy().astype("datetime64[D]")
+
+        with self._lock:
+            plants = list(plant_rules)
+            # Rule values are scalars, so a shallow copy is a full snapshot
+            changed = [n for n in plants if self._seen.get(n) != plant_rules[n]]
+            old_frost = dict(zip(self._slots, self._frost))
+            stale_slots = [
+                j for j, (slot, day) in enumerate(zip(slots, frost_days))
+                if old_frost.get(slot) != day
+            ]
+
+            if plants == self._plants and slots == self._slots:
+                offsets, start, end = self._offsets, self._start, self._end
+            else:
+                offsets, start, end = self._reshaped(plants, slots, set(changed), set(stale_slots))
+            if changed:
+                offsets.loc[changed] = rule_offsets({n: plant_rules[n] for n in changed}).to_numpy()
+
+            start_off = offsets["start"].to_numpy(float)
+            end_off = offsets["end"].to_numpy(float)
+            if stale_slots:
+                start[:, stale_slots] = _add_days(frost_days[stale_slots], start_off)
+                end[:, stale_slots] = _add_days(frost_days[stale_slots], end_off)
+            cols = sorted(set(range(len(slots))) - set(stale_slots))
+            if changed and cols:
+                position = {n: i for i, n in enumerate(plants)}
+                idx = [position[n] for n in changed]
+                start[np.ix_(idx, cols)] = _add_days(frost_days[cols], start_off[idx])
+                end[np.ix_(idx, cols)] = _add_days(frost_days[cols], end_off[idx])
+
+            for n in changed:
+                self._seen[n] = dict(plant_rules[n])
+            for n in set(self._seen) - set(plant_rules):
+                del self._seen[n]
+            self._plants, self._offsets = plants, offsets
+            self._slots, self._frost = slots, frost_days
+            self._start, self._end = start, end
+            self.last_update = {"rules": len(changed), "slots": len(stale_slots)}
+        return self
+
+    def _reshaped(self, plants, slots, changed: set, stale: set):
+        """
+        Offsets and date matrices resized to ``plants`` × ``slots``, keeping
+        every cell whose rule and frost date are both unchanged.
+        """
+        offsets = self._offsets.reindex(plants)
+        start = np.full((len(plants), len(slots)), _NAT)
+        end = np.full((len(plants), len(slots)), _NAT)
+        old_row = {n: i for i, n in enumerate(self._plants)}
+        old_col = {s: j for j, s in enumerate(self._slots)}
+        rows = [i for i, n in enumerate(plants) if n not in changed]
+        cols = [j for j in range(len(slots)) if j not in stale]
+        if rows and cols:
+            src = np.ix_([old_row[plants[i]] for i in rows], [old_col[slots[j]] for j in cols])
+            start[np.ix_(rows, cols)] = self._start[src]
+            end[np.ix_(rows, cols)] = self._end[src]
+        return offsets, start, end
+
+    def frame(self) -> pd.DataFrame:
+        """Long table: Plant, Site, Year, Start Date, End Date."""
+        with self._lock:
+            n_plants, n_slots = self._start.shape
+            sites = [s for s, _ in self._slots]
+            years = [y for _, y in self._slots]
+            return pd.DataFrame({
+                "Plant": np.repeat(np.array(self._plants, dtype=object), n_slots),
+                "Site": np.tile(np.array(sites, dtype=object), n_plants),
+                "Year": np.tile(np.array(years), n_plants),
+                "Start Date": self._start.reshape(-1).astype("datetime64[ns]"),
+                "End Date": self._end.reshape(-1).astype("datetime64[ns]"),
+            })
+
+    def dates(self, site, year) -> pd.DataFrame:
+        """Start/End Date per plant for one slot, indexed by plant."""
+        with self._lock:
+            j = self._slots.index((site, year))
+            return pd.DataFrame(
+                {
+                    "Start Date": self._start[:, j].astype("datetime64[ns]"),
+                    "End Date": self._end[:, j].astype("datetime64[ns]"),
+                },
+                index=pd.Index(self._plants, name="Plant"),
+            )
@@ -0,0 +1,119 @@
+"""
+Multi-season frames for cross-year comparisons.
+
+Each season's seeds, progress and harvests are loaded (and cached) one year
+at a time by utils.helpers. The functions here stack those per-year frames
+into one long frame with ``Year`` as an ordered categorical first column, so
+a cross-year comparison is one groupby over already-parsed data instead of
+re-reading every season on each page view.
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from utils.core import STATUS_OPTIONS
+from utils.tasks import progress_frame
+
+PLANT_COLUMNS = ["Display Name", "Seed", "Planting Method", "Start Date", "End Date"]
+# Shared categories so statuses stay categorical once seasons are stacked
+STATUS_DTYPE = pd.CategoricalDtype(STATUS_OPTIONS)
+
+
+def stack_seasons(frames: Mapping[int, pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate ``{year: frame}`` with a leading categorical ``Year`` column."""
+    years = sorted(frames)
+    dtype = pd.CategoricalDtype(years, ordered=True)
+    # Empty seasons stay in the categories but not in the concat (their
+    # all-NA columns would otherwise decide the result dtypes)
+    parts = [(i, frames[y]) for i, y in enumerate(years) if len(frames[y])]
+    if not parts:
+        empty = frames[years[0]].iloc[0:0] if years else pd.DataFrame()
+        return empty.assign(Year=pd.Categorical([], dtype=dtype))[["Year", *empty.columns]]
+    out = pd.concat([p for _, p in parts], ignore_index=True)
+    codes = np.repeat([i for i, _ in parts], [len(p) for _, p in parts])
+    out.insert(0, "Year", pd.Categorical.from_codes(codes, dtype=dtype))
+    return out
+
+
+def season_plants(seeds: pd.DataFrame, progress: dict) -> pd.DataFrame:
+    """
+    One season's plants: planned dates from ``seeds`` plus progress statuses
+    and actual dates (``Start Actual`` / ``Transplant Actual``, NaT if unset).
+    """
+    plants = seeds.reindex(columns=PLANT_COLUMNS).reset_index(drop=True)
+    for col in ("Seed", "Planting Method"):
+        plants[col] = plants[col].astype(object)
+    ps = progress_frame(progress, plants["Display Name"]).reset_index(drop=True)
+    plants["Start Status"] = ps["start_status"].astype(STATUS_DTYPE).to_numpy()
+    plants["Transplant Status"] = ps["transplant_status"].astype(STATUS_DTYPE).to_numpy()
+    plants["Start Actual"] = pd.to_datetime(ps["start_actual"], errors="coerce").to_numpy()
+    plants["Transplant Actual"] = pd.to_datetime(
+        ps["transplant_actual"], errors="coerce"
+    ).to_numpy()
+    return plants
+
+
+# ─── Comparisons ──────────────────────────────────────────────────────────────
+def yield_by_year(harvests: pd.DataFrame) -> pd.DataFrame:
+    """Harvested kg per plant (rows) and year (columns), plus a Total column."""
+    if harvests.empty:
+        return pd.DataFrame()
+    qty = pd.to_numeric(harvests["Quantity_kg"], errors="coerce")
+    table = (
+        qty.groupby([harvests["Plant"], harvests["Year"]], observed=False).sum()
+        .unstack("Year", fill_value=0.0)
+    )
+    table["Total"] = table.sum(axis=1)
+    return table.sort_values("Total", ascending=False)
+
+
+def completion_rates(plants: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per year: number of plants and the share whose start / transplant step is
+    done. Skipped steps are left out of both the count and the share.
+    """
+    rows = {}
+    for phase, col in (("Started", "Start Status"), ("Transplanted", "Transplant Status")):
+        status = plants[col]
+        counted = status.ne("skipped")
+        done = status.eq("done") & counted
+        by_year = (
+            pd.DataFrame({"done": done, "counted": counted})
+            .groupby(plants["Year"], observed=False)
+            .sum()
+        )
+        counted_by_year = by_year["counted"].where(by_year["counted"] > 0)
+        rows[f"{phase} %"] = (100 * by_year["done"] / counted_by_year).round(1)
+    out = pd.DataFrame(rows)
+    out.insert(0, "Plants", plants.groupby("Year", observed=False).size())
+    return out
+
+
+def timing_drift(plants: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per plant and year: planned start as day of year, how many days that moved
+    from the plant's previous season, and how late the actual start was
+    against the plan (mean over duplicate rows).
+    """
+    # Group on integer codes; grouping half a million name strings is the slow part
+    plant_codes, plant_names = pd.factorize(plants["Display Name"])
+    frame = pd.DataFrame({
+        "plant": plant_codes,
+        "year": plants["Year"].cat.codes.to_numpy(),
+        "Planned Day": plants["Start Date"].dt.dayofyear.to_numpy(float),
+        "Start Delay (days)": (
+            (plants["Start Actual"] - plants["Start Date"]).dt.days.to_numpy(float)
+        ),
+    })
+    out = frame.groupby(["plant", "year"], sort=True).mean().reset_index()
+    same_plant = np.r_[False, out["plant"].to_numpy()[1:] == out["plant"].to_numpy()[:-1]]
+    drift = out["Planned Day"].diff().where(same_plant)
+    return pd.DataFrame({
+        "Plant": plant_names[out["plant"].to_numpy()],
+        "Year": pd.Categorical.from_codes(out["year"].to_numpy(), dtype=plants["Year"].dtype),
+        "Planned Day": out["Planned Day"],
+        "Drift (days)": drift,
+        "Start Delay (days)": out["Start Delay (days)"],
+    })
@@ -0,0 +1,245 @@
+"""
+Seed quantities for a season's beds.
+
+Every seed family listed in a bed gets an equal share of the bed's area (as
+the bed diagram draws it), split evenly between that family's varieties in
+the catalogue. A variety fills its share at its CSV ``Per Square`` density,
+or at the square-foot density of its ``spacing_in`` when the CSV has none,
+the same floor as ``core.plants_in_bed``.
+
+With successions on, a variety is re-sown every ``Days`` (days to maturity)
+from its sow date until the season end, up to ``max_sowings`` times. Seeds
+are the plants for all sowings divided by the germination rate, plus a
+safety margin, rounded up. ``brand_totals`` sums the order per ``Brand``.
+
+Everything is one frame of bed × variety rows, so the whole organization's
+beds are planned in a few vectorized passes (see ``python -m
+utils.seed_order``).
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from utils.core import get_spacing
+
+DEFAULT_GERMINATION = 0.8
+DEFAULT_MARGIN = 0.1
+DEFAULT_MAX_SOWINGS = 4
+UNKNOWN_BRAND = "Unknown"
+
+ORDER_COLUMNS = [
+    "Seed", "Variant", "Display Name", "Brand", "Beds", "Sq Ft",
+    "Plants per Sowing", "Sowings", "Plants", "Seeds",
+]
+
+
+def days_to_harvest(df: pd.DataFrame) -> pd.Series:
+    """
+    Days from sowing or transplanting (``End Date``) to harvest: ``Days``,
+    or for transplants ``Days (after transplant)`` when the CSV has it.
+    """
+    days = pd.to_numeric(df["Days"], errors="coerce") if "Days" in df.columns \
+        else pd.Series(np.nan, index=df.index)
+    if "Days (after transplant)" not in df.columns:
+        return days
+    after = pd.to_numeric(df["Days (after transplant)"], errors="coerce")
+    return after.where((df["Planting Method"] == "Transplant") & after.notna(), days).rename("Days")
+
+
+def _varieties(df: pd.DataFrame) -> pd.DataFrame:
+    """One row per catalogue variety (Display Name) with its ordering inputs."""
+    cols = ["Seed", "Variant", "Display Name", "Brand", "End Date", "Days",
+            "Days (after transplant)", "Per Square", "Planting Method"]
+    out = df.reindex(columns=cols).drop_duplicates("Display Name").reset_index(drop=True)
+    out["Seed"] = out["Seed"].astype(str)
+    out["Variant"] = out["Variant"].astype(object).fillna("")
+    out["Brand"] = out["Brand"].astype(object).fillna(UNKNOWN_BRAND)
+    out["Days"] = days_to_harvest(out)
+    out = out.drop(columns="Days (after transplant)")
+    out["Per Square"] = pd.to_numeric(out["Per Square"], errors="coerce")
+    return out
+
+
+def _demand(varieties: pd.DataFrame, beds: list, companion_data: dict) -> tuple[np.ndarray, ...]:
+    """
+    Bed × variety rows as arrays: bed position, variety row in ``varieties``,
+    sq ft share and plants per sowing; plus, per variety, the number of
+    distinct beds growing it. Built by repeating each bed listing over its
+    family's varieties (no string merge).
+    """
+    family, families = pd.factorize(varieties["Seed"], sort=True)
+    code_of = {seed: i for i, seed in enumerate(families)}
+    # Each bed listing of a family with catalogue varieties: bed, family, share
+    listed = [
+        (b, code_of[seed], bed["width"] * bed["length"] / len(bed["plants"]))
+        for b, bed in enumerate(beds) for seed in bed.get("plants", []) if seed in code_of
+    ]
+    bed_pos = np.array([b for b, _, _ in listed], dtype=np.intp)
+    code = np.array([f for _, f, _ in listed], dtype=np.intp)
+    share = np.array([area for _, _, area in listed], dtype=float)
+
+    # Varieties grouped by family: family f owns by_family[start[f]:start[f] + size[f]]
+    by_family = np.argsort(family, kind="stable")
+    size = np.bincount(family, minlength=len(families))
+    start = np.concatenate([[0], np.cumsum(size)[:-1]]).astype(np.intp)
+    n = size[code]
+    row_listing = np.repeat(np.arange(len(code)), n)
+    offset = np.arange(len(row_listing)) - np.repeat(np.cumsum(n) - n, n)
+    variety = by_family[start[code[row_listing]] + offset]
+    sq_ft = (share / n)[row_listing]
+
+    spacing = np.array(
+        [get_spacing(f, companion_data)["spacing_in"] for f in families], dtype=float,
+    )
+    with np.errstate(divide="ignore"):
+        sfg = np.where(spacing > 0, (12 / spacing) ** 2, 0.0)
+    per_square = varieties["Per Square"].to_numpy(float)
+    density = np.where(np.isnan(per_square), sfg[family], per_square)
+    plants = np.floor(density[variety] * sq_ft).astype(np.int64)
+    # A bed listing a family twice still counts once
+    family_beds = np.bincount(pd.unique(code * max(1, len(beds)) + bed_pos) // max(1, len(beds)),
+                              minlength=len(families))
+    return bed_pos[row_listing], variety, sq_ft, plants, family_beds[family]
+
+
+def bed_demand(df: pd.DataFrame, beds: list, companion_data: dict) -> pd.DataFrame:
+    """
+    Plants per sowing of each variety in each bed: Bed, Display Name,
+    Sq Ft (its share of the bed) and Plants.
+    """
+    varieties = _varieties(df)
+    bed_pos, variety, sq_ft, plants, _ = _demand(varieties, beds, companion_data)
+    bed_names = np.array([bed["name"] for bed in beds], dtype=object)
+    return pd.DataFrame({
+        "Bed": bed_names[bed_pos],
+        "Display Name": varieties["Display Name"].to_numpy(object)[variety],
+        "Sq Ft": sq_ft,
+        "Plants": plants,
+    })
+
+
+def sowings(sow_dates: pd.Series, days: pd.Series, season_end: datetime.date | None,
+            max_sowings: int = DEFAULT_MAX_SOWINGS) -> np.ndarray:
+    """
+    Sowings that mature by ``season_end``, one every ``days`` from each sow
+    date, between 1 and ``max_sowings`` (1 without a date, days or end).
+    """
+    n = np.ones(len(sow_dates), dtype=np.int64)
+    if season_end is None or max_sowings <= 1:
+        return n
+    sow = pd.to_datetime(sow_dates, errors="coerce").to_numpy("datetime64[D]")
+    window = (np.datetime64(season_end, "D") - sow) / np.timedelta64(1, "D")
+    days = pd.to_numeric(days, errors="coerce").to_numpy(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fits = np.floor(window / days)
+    ok = ~np.isnan(fits) & (days > 0)
+    n[ok] = np.clip(fits[ok], 1, max_sowings).astype(np.int64)
+    return n
+
+
+def seed_order(df: pd.DataFrame, beds: list, companion_data: dict,
+               season_end: datetime.date | None = None,
+               germination: float = DEFAULT_GERMINATION, margin: float = DEFAULT_MARGIN,
+               max_sowings: int = DEFAULT_MAX_SOWINGS) -> pd.DataFrame:
+    """
+    Seeds to order per variety for ``beds``, largest orders first.
+
+    ``df`` is the season's catalogue (sow dates in ``End Date``, e.g. one
+    site's calendar); without ``season_end`` every variety is sown once.
+    Varieties in no bed are left out.
+    """
+    if not 0 < germination <= 1:
+        raise ValueError(f"germination must be in (0, 1], got {germination}")
+    varieties = _varieties(df)
+    _, variety, sq_ft, plants, bed_count = _demand(varieties, beds, companion_data)
+    if not len(variety):
+        return pd.DataFrame(columns=ORDER_COLUMNS)
+    nv = len(varieties)
+    order = varieties.assign(
+        Beds=bed_count,
+        **{
+            "Sq Ft": np.bincount(variety, weights=sq_ft, minlength=nv),
+            "Plants per Sowing": (
+                np.bincount(variety, weights=plants, minlength=nv).astype(np.int64)
+            ),
+        },
+    )
+    order = order[order["Beds"] > 0]
+    order["Sowings"] = sowings(order["End Date"], order["Days"], season_end, max_sowings)
+    order["Plants"] = order["Plants per Sowing"] * order["Sowings"]
+    seeds = order["Plants"].to_numpy(float) * (1 + margin) / germination
+    order["Seeds"] = np.ceil(seeds - 1e-9).astype(np.int64)
+    order["Sq Ft"] = order["Sq Ft"].round(2)
+    return (
+        order[ORDER_COLUMNS]
+        .sort_values(["Seeds", "Display Name"], ascending=[False, True], kind="stable")
+        .reset_index(drop=True)
+    )
+
+
+def brand_totals(order: pd.DataFrame) -> pd.DataFrame:
+    """Varieties, plants and seeds per Brand, largest orders first."""
+    totals = order.groupby("Brand", sort=False).agg(
+        Varieties=("Display Name", "size"), Plants=("Plants", "sum"), Seeds=("Seeds", "sum")
+    )
+    return totals.sort_values("Seeds", ascending=False, kind="stable").reset_index()
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    from pathlib import Path
+
+    from utils.seed_store import read_seeds_csv
+    from utils.sites import DEFAULT_SITE, SiteScheduler, normalize_sites
+    from utils.sites import season_end as site_season_end
+
+    data_dir = Path(__file__).parent.parent / "data"
+    parser = argparse.ArgumentParser(description="Seed order for every saved bed")
+    parser.add_argument("--year", type=int, default=datetime.date.today().year)
+    parser.add_argument("--site", help="site id (default: the first site)")
+    parser.add_argument("--data-dir", type=Path, default=data_dir)
+    parser.add_argument("--germination", type=float, default=DEFAULT_GERMINATION)
+    parser.add_argument("--margin", type=float, default=DEFAULT_MARGIN)
+    parser.add_argument("--max-sowings", type=int, default=DEFAULT_MAX_SOWINGS)
+    parser.add_argument("--out", type=Path, help="write the per-variety order as CSV")
+    args = parser.parse_args()
+
+    def read_json(name, default):
+        path = args.data_dir / name
+        if not path.exists():
+            return default
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    catalogue_year = args.year
+    seeds_file = args.data_dir / "seeds" / f"{args.year}-seeds.csv"
+    if not seeds_file.exists():
+        catalogue_year = 2025
+        seeds_file = args.data_dir / "seeds" / "2025-seeds.csv"
+    seeds = read_seeds_csv(seeds_file)
+    if catalogue_year != args.year:
+        # Carry the fallback catalogue's dates into the requested season so
+        # they keep their distance from last frost
+        shift = pd.DateOffset(years=args.year - catalogue_year)
+        seeds["Start Date"] = seeds["Start Date"] + shift
+        seeds["End Date"] = seeds["End Date"] + shift
+    sites = normalize_sites(read_json("sites.json", [DEFAULT_SITE]))
+    by_id = {site["id"]: site for site in sites}
+    if args.site is not None and args.site not in by_id:
+        parser.error(f"unknown site {args.site!r}; choose from {', '.join(by_id)}")
+    site = by_id[args.site] if args.site is not None else sites[0]
+    # Same per-site calendar the Seed Order tab uses (load_site_seeds_df)
+    calendar = SiteScheduler().calendars(
+        seeds, read_json("planting_rules.json", {}), [site], args.year
+    )[site["id"]]
+    order = seed_order(
+        calendar, read_json("garden_beds.json", []), read_json("companion_plants.json", {}),
+        season_end=site_season_end(site, args.year), germination=args.germination,
+        margin=args.margin, max_sowings=args.max_sowings,
+    )
+    if args.out:
+        order.to_csv(args.out, index=False)
+    print(brand_totals(order).to_string(index=False))
@@ -0,0 +1,144 @@
+"""
+Columnar on-disk cache for the seeds CSV.
+
+The CSV in ``data/seeds`` stays the editable source of truth. The first load
+after an edit parses it once, derives the typed columns the pages rely on and
+writes an uncompressed Arrow/Feather copy next to a small JSON fingerprint.
+Later loads memory-map that copy instead of re-parsing the CSV.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - pyarrow ships with streamlit
+    pa = None
+    feather = None
+
+# Bump whenever read_seeds_csv() changes the shape or dtypes of its output so
+# caches written by older code are rebuilt instead of silently reused.
+CACHE_SCHEMA_VERSION = 1
+
+DATE_COLUMNS = {"Start Indoors": "Start Date", "Transplant / Sow": "End Date"}
+CATEGORY_COLUMNS = ["Brand", "Season", "Sun", "Frost", "Planting Method"]
+# Direct-sow rows have no indoor start; their start date is this far before sowing
+DIRECT_SOW_LEAD = pd.Timedelta(days=3)
+
+
+# ─── Parsing ──────────────────────────────────────────────────────────────────
+def read_seeds_csv(seeds_file: Path) -> pd.DataFrame:
+    """Parse a seeds CSV into the typed frame returned by load_seeds_df()."""
+    return prepare_seeds(pd.read_csv(seeds_file))
+
+
+def prepare_seeds(df: pd.DataFrame) -> pd.DataFrame:
+    """Type and derive columns on a raw seeds frame (CSV column names)."""
+    df = df.copy()
+    for col in DATE_COLUMNS:
+        df[col] = pd.to_datetime(df[col], errors="coerce")
+    df = df.rename(columns=DATE_COLUMNS)
+    df["Seed"] = df["Seed"].astype(str)
+    df["Variant"] = df["Variant"].astype(str)
+    df["Display Name"] = (df["Seed"] + " " + df["Variant"]).str.strip()
+    idx = df["Planting Method"] == "Direct Sow"
+    df.loc[idx, "Start Date"] = df.loc[idx, "End Date"] - DIRECT_SOW_LEAD
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+# ─── Fingerprinting ───────────────────────────────────────────────────────────
+def _file_digest(path: Path) -> str:
+    """SHA-1 of the file contents."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _cache_paths(seeds_file: Path, cache_dir: Path) -> tuple[Path, Path]:
+    stem = seeds_file.stem
+    return cache_dir / f"{stem}.feather", cache_dir / f"{stem}.meta.json"
+
+
+def _read_meta(meta_file: Path) -> dict:
+    try:
+        with open(meta_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_atomic(path: Path, write) -> None:
+    """Write via a temp file + rename so readers never see a partial file."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _write_meta(meta_file: Path, meta: dict) -> None:
+    def write(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    _write_atomic(meta_file, write)
+
+
+# ─── Cached load ──────────────────────────────────────────────────────────────
+def load_seeds_cached(seeds_file: Path, cache_dir: Path) -> pd.DataFrame:
+    """
+    Return the typed seeds frame, using the columnar cache when it is fresh.
+
+    Freshness is decided by the CSV's mtime and size; if either changed the
+    content hash is compared too, so a touched-but-identical file (e.g. after
+    a git checkout) only refreshes the fingerprint instead of re-parsing.
+    """
+    if feather is None:
+        return read_seeds_csv(seeds_file)
+
+    data_file, meta_file = _cache_paths(seeds_file, cache_dir)
+    st_ = seeds_file.stat()
+    meta = _read_meta(meta_file)
+
+    if meta.get("schema") == CACHE_SCHEMA_VERSION and data_file.exists():
+        same_stat = meta.get("mtime_ns") == st_.st_mtime_ns and meta.get("size") == st_.st_size
+        if same_stat or meta.get("sha1") == _file_digest(seeds_file):
+            try:
+                df = feather.read_table(data_file, memory_map=True).to_pandas()
+            except (OSError, pa.ArrowInvalid):
+                df = None
+            if df is not None:
+                if not same_stat:
+                    meta.update(mtime_ns=st_.st_mtime_ns, size=st_.st_size)
+                    _write_meta(meta_file, meta)
+                return df
+
+    df = read_seeds_csv(seeds_file)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        _write_atomic(
+            data_file,
+            lambda tmp: feather.write_feather(df, tmp, compression="uncompressed"),
+        )
+        _write_meta(meta_file, {
+            "schema": CACHE_SCHEMA_VERSION,
+            "mtime_ns": st_.st_mtime_ns,
+            "size": st_.st_size,
+            "sha1": _file_digest(seeds_file),
+        })
+    except OSError:
+        # Read-only deployments (e.g. Streamlit Cloud) just skip the cache.
+        pass
+    return df
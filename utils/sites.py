@@ -0,0 +1,237 @@
+"""
+Growing sites and their planting calendars.
+
+A site is a location with its own frost dates and season end, stored as
+``MM-DD`` strings in ``data/sites.json`` so one record covers every year::
+
+    {"id": "north", "name": "North allotment",
+     "last_frost": "05-16", "first_frost": "10-06", "season_end": "10-06"}
+
+The seeds CSV stays the one shared catalogue. Its absolute dates are anchored
+on the default May 9 last frost, so re-expressed as day offsets from last
+frost they hold for every site; rows missing a date fall back to the
+catalogue's ``Last Frost Delta`` / ``Transplant Delta`` columns and then to
+the plant's planting rule. A site's calendar is its last frost plus those
+offsets.
+
+``SiteScheduler`` computes the offsets once per catalogue, materializes all
+stale sites in one broadcast add and keeps each site's calendar until the
+catalogue, a rule it falls back on, or that site's record changes.
+"""
+
+import calendar
+import datetime
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.fingerprint import fingerprint
+from utils.schedule_engine import DEFAULT_LAST_FROST, rule_offsets
+from utils.schedule_engine import DEFAULT_SITE as DEFAULT_SITE_ID
+from utils.seed_store import DIRECT_SOW_LEAD
+
+DATE_FIELDS = ("last_frost", "first_frost", "season_end")
+
+DEFAULT_SITE = {
+    "id": DEFAULT_SITE_ID,
+    "name": "Home garden",
+    "last_frost": "05-09",
+    "first_frost": "10-13",
+    "season_end": "10-13",
+}
+
+
+# ─── Sites ────────────────────────────────────────────────────────────────────
+def _month_day(value: str) -> tuple[int, int]:
+    month, day = (int(part) for part in str(value).split("-"))
+    datetime.date(2000, month, day)  # leap year, so 02-29 is accepted
+    return month, day
+
+
+def normalize_sites(sites: list) -> list[dict]:
+    """
+    Validated copies of ``sites``: missing dates come from the default site,
+    ``name`` defaults to the id. Raises ValueError on a bad or duplicate id or
+    a date that is not ``MM-DD``. An empty list means just the default site.
+    """
+    out, seen = [], set()
+    for raw in sites or [DEFAULT_SITE]:
+        site = {**DEFAULT_SITE, "name": raw.get("id"), **raw}
+        site_id = str(site.get("id") or "").strip()
+        if not site_id:
+            raise ValueError("Every site needs an id")
+        if site_id in seen:
+            raise ValueError(f"Duplicate site id: {site_id}")
+        for field in DATE_FIELDS:
+            try:
+                _month_day(site[field])
+            except (TypeError, ValueError):
+                raise ValueError(
+                    f"Site {site_id}: {field} must be MM-DD, got {site[field]!r}"
+                ) from None
+        seen.add(site_id)
+        out.append({**site, "id": site_id})
+    return out
+
+
+def site_date(site: dict, field: str, year: int) -> datetime.date:
+    """``site[field]`` (an ``MM-DD`` string) in ``year``; Feb 29 becomes Feb 28."""
+    month, day = _month_day(site[field])
+    return datetime.date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+def season_end(site: dict, year: int) -> datetime.date:
+    return site_date(site, "season_end", year)
+
+
+def frost_table(sites: list[dict], years) -> pd.DataFrame:
+    """
+    One row per site and year: Site, Year, Last Frost, First Frost, Season End
+    (the ``frost`` argument of ``ScheduleEngine.update``).
+    """
+    rows = [
+        {
+            "Site": site["id"],
+            "Year": year,
+            "Last Frost": pd.Timestamp(site_date(site, "last_frost", year)),
+            "First Frost": pd.Timestamp(site_date(site, "first_frost", year)),
+            "Season End": pd.Timestamp(site_date(site, "season_end", year)),
+        }
+        for site in sites
+        for year in years
+    ]
+    return pd.DataFrame(rows, columns=["Site", "Year", "Last Frost", "First Frost", "Season End"])
+
+
+# ─── Calendars ────────────────────────────────────────────────────────────────
+def _days(df: pd.DataFrame, col: str) -> np.ndarray:
+    """Numeric CSV column as float days, NaN where blank or missing."""
+    if col not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(float)
+
+
+def calendar_offsets(
+    seeds: pd.DataFrame, year: int, plant_rules: dict | None = None
+) -> pd.DataFrame:
+    """
+    Start/End Date of ``seeds`` (a prepared catalogue for ``year``) as days
+    from last frost, indexed like ``seeds``; NaN where nothing gives a date.
+
+    Per row, end is the catalogue date, else ``-Last Frost Delta``, else the
+    planting rule's end; start falls back to ``end - Transplant Delta`` and
+    then the rule's start. Direct-sow rows start ``DIRECT_SOW_LEAD`` before
+    their end, as in ``prepare_seeds``.
+    """
+    anchor = np.datetime64(datetime.date(year, *DEFAULT_LAST_FROST), "D")
+    day = np.timedelta64(1, "D")
+    end = (seeds["End Date"].to_numpy("datetime64[D]") - anchor) / day
+    start = (seeds["Start Date"].to_numpy("datetime64[D]") - anchor) / day
+
+    end = np.where(np.isnan(end), -_days(seeds, "Last Frost Delta"), end)
+    start = np.where(np.isnan(start), end - _days(seeds, "Transplant Delta"), start)
+    missing = np.isnan(end) | np.isnan(start)
+    if missing.any() and plant_rules:
+        names = seeds["Display Name"].to_numpy()[missing]
+        rule = rule_offsets({n: plant_rules[n] for n in set(names) if n in plant_rules})
+        rule = rule.reindex(names)
+        end[missing] = np.where(np.isnan(end[missing]), rule["end"].to_numpy(float), end[missing])
+        start[missing] = np.where(
+            np.isnan(start[missing]), rule["start"].to_numpy(float), start[missing]
+        )
+
+    direct = (seeds["Planting Method"] == "Direct Sow").to_numpy()
+    start = np.where(direct, end - DIRECT_SOW_LEAD.days, start)
+    return pd.DataFrame({"start": start, "end": end}, index=seeds.index)
+
+
+def _fallback_names(seeds: pd.DataFrame) -> list:
+    """Plants whose rule ``calendar_offsets`` can fall back on for ``seeds``."""
+    end_set = seeds["End Date"].notna().to_numpy() | ~np.isnan(_days(seeds, "Last Frost Delta"))
+    start_set = seeds["Start Date"].notna().to_numpy() | ~np.isnan(_days(seeds, "Transplant Delta"))
+    return sorted(set(seeds["Display Name"].to_numpy()[~(end_set & start_set)]))
+
+
+def _as_dates(last_frost: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """``last_frost[:, None] + offsets[None, :]`` days as datetime64[ns], NaT for NaN."""
+    days = np.where(np.isnan(offsets), np.iinfo("int64").min, np.nan_to_num(offsets))
+    days = days.astype("int64")
+    deltas = days.astype("timedelta64[D]")  # int64 min is NaT
+    return (last_frost[:, None] + deltas[None, :]).astype("datetime64[ns]")
+
+
+class SiteScheduler:
+    """Per-site calendars from one shared catalogue, cached per site."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._offsets: tuple[str, pd.DataFrame] | None = None
+        self._fallback: tuple[tuple, list] | None = None
+        self._cache: dict[tuple, tuple[str, pd.DataFrame]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _catalogue_offsets(
+        self, seeds, plant_rules, year, catalogue_key
+    ) -> tuple[str, pd.DataFrame]:
+        # The catalogue is identified by the caller's key, else hashed by
+        # content; of the rules only those it falls back on count, so editing
+        # an unrelated rule keeps every calendar
+        if catalogue_key is None:
+            catalogue_key = fingerprint(seeds)
+        if self._fallback is None or self._fallback[0] != (year, catalogue_key):
+            self._fallback = ((year, catalogue_key), _fallback_names(seeds))
+        names = self._fallback[1]
+        key = fingerprint(year, catalogue_key, {n: plant_rules.get(n) for n in names})
+        if self._offsets is None or self._offsets[0] != key:
+            self._offsets = (key, calendar_offsets(seeds, year, plant_rules))
+        return self._offsets
+
+    def calendars(self, seeds: pd.DataFrame, rules: dict, sites: list[dict],
+                  year: int, catalogue_key=None) -> dict[str, pd.DataFrame]:
+        """
+        Calendar of every site in ``sites`` for ``year``, keyed by site id.
+
+        A site is rebuilt only when its inputs changed since it was last
+        built. ``catalogue_key`` identifies ``seeds`` (e.g. the file
+        signature it was loaded from) so reruns skip hashing every row;
+        without it the catalogue is hashed. Frames are shallow copies of the
+        cached ones (copy-on-write keeps edits off the cache).
+        """
+        sites = normalize_sites(sites)
+        with self._lock:
+            inputs, offsets = self._catalogue_offsets(
+                seeds, rules.get("planting_rules", {}), year, catalogue_key
+            )
+            out, stale = {}, []
+            for site in sites:
+                key = fingerprint(inputs, site)
+                cached = self._cache.get((site["id"], year))
+                if cached is not None and cached[0] == key:
+                    self.hits += 1
+                    out[site["id"]] = cached[1]
+                else:
+                    stale.append((site, key))
+            if stale:
+                self.misses += len(stale)
+                frost = frost_table([site for site, _ in stale], [year])
+                last_frost = frost["Last Frost"].to_numpy("datetime64[D]")
+                starts = _as_dates(last_frost, offsets["start"].to_numpy(float))
+                ends = _as_dates(last_frost, offsets["end"].to_numpy(float))
+                for i, (site, key) in enumerate(stale):
+                    frame = seeds.copy(deep=False)
+                    frame["Start Date"] = starts[i]
+                    frame["End Date"] = ends[i]
+                    self._cache[(site["id"], year)] = (key, frame)
+                    out[site["id"]] = frame
+            # Sites no longer listed for this year
+            for site_id, y in list(self._cache):
+                if y == year and site_id not in out:
+                    del self._cache[(site_id, y)]
+        return {site_id: frame.copy(deep=False) for site_id, frame in out.items()}
+
+    def clear(self):
+        with self._lock:
+            self._offsets = None
+            self._cache.clear()
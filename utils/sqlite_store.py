@@ -0,0 +1,474 @@
+"""
+Optional SQLite storage engine.
+
+Enabled by setting ``VERTI_STORAGE=sqlite`` (database path from
+``VERTI_DB_PATH``, default ``data/verti.db``). The ``load_*``/``save_*``
+functions in utils.helpers then read and write these tables instead of the
+CSV/JSON files. The database runs in WAL mode so concurrent Streamlit
+sessions can read while another writes, and progress/harvest writes touch
+only the rows that changed.
+
+Import the current files once with::
+
+    python -m utils.sqlite_store import [--db data/verti.db]
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.harvest_journal import HarvestJournal
+from utils.progress_store import ProgressStore
+
+PROGRESS_FIELDS = [
+    "start_status",
+    "transplant_status",
+    "start_actual",
+    "transplant_actual",
+    "notes",
+    "bed",
+]
+BED_FIELDS = ["name", "width", "length", "type", "sun", "plants"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seeds (
+    year     INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    seed     TEXT,
+    variant  TEXT,
+    data     TEXT NOT NULL,
+    PRIMARY KEY (year, position)
+);
+CREATE INDEX IF NOT EXISTS idx_seeds_year_seed ON seeds (year, seed);
+
+CREATE TABLE IF NOT EXISTS progress (
+    year              INTEGER NOT NULL,
+    display_name      TEXT NOT NULL,
+    start_status      TEXT,
+    transplant_status TEXT,
+    start_actual      TEXT,
+    transplant_actual TEXT,
+    notes             TEXT,
+    bed               TEXT,
+    extra             TEXT,
+    PRIMARY KEY (year, display_name)
+);
+
+CREATE TABLE IF NOT EXISTS garden_beds (
+    position INTEGER PRIMARY KEY,
+    name     TEXT NOT NULL,
+    width    REAL,
+    length   REAL,
+    type     TEXT,
+    sun      TEXT,
+    plants   TEXT,
+    extra    TEXT
+);
+
+CREATE TABLE IF NOT EXISTS planting_rules (
+    plant TEXT PRIMARY KEY,
+    rule  TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sites (
+    id       TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    site     TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS harvests (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    date        TEXT,
+    plant       TEXT,
+    variant     TEXT,
+    quantity_kg REAL,
+    notes       TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_harvests_date ON harvests (date);
+CREATE INDEX IF NOT EXISTS idx_harvests_plant ON harvests (plant);
+"""
+
+HARVEST_SQL_COLUMNS = {
+    "date": "Date",
+    "plant": "Plant",
+    "variant": "Variant",
+    "quantity_kg": "Quantity_kg",
+    "notes": "Notes",
+}
+
+
+def _json_or_none(obj: dict) -> str | None:
+    return json.dumps(obj, ensure_ascii=False) if obj else None
+
+
+def _harvest_rows(df: pd.DataFrame) -> list[tuple]:
+    out = df.reindex(columns=list(HARVEST_SQL_COLUMNS.values())).copy()
+    out["Date"] = pd.to_datetime(out["Date"], errors="coerce").dt.strftime("%Y-%m-%d")
+    out["Quantity_kg"] = pd.to_numeric(out["Quantity_kg"], errors="coerce")
+    out = out.astype(object).where(out.notna(), None)
+    return list(out.itertuples(index=False, name=None))
+
+
+def _migrate_garden_beds(conn: sqlite3.Connection):
+    """Rebuild a garden_beds table keyed on ``name`` so duplicate names survive."""
+    columns = conn.execute("PRAGMA table_info(garden_beds)").fetchall()
+    if any(name == "name" and pk for _, name, _, _, _, pk in columns):
+        conn.execute("ALTER TABLE garden_beds RENAME TO garden_beds_old")
+        conn.executescript(SCHEMA)
+        conn.execute(
+            "INSERT INTO garden_beds (position, name, width, length, type, sun, plants, extra) "
+            "SELECT position, name, width, length, type, sun, plants, extra "
+            "FROM garden_beds_old ORDER BY position"
+        )
+        conn.execute("DROP TABLE garden_beds_old")
+
+
+class SQLiteStore:
+    """Thread-safe access to the Verti SQLite database (one connection per thread)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            _migrate_garden_beds(conn)
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    # ─── Seeds ────────────────────────────────────────────────────────────────
+    def has_seeds(self, year: int) -> bool:
+        row = self._connect().execute(
+            "SELECT 1 FROM seeds WHERE year = ? LIMIT 1", (year,)
+        ).fetchone()
+        return row is not None
+
+    def seed_years(self) -> list[int]:
+        rows = self._connect().execute("SELECT DISTINCT year FROM seeds ORDER BY year")
+        return [y for (y,) in rows]
+
+    def harvest_years(self) -> list[int]:
+        rows = self._connect().execute(
+            "SELECT DISTINCT CAST(substr(date, 1, 4) AS INTEGER) FROM harvests "
+            "WHERE date IS NOT NULL ORDER BY 1"
+        )
+        return [y for (y,) in rows]
+
+    def load_seeds(self, year: int) -> pd.DataFrame:
+        """Raw seeds rows for a year, with the original CSV column names."""
+        rows = self._connect().execute(
+            "SELECT data FROM seeds WHERE year = ? ORDER BY position", (year,)
+        ).fetchall()
+        df = pd.DataFrame.from_records([json.loads(r[0]) for r in rows])
+        # JSON nulls come back as None; match read_csv's NaN for missing cells
+        return df.where(df.notna(), np.nan).infer_objects()
+
+    def save_seeds(self, df: pd.DataFrame, year: int):
+        """Replace a year's seeds with ``df`` (CSV column names)."""
+        records = df.astype(object).where(df.notna(), None).to_dict("records")
+        with self._connect() as conn:
+            conn.execute("DELETE FROM seeds WHERE year = ?", (year,))
+            conn.executemany(
+                "INSERT INTO seeds (year, position, seed, variant, data) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (year, i, r.get("Seed"), r.get("Variant"), json.dumps(r, ensure_ascii=False))
+                    for i, r in enumerate(records)
+                ],
+            )
+
+    # ─── Progress ─────────────────────────────────────────────────────────────
+    def load_progress(self, year: int) -> dict:
+        cur = self._connect().execute(
+            f"SELECT display_name, {', '.join(PROGRESS_FIELDS)}, extra "
+            "FROM progress WHERE year = ?",
+            (year,),
+        )
+        progress = {}
+        for name, *values, extra in cur:
+            entry = json.loads(extra) if extra else {}
+            entry.update({k: v for k, v in zip(PROGRESS_FIELDS, values) if v is not None})
+            progress[name] = entry
+        return progress
+
+    def upsert_progress(self, entries: dict, year: int):
+        """Insert or replace the given plants' progress rows (one row each)."""
+        rows = []
+        for name, entry in entries.items():
+            extra = {k: v for k, v in entry.items() if k not in PROGRESS_FIELDS}
+            rows.append(
+                (year, name, *(entry.get(k) for k in PROGRESS_FIELDS), _json_or_none(extra))
+            )
+        updates = ", ".join(f"{k} = excluded.{k}" for k in PROGRESS_FIELDS + ["extra"])
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT INTO progress (year, display_name, {', '.join(PROGRESS_FIELDS)}, extra) "
+                f"VALUES (?, ?, {', '.join('?' * len(PROGRESS_FIELDS))}, ?) "
+                f"ON CONFLICT (year, display_name) DO UPDATE SET {updates}",
+                rows,
+            )
+
+    def update_progress(self, updates: dict, year: int):
+        """
+        Set individual fields (``{display_name: {field: value}}``) with one
+        indexed single-row upsert per plant, leaving other fields untouched.
+        """
+        with self._connect() as conn:
+            for name, fields in updates.items():
+                unknown = set(fields) - set(PROGRESS_FIELDS)
+                if unknown:
+                    raise ValueError(f"Unknown progress fields: {sorted(unknown)}")
+                cols = list(fields)
+                conn.execute(
+                    f"INSERT INTO progress (year, display_name, {', '.join(cols)}) "
+                    f"VALUES (?, ?, {', '.join('?' * len(cols))}) "
+                    "ON CONFLICT (year, display_name) DO UPDATE SET "
+                    + ", ".join(f"{c} = excluded.{c}" for c in cols),
+                    (year, name, *fields.values()),
+                )
+
+    def delete_progress(self, names, year: int):
+        with self._connect() as conn:
+            conn.executemany(
+                "DELETE FROM progress WHERE year = ? AND display_name = ?",
+                [(year, n) for n in names],
+            )
+
+    def save_progress(self, progress: dict, year: int):
+        """Persist a whole progress dict, writing only rows that changed."""
+        current = self.load_progress(year)
+        changed = {k: v for k, v in progress.items() if current.get(k) != v}
+        removed = [k for k in current if k not in progress]
+        if changed:
+            self.upsert_progress(changed, year)
+        if removed:
+            self.delete_progress(removed, year)
+
+    # ─── Garden beds ──────────────────────────────────────────────────────────
+    def load_garden_beds(self) -> list:
+        cur = self._connect().execute(
+            "SELECT name, width, length, type, sun, plants, extra "
+            "FROM garden_beds ORDER BY position"
+        )
+        beds = []
+        for name, width, length, type_, sun, plants, extra in cur:
+            bed = json.loads(extra) if extra else {}
+            bed.update({
+                "name": name,
+                "width": width,
+                "length": length,
+                "type": type_,
+                "sun": sun,
+                "plants": json.loads(plants) if plants else [],
+            })
+            beds.append(bed)
+        return beds
+
+    def save_garden_beds(self, beds: list):
+        rows = []
+        for i, bed in enumerate(beds):
+            extra = {k: v for k, v in bed.items() if k not in BED_FIELDS}
+            rows.append((
+                bed["name"], i, bed.get("width"), bed.get("length"), bed.get("type"),
+                bed.get("sun"), json.dumps(bed.get("plants", []), ensure_ascii=False),
+                _json_or_none(extra),
+            ))
+        with self._connect() as conn:
+            conn.execute("DELETE FROM garden_beds")
+            conn.executemany(
+                "INSERT INTO garden_beds "
+                "(name, position, width, length, type, sun, plants, extra) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    # ─── Planting rules ───────────────────────────────────────────────────────
+    def load_planting_rules(self) -> dict:
+        rows = self._connect().execute("SELECT plant, rule FROM planting_rules").fetchall()
+        if not rows:
+            return {}
+        return {"planting_rules": {plant: json.loads(rule) for plant, rule in rows}}
+
+    def save_planting_rules(self, rules: dict):
+        plant_rules = rules.get("planting_rules", {})
+        with self._connect() as conn:
+            current = {p for (p,) in conn.execute("SELECT plant FROM planting_rules")}
+            conn.executemany(
+                "INSERT INTO planting_rules (plant, rule) VALUES (?, ?) "
+                "ON CONFLICT (plant) DO UPDATE SET rule = excluded.rule",
+                [(p, json.dumps(r, ensure_ascii=False)) for p, r in plant_rules.items()],
+            )
+            conn.executemany(
+                "DELETE FROM planting_rules WHERE plant = ?",
+                [(p,) for p in current - set(plant_rules)],
+            )
+
+    # ─── Sites ────────────────────────────────────────────────────────────────
+    def load_sites(self) -> list:
+        cur = self._connect().execute("SELECT site FROM sites ORDER BY position")
+        return [json.loads(site) for (site,) in cur]
+
+    def save_sites(self, sites: list):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sites")
+            conn.executemany(
+                "INSERT INTO sites (id, position, site) VALUES (?, ?, ?)",
+                [
+                    (site["id"], i, json.dumps(site, ensure_ascii=False))
+                    for i, site in enumerate(sites)
+                ],
+            )
+
+    # ─── Harvests ─────────────────────────────────────────────────────────────
+    # A harvest belongs to the season (year) of its date; None means all years
+    def load_harvest_log(self, year: int | None = None) -> pd.DataFrame:
+        if year is None:
+            where, params = "", ()
+        else:
+            where, params = "WHERE substr(date, 1, 4) = ?", (f"{year:04d}",)
+        df = pd.read_sql_query(
+            f"SELECT {', '.join(HARVEST_SQL_COLUMNS)}, id FROM harvests {where} ORDER BY id",
+            self._connect(),
+            params=params,
+        ).rename(columns={**HARVEST_SQL_COLUMNS, "id": "ID"})
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+        return df
+
+    def append_harvest(self, entry: dict) -> int:
+        """Insert one entry and return its ID."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                f"INSERT INTO harvests ({', '.join(HARVEST_SQL_COLUMNS)}) VALUES (?, ?, ?, ?, ?)",
+                _harvest_rows(pd.DataFrame([entry]))[0],
+            )
+            return cur.lastrowid
+
+    def update_harvest(self, harvest_id: int, fields: dict) -> bool:
+        """Change ``fields`` (frame column names) of one entry; False if it doesn't exist."""
+        columns = {frame: sql for sql, frame in HARVEST_SQL_COLUMNS.items()}
+        unknown = set(fields) - set(columns)
+        if unknown:
+            raise ValueError(f"Not editable: {sorted(unknown)}")
+        # Converted like a full row, then only the given fields are set
+        row = dict(zip(HARVEST_SQL_COLUMNS.values(), _harvest_rows(pd.DataFrame([fields]))[0]))
+        assignments = ", ".join(f"{columns[c]} = ?" for c in fields)
+        with self._connect() as conn:
+            cur = conn.execute(
+                f"UPDATE harvests SET {assignments} WHERE id = ?",
+                (*(row[c] for c in fields), int(harvest_id)),
+            )
+            return cur.rowcount > 0
+
+    def delete_harvest(self, harvest_id: int) -> bool:
+        with self._connect() as conn:
+            deleted = conn.execute("DELETE FROM harvests WHERE id = ?", (int(harvest_id),))
+            return deleted.rowcount > 0
+
+    def save_harvest_log(self, df: pd.DataFrame, year: int | None = None):
+        """
+        Replace the harvests of ``year`` (all of them when None) with ``df``.
+        Entry IDs are kept when ``df`` has a complete, unique ``ID`` column.
+        """
+        rows = _harvest_rows(df)
+        ids = pd.to_numeric(df["ID"], errors="coerce") if "ID" in df.columns else None
+        keep_ids = ids is not None and ids.notna().all() and ids.is_unique
+        with self._connect() as conn:
+            if year is None:
+                conn.execute("DELETE FROM harvests")
+            else:
+                conn.execute("DELETE FROM harvests WHERE substr(date, 1, 4) = ?", (f"{year:04d}",))
+            if keep_ids:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO harvests ({', '.join(HARVEST_SQL_COLUMNS)}, id) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(*row, int(i)) for row, i in zip(rows, ids)],
+                )
+            else:
+                conn.executemany(
+                    f"INSERT INTO harvests ({', '.join(HARVEST_SQL_COLUMNS)}) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+
+
+# ─── One-shot importer ────────────────────────────────────────────────────────
+def import_files(store: SQLiteStore, data_dir: Path) -> dict:
+    """Copy every CSV/JSON data file under ``data_dir`` into ``store``."""
+    counts = {
+        "seeds": 0, "progress": 0, "garden_beds": 0, "planting_rules": 0, "sites": 0, "harvests": 0,
+    }
+
+    for seeds_file in sorted((data_dir / "seeds").glob("*-seeds.csv")):
+        year = int(seeds_file.name.split("-")[0])
+        df = pd.read_csv(seeds_file)
+        store.save_seeds(df, year)
+        counts["seeds"] += len(df)
+
+    # Snapshots with their journaled deltas applied, including years that
+    # only have a journal so far
+    progress_dir = data_dir / "progress"
+    progress_store = ProgressStore(progress_dir)
+    years = {int(f.name.split("_")[0]) for f in progress_dir.glob("*_progress.*")}
+    for year in sorted(years):
+        progress = progress_store.load(year)
+        store.save_progress(progress, year)
+        counts["progress"] += len(progress)
+
+    beds_file = data_dir / "garden_beds.json"
+    if beds_file.exists():
+        with open(beds_file, "r", encoding="utf-8") as f:
+            beds = json.load(f)
+        store.save_garden_beds(beds)
+        counts["garden_beds"] = len(beds)
+
+    rules_file = data_dir / "planting_rules.json"
+    if rules_file.exists():
+        with open(rules_file, "r", encoding="utf-8") as f:
+            rules = json.load(f)
+        store.save_planting_rules(rules)
+        counts["planting_rules"] = len(rules.get("planting_rules", {}))
+
+    sites_file = data_dir / "sites.json"
+    if sites_file.exists():
+        with open(sites_file, "r", encoding="utf-8") as f:
+            sites = json.load(f)
+        store.save_sites(sites)
+        counts["sites"] = len(sites)
+
+    harvest_files = sorted((data_dir / "harvests").glob("*_harvest.csv"))
+    harvest_files.append(data_dir / "harvests" / "harvest_log.csv")
+    # Through the journal, so edits and deletions in each log's .edits file apply
+    harvests = [HarvestJournal(f).read() for f in harvest_files if f.exists()]
+    harvests = [df for df in harvests if len(df)]
+    if harvests:
+        df = pd.concat(harvests, ignore_index=True)
+        store.save_harvest_log(df)
+        counts["harvests"] = len(df)
+
+    return counts
+
+
+if __name__ == "__main__":
+    import argparse
+
+    data_dir = Path(__file__).parent.parent / "data"
+    parser = argparse.ArgumentParser(description="Verti SQLite storage tools")
+    parser.add_argument("command", choices=["import"])
+    parser.add_argument("--db", type=Path, default=data_dir / "verti.db")
+    parser.add_argument("--data-dir", type=Path, default=data_dir)
+    args = parser.parse_args()
+
+    counts = import_files(SQLiteStore(args.db), args.data_dir)
+    for table, n in counts.items():
+        print(f"{table:>15}: {n} rows")